@@ -3,8 +3,9 @@ from flask import Flask, request
 import requests, json, os, io, datetime
 from pymongo import MongoClient
 import PyPDF2
-import re
-from heapq import nlargest
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Raya Personalization"))
+from raya_core.summarizer import Summarizer
 
 app = Flask(__name__)
 
@@ -52,22 +53,11 @@ def fetch_joke():
         print("joke fetch error:", e)
     return "Oops! Couldn't fetch a joke right now. Try again later."
 
+# webhook rules: any \w word, 4+ characters to count; sentences end only at . ! ?
+_SUMMARIZER = Summarizer(word_pattern=r'\w+', split_pattern=r'(?<=[.!?])\s+', min_word_len=4)
+
 def extract_summary(text, max_sentences=5):
-    if not text:
-        return ""
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    word_freq = {}
-    for w in re.findall(r'\w+', text.lower()):
-        if len(w) > 3:
-            word_freq[w] = word_freq.get(w, 0) + 1
-    sentence_scores = {}
-    for s in sentences:
-        score = 0
-        for w in re.findall(r'\w+', s.lower()):
-            score += word_freq.get(w, 0)
-        sentence_scores[s] = score
-    best = nlargest(min(max_sentences, len(sentences)), sentence_scores, key=sentence_scores.get)
-    return " ".join(best).strip()
+    return _SUMMARIZER.summarize(text, max_sentences).strip()
 
 def veda_ai_summary(text):
     return f"[V.E.D.A] (placeholder summary) — {min(300, len(text))} chars processed."
@@ -0,0 +1,84 @@
+# benchmarks/bench_entities.py - entity resolution: per-word SELECT vs. in-memory alias trie
+#
+#   python benchmarks/bench_entities.py                    # 20k entities, 2,000 queries
+#   python benchmarks/bench_entities.py --entities 100000
+#
+# The legacy side is the old resolve_entity: one query per word against an
+# unindexed entity_aliases table. Both sides must resolve the same words.
+import os, sys, time, random, sqlite3, tempfile, argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core.entity_resolver import EntityResolver
+from raya_core.persistence import get_store
+
+SYLLABLES = "ra ya na ren dra mo di pu ne del hi kar na ta ka gu ja rat san jay pa til".split()
+
+
+def legacy_resolve(conn, word):
+    row = conn.execute("SELECT entity_name FROM entity_aliases WHERE alias = ? LIMIT 1", (word.lower(),)).fetchone()
+    return row[0] if row else word
+
+
+def build(db_file, entities, seed=4):
+    rng = random.Random(seed)
+    names = {" ".join("".join(rng.choices(SYLLABLES, k=3)) for _ in range(rng.randint(1, 3))).title()
+             for _ in range(entities)}
+    rows = []
+    for name in sorted(names):
+        aliases = {name.lower(), name.replace(" ", "").lower()}
+        if " " in name:
+            aliases.add("".join(p[0] for p in name.split()).lower())
+        rows += [(name, a) for a in aliases]
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE entity_aliases (id INTEGER PRIMARY KEY AUTOINCREMENT, entity_name TEXT, alias TEXT)")
+    conn.executemany("INSERT INTO entity_aliases (entity_name, alias) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return sorted(names)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entities", type=int, default=20000)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "raya.db")
+        names = build(db, args.entities)
+        rng = random.Random(1)
+        queries = [f"what did {rng.choice(names).replace(' ', '').lower()} say about the monsoon in "
+                   f"{rng.choice(names)} this week" for _ in range(args.queries)]
+        words = [w for q in queries for w in q.split()]
+
+        conn = sqlite3.connect(db)
+        t0 = time.perf_counter()
+        old = [legacy_resolve(conn, w) for w in words]
+        t_old = time.perf_counter() - t0
+        conn.close()
+
+        resolver = EntityResolver(db)
+        t0 = time.perf_counter()
+        resolver.resolve("warm-up")
+        t_load = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new = [resolver.resolve(w) for w in words]
+        t_new = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        spans = [resolver.find(q) for q in queries]
+        t_find = time.perf_counter() - t0
+        get_store(db).close()
+
+        if old != new:
+            sys.exit("MISMATCH between per-word SELECT and resolver.resolve")
+        n = len(words)
+        print(f"{len(names):,} entities, {len(queries):,} queries ({n:,} words), "
+              f"{sum(map(len, spans)):,} spans found")
+        print(f"  per-word SELECT (no index)  {t_old / n * 1e6:9.2f} us/word")
+        print(f"  resolver.resolve            {t_new / n * 1e6:9.2f} us/word  ({t_old / t_new:,.0f}x)")
+        print(f"  resolver.find (all spans)   {t_find / len(queries) * 1e6:9.2f} us/query")
+        print(f"  one-time alias load         {t_load * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_export.py - "export": fetchall + indented JSON vs. batched incremental export
+#
+#   python benchmarks/bench_export.py                 # 200k conversation rows
+#   python benchmarks/bench_export.py --rows 1000000
+#
+# Timings and peak memory come from two separate runs, since tracemalloc
+# (Python allocations) slows everything down. The incremental run adds
+# 1,000 rows and exports again, which is what a repeat "export" costs.
+import os, csv, sys, json, time, random, shutil, sqlite3, tempfile, argparse, tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core.exporter import export_all
+from raya_core.persistence import get_store
+
+
+def legacy_export(db_file, out_dir, tables):
+    conn = sqlite3.connect(db_file); c = conn.cursor()
+    for t in tables:
+        rows = c.execute(f"SELECT * FROM {t}").fetchall()
+        cols = [d[0] for d in c.description] if c.description else []
+        with open(os.path.join(out_dir, f"{t}.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(cols)
+            writer.writerows(rows)
+        dict_rows = [dict(zip(cols, r)) for r in rows]
+        with open(os.path.join(out_dir, f"{t}.json"), "w", encoding="utf-8") as f:
+            json.dump(dict_rows, f, ensure_ascii=False, indent=2)
+    conn.close()
+
+
+def fill(db_file, rows, start=0, seed=9):
+    rng = random.Random(seed + start)
+    words = "what is the price of wheat in pune today weather tomorrow rain crop loan scheme".split()
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE IF NOT EXISTS conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                 "user_input TEXT, ai_output TEXT, message_type TEXT)")
+    conn.executemany("INSERT INTO conversations (user_input, ai_output, message_type) VALUES (?, ?, ?)",
+                     ((" ".join(rng.choices(words, k=8)), " ".join(rng.choices(words, k=40)), "text")
+                      for _ in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def measured(fn, trace):
+    """Seconds taken, or with trace=True the peak traced allocation in MB."""
+    if not trace:
+        t0 = time.perf_counter()
+        fn()
+        return time.perf_counter() - t0
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def scenario(base_db, rows, workdir, trace):
+    """legacy export, first incremental export, then +1,000 rows and export again."""
+    os.makedirs(workdir)
+    db = os.path.join(workdir, "raya.db")
+    shutil.copy(base_db, db)
+    legacy_dir, new_dir = os.path.join(workdir, "legacy"), os.path.join(workdir, "exports")
+    os.makedirs(legacy_dir)
+    tables = ["conversations"]
+    out = [measured(lambda: legacy_export(db, legacy_dir, tables), trace),
+           measured(lambda: export_all(db, new_dir, tables), trace)]
+    fill(db, 1000, start=rows)
+    out.append(measured(lambda: export_all(db, new_dir, tables), trace))
+    get_store(db).close()
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "base.db")
+        fill(base, args.rows)
+        times = scenario(base, args.rows, os.path.join(tmp, "timed"), trace=False)
+        peaks = scenario(base, args.rows, os.path.join(tmp, "traced"), trace=True)  # tracemalloc slows it down
+
+        print(f"{args.rows:,} rows")
+        labels = ["fetchall + JSON/CSV", "export_all, first run", "export_all, +1,000 rows"]
+        for label, t, m in zip(labels, times, peaks):
+            print(f"  {label:<24}{t * 1000:9.1f} ms   peak {m:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_fts.py - query_local_db: LIKE scan vs. FTS5/BM25
+#
+#   python benchmarks/bench_fts.py              # 1,000,000 rows
+#   python benchmarks/bench_fts.py --rows 100000
+import os, sys, time, random, sqlite3, argparse, tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core import custom_db
+
+WORDS = ("farmer crop price monsoon rain tractor seed soil water river solar wind energy grid "
+         "market wheat rice cotton sugarcane loan subsidy weather forecast pest fertilizer "
+         "harvest irrigation village district state india news school hospital road").split()
+
+QUERIES = ["tractor service", "cotton pest", "monsoon rain forecast", "wheat market price", "solar subsidy loan"]
+
+
+def build(path, rows):
+    """Create raya_data with `rows` synthetic notes; returns a few rare-word probe queries."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE raya_data (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user_id TEXT,
+                                data_type TEXT, content TEXT, tags TEXT);
+        CREATE TABLE conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, user_input TEXT, ai_output TEXT,
+                                    message_type TEXT DEFAULT 'text', timestamp DATETIME DEFAULT CURRENT_TIMESTAMP);
+    """)
+    rng = random.Random(7)
+    # long tail of rarer words (Zipf-like weights) on top of the topical vocabulary
+    vocab = WORDS + ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 9))) for _ in range(20000)]
+    cum, total = [], 0.0
+    for r in range(len(vocab)):
+        total += 1.0 / (r + 1)
+        cum.append(total)
+    batch = []
+    for i in range(rows):
+        batch.append(("local_user", "text", " ".join(rng.choices(vocab, cum_weights=cum, k=rng.randint(6, 20)))))
+        if len(batch) == 50000:
+            conn.executemany("INSERT INTO raya_data (user_id, data_type, content) VALUES (?, ?, ?)", batch)
+            batch = []
+    if batch:
+        conn.executemany("INSERT INTO raya_data (user_id, data_type, content) VALUES (?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+    return [f"{vocab[500 + i]} {vocab[2000 + i]}" for i in range(3)]
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    t0 = time.perf_counter()
+    queries = QUERIES + build(path, args.rows)
+    print(f"rows: {args.rows:,}  (built in {time.perf_counter() - t0:.1f}s)")
+
+    conn = sqlite3.connect(path)
+    print(f"{'query':24} {'LIKE ms':>10} {'hit':>4}")
+    for q in queries:
+        hit, ms = timed(custom_db._search_like, conn.cursor(), q, 1000)
+        print(f"{q:24} {ms:10.1f} {'y' if hit else 'n':>4}")
+
+    _, ms = timed(custom_db.migrate, path)
+    print(f"\nFTS5 migration (rebuild): {ms / 1e3:.1f}s\n")
+
+    print(f"{'query':24} {'FTS ms':>10} {'hit':>4}")
+    for q in queries:
+        custom_db.query_local_db(path, q)  # warm page cache
+        hit, ms = timed(custom_db.query_local_db, path, q)
+        print(f"{q:24} {ms:10.1f} {'y' if hit else 'n':>4}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
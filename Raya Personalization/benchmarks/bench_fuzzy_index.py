@@ -0,0 +1,64 @@
+# benchmarks/bench_fuzzy_index.py - fuzzy cache lookup time vs. number of keys
+#
+#   python benchmarks/bench_fuzzy_index.py                 # 1k .. 100k keys
+#   python benchmarks/bench_fuzzy_index.py --sizes 1000 1000000
+#
+# Lookup time of the trigram index should stay flat as the key count grows;
+# difflib (the previous implementation) is shown for the smaller sizes.
+import os, sys, time, random, string, argparse, difflib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core.fuzzy_index import FuzzyIndex
+
+WORDS = [
+    "what", "is", "who", "was", "the", "history", "of", "india", "gravity", "black", "hole",
+    "prime", "minister", "dna", "important", "research", "space", "energy", "water", "farmer",
+    "crop", "price", "weather", "monsoon", "solar", "wind", "quantum", "river", "temple", "king",
+]
+
+
+def make_key(rng):
+    words = rng.sample(WORDS, rng.randint(2, 5))
+    # a random tag keeps keys distinct at 1M
+    return " ".join(words) + " " + "".join(rng.choices(string.ascii_lowercase, k=5))
+
+
+def typo(rng, s):
+    i = rng.randrange(len(s))
+    return s[:i] + rng.choice(string.ascii_lowercase) + s[i + 1:]
+
+
+def bench(size, queries, with_difflib):
+    rng = random.Random(size)
+    keys = [make_key(rng) for _ in range(size)]
+    t0 = time.perf_counter()
+    index = FuzzyIndex(keys)
+    build = time.perf_counter() - t0
+
+    probes = [typo(rng, rng.choice(keys)) for _ in range(queries)]
+    t0 = time.perf_counter()
+    hits = sum(1 for q in probes if index.best_match(q, cutoff=0.7))
+    per_lookup = (time.perf_counter() - t0) / queries
+
+    row = f"{size:>9,}  build {build:7.2f}s  lookup {per_lookup * 1e3:8.3f} ms  hit-rate {hits / queries:5.1%}"
+    if with_difflib:
+        n = min(queries, 20)
+        t0 = time.perf_counter()
+        for q in probes[:n]:
+            difflib.get_close_matches(q, keys, n=1, cutoff=0.7)
+        row += f"  | difflib {(time.perf_counter() - t0) / n * 1e3:9.3f} ms"
+    print(row)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--difflib-max", type=int, default=100000, help="skip difflib above this size")
+    args = ap.parse_args()
+    for size in args.sizes:
+        bench(size, args.queries, size <= args.difflib_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_images.py - image analysis: full decode per photo vs. draft decode + process pool
+#
+#   python benchmarks/bench_images.py                  # 40 generated 4000x3000 JPEG "photos"
+#   python benchmarks/bench_images.py --count 100 --size 2000x1500
+#   python benchmarks/bench_images.py --dir path/to/photos
+#
+# The generated batch contains re-saved copies of some photos (as a phone
+# gallery would), which the perceptual hash should report as duplicates.
+import os, sys, time, random, tempfile, argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image, ExifTags
+
+from raya_core import image_analysis
+from raya_core.config import IMAGE_WORKERS
+
+
+# ---------- previous implementation (reference) ----------
+def legacy_analyze(path):
+    with Image.open(path) as img:
+        img.verify()
+    with Image.open(path) as img:
+        w, h = img.size
+        raw_exif = img._getexif() or {}
+        exif = {ExifTags.TAGS.get(k, k): v for k, v in raw_exif.items()}
+        camera = exif.get("Model") or exif.get("Make") or "Unknown"
+        small = img.resize((32, 32))
+        colors = small.getcolors(32 * 32) or []
+        return w, h, camera, max(colors, key=lambda t: t[0])[1] if colors else (0, 0, 0)
+
+
+def synthetic_photos(directory, count, size, seed=3):
+    """Smooth random fields (field, sky, soil tones) plus a few re-encoded copies."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    paths = []
+    for i in range(count):
+        if i % 8 == 7 and paths:  # re-saved copy of an earlier photo
+            with Image.open(paths[-3 if len(paths) > 2 else -1]) as src:
+                img = src.copy()
+            quality = 70
+        else:
+            coarse = rng.integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+            coarse[..., rng.integers(0, 3)] //= 3
+            img = Image.fromarray(coarse).resize((w, h), Image.Resampling.BICUBIC)
+            quality = 90
+        exif = Image.Exif()
+        exif[0x0110] = random.Random(i).choice(["Redmi Note 12", "Galaxy A14", "iPhone 11"])
+        path = os.path.join(directory, f"IMG_{i:04d}.jpg")
+        img.save(path, quality=quality, exif=exif)
+        paths.append(path)
+    return paths
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--count", type=int, default=40)
+    ap.add_argument("--size", default="4000x3000")
+    ap.add_argument("--dir", help="analyze this folder instead of generated photos")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir
+        if not directory:
+            directory = tmp
+            synthetic_photos(tmp, args.count, tuple(int(v) for v in args.size.split("x")))
+        paths = image_analysis.list_images(directory)
+        print(f"{len(paths)} images in {directory}, {IMAGE_WORKERS} workers")
+
+        old, t_old = timed(lambda: [legacy_analyze(p) for p in paths])
+        one, t_one = timed(lambda: image_analysis.analyze_many(paths, workers=1))
+        result, t_dir = timed(lambda: image_analysis.analyze_dir(directory))
+        for (w, h, camera, _), info in zip(old, one):
+            assert (w, h, camera) == (info["width"], info["height"], info["camera"]), info["name"]
+
+        n = len(paths)
+        print(f"  full decode, one by one   {t_old / n * 1000:8.1f} ms/image")
+        print(f"  draft decode, in-process  {t_one / n * 1000:8.1f} ms/image  ({t_old / t_one:4.1f}x)")
+        print(f"  analyze_dir (pool+dedupe) {t_dir / n * 1000:8.1f} ms/image  ({t_old / t_dir:4.1f}x)")
+        print(f"  kept {len(result['kept'])}, duplicates {len(result['duplicates'])}, failed {len(result['failed'])}")
+        for dup, orig in result["duplicates"][:5]:
+            print(f"    {dup} ~ {orig}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_intent.py - intent detection: compiled regex vs. the previous keyword scans
+#
+#   python benchmarks/bench_intent.py                   # 200k synthetic queries
+#   python benchmarks/bench_intent.py --queries 2000000
+#   python benchmarks/bench_intent.py --db raya_conversation.db   # the logged queries instead
+#
+# Both implementations must agree on every query; the run stops at the first
+# difference.
+import os, re, sys, time, random, sqlite3, argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core.intent import (
+    QUESTION_WORDS, RECENCY_HINTS, MONTHS, RESEARCH_HINTS, FACT_QUESTION_PATTERNS, YESNO_PREFIXES,
+    detect_intents, detect_intents_batch,
+)
+
+
+# ---------- previous implementation (reference) ----------
+def legacy_is_factual_question(text):
+    if not text:
+        return False
+    t = text.strip().lower()
+    if t in {"date", "time", "news"}:
+        return False
+    return "?" in t or t.split()[0] in QUESTION_WORDS or t.startswith(YESNO_PREFIXES)
+
+
+def legacy_detect_intents(text):
+    if not text:
+        return {"fact"}
+    q = text.strip().lower()
+    intents = set()
+    if q == "news":
+        return {"news_section"}
+    if any(h in q for h in RESEARCH_HINTS):
+        intents.add("research")
+    year_hit = bool(re.search(r"\b20\d{2}\b", q))
+    month_hit = any(m in q for m in MONTHS)
+    recency_hit = any(h in q for h in RECENCY_HINTS)
+    if "news" in q or year_hit or month_hit or recency_hit:
+        intents.add("news")
+    if any(re.search(p, q) for p in FACT_QUESTION_PATTERNS) or legacy_is_factual_question(q):
+        intents.add("fact")
+    if not intents:
+        intents.add("fact")
+    return intents
+
+
+WORDS = [
+    "what", "is", "the", "history", "of", "india", "gravity", "black", "hole", "prime", "minister",
+    "price", "weather", "monsoon", "solar", "quantum", "river", "temple", "king", "known", "renewal",
+    "latest", "news", "today", "paper", "arxiv", "study", "march", "may", "2025", "2019", "define",
+    "meaning", "summary", "who", "how", "does", "can", "tell", "me", "about", "crop", "farmer",
+    "which", "which-way", "whose.", "whom", "is", "define:", "20255", "news?", "updates",
+]
+
+
+def synthetic(n, seed=7):
+    """n queries drawn from n/4 distinct ones (logged queries repeat)."""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(max(1, n // 4)):
+        q = " ".join(rng.choices(WORDS, k=rng.randint(1, 9)))
+        if rng.random() < 0.2:
+            q += "?"
+        if rng.random() < 0.3:
+            q = q.title()
+        if rng.random() < 0.1:
+            q = "  " + q + " "
+        pool.append(q)
+    return [rng.choice(pool) for _ in range(n)]
+
+
+def logged(db):
+    conn = sqlite3.connect(db)
+    try:
+        return [r[0] for r in conn.execute("SELECT user_input FROM conversations")]
+    finally:
+        conn.close()
+
+
+def timed(fn, queries):
+    t0 = time.perf_counter()
+    out = fn(queries)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--queries", type=int, default=200000)
+    ap.add_argument("--db", help="classify the conversations table of this database instead")
+    args = ap.parse_args()
+
+    queries = logged(args.db) if args.db else synthetic(args.queries)
+    old, t_old = timed(lambda qs: [legacy_detect_intents(q) for q in qs], queries)
+    new, t_new = timed(lambda qs: [detect_intents(q) for q in qs], queries)
+    batch, t_batch = timed(detect_intents_batch, queries)
+
+    for q, a, b, c in zip(queries, old, new, batch):
+        if not (a == b == c):
+            sys.exit(f"MISMATCH {q!r}: legacy={a} new={b} batch={c}")
+
+    n = len(queries)
+    print(f"{n:,} queries ({len(set(queries)):,} distinct), outputs identical")
+    print(f"  legacy scans        {t_old / n * 1e6:7.2f} us/query")
+    print(f"  compiled regex      {t_new / n * 1e6:7.2f} us/query  ({t_old / t_new:4.1f}x)")
+    print(f"  detect_intents_batch{t_batch / n * 1e6:7.2f} us/query  ({t_old / t_batch:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_pdf.py - PDF extraction: serial loop vs. process-pool page ranges vs. cache hit
+#
+#   python benchmarks/bench_pdf.py                 # writes a 500-page text PDF to a temp dir
+#   python benchmarks/bench_pdf.py --pages 1500
+#   python benchmarks/bench_pdf.py --pdf some.pdf
+#
+# The parallel text must equal the serial text. The cache is a throwaway
+# file, so the first summarize_pdf call is cold and the second one a hit.
+import os, sys, time, random, tempfile, argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core import pdf_extract
+from raya_core.cache import TieredCache
+from raya_core.config import PDF_WORKERS
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, pages):
+    """Minimal PDF with one Helvetica text page per string in `pages` (lines split on newlines)."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        lines = " T* ".join(f"({_escape(l)}) Tj" for l in text.split("\n"))
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {lines} ET".encode("latin-1", "replace")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+        kids.append(len(objects) + 1)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>"
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        body = obj if isinstance(obj, bytes) else obj.encode()
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WORDS = ("river temple king monsoon crop farmer harvest rainfall soil irrigation village market price trade "
+         "empire dynasty language script gravity quantum energy orbit planet theory model network").split()
+
+
+def synthetic_pages(n, lines=45, seed=5):
+    rng = random.Random(seed)
+    return ["\n".join(" ".join(rng.choices(WORDS, k=12)).capitalize() + "." for _ in range(lines))
+            for _ in range(n)]
+
+
+def legacy_extract(path):
+    import PyPDF2
+    text = ""
+    with open(path, "rb") as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            text += page.extract_text() or ""
+    return text
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=500)
+    ap.add_argument("--pdf", help="use this PDF instead of a generated one")
+    args = ap.parse_args()
+
+    import PyPDF2
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.pdf
+        if not path:
+            path = os.path.join(tmp, "bench.pdf")
+            write_text_pdf(path, synthetic_pages(args.pages))
+        pdf_extract._CACHE = TieredCache(os.path.join(tmp, "pdf_cache.sqlite"))
+        print(f"{len(PyPDF2.PdfReader(path).pages):,} pages, {os.path.getsize(path) / 1e6:.1f} MB, {PDF_WORKERS} workers")
+
+        # start the worker pool outside the timings
+        pdf_extract.extract_text(path, max_pages=pdf_extract.PDF_PARALLEL_MIN_PAGES)
+        old, t_old = timed(lambda: legacy_extract(path))
+        new, t_new = timed(lambda: pdf_extract.extract_text(path))
+        if old != new:
+            sys.exit("MISMATCH: parallel text differs from the serial loop")
+        cold, t_cold = timed(lambda: pdf_extract.summarize_pdf(path))
+        warm, t_warm = timed(lambda: pdf_extract.summarize_pdf(path))
+        assert warm["cached"] and warm["summary"] == cold["summary"]
+        print(f"  serial loop          {t_old * 1000:9.1f} ms")
+        label = "process pool" if PDF_WORKERS > 1 else "in-process ranges"
+        print(f"  {label:<20} {t_new * 1000:9.1f} ms  ({t_old / t_new:4.1f}x)")
+        print(f"  summarize_pdf cold   {t_cold * 1000:9.1f} ms  (extract + summary + cache write)")
+        print(f"  summarize_pdf cached {t_warm * 1000:9.1f} ms  (SHA-256 of the file + lookup)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_startup.py - cold-start time of the RAYA CLI
+#
+#   python benchmarks/bench_startup.py                     # import profile + time to first prompt
+#   python benchmarks/bench_startup.py --max-seconds 1.5   # exit 1 if startup regresses
+#
+# "Startup" is the wall time from launching `python raya.py` until the
+# "You: " prompt is printed. Heavy modules are imported by the command that
+# needs them, so this should stay well under the old eager-import start.
+import os, sys, time, shutil, argparse, tempfile, statistics, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"You: "
+
+
+def import_profile(top):
+    """Run `python -X importtime -c "import raya"` and return (total_us, [(cumulative_us, module)])."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import raya"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    # children are printed before their parent, so collect depth-1 rows until
+    # the depth-0 line that owns them
+    total, rows, pending = 0, [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            pending.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == "raya":
+                total, rows = int(cumulative), pending
+            pending = []
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def time_to_prompt(timeout):
+    """Seconds from launching raya.py until it prints the prompt (run in a scratch dir)."""
+    work = tempfile.mkdtemp(prefix="raya_startup_")
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "raya.py")],
+        cwd=work, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        seen = b""
+        while PROMPT not in seen:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("raya.py exited before showing the prompt")
+            seen += chunk
+            if time.perf_counter() - t0 > timeout:
+                raise RuntimeError("timed out waiting for the prompt")
+        elapsed = time.perf_counter() - t0
+        proc.stdin.write(b"exit\n")
+        proc.stdin.flush()
+        proc.wait(timeout=timeout)
+        return elapsed
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--max-seconds", type=float, default=None,
+                    help="fail (exit 1) if the median time to prompt exceeds this")
+    args = ap.parse_args()
+
+    total, slowest = import_profile(args.top)
+    print(f"import raya: {total / 1000:.1f} ms cumulative")
+    for us, name in slowest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    runs = [time_to_prompt(args.timeout) for _ in range(args.runs)]
+    median = statistics.median(runs)
+    print(f"time to prompt: median {median:.3f}s  (min {min(runs):.3f}s, max {max(runs):.3f}s, {args.runs} runs)")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"FAIL: startup {median:.3f}s exceeds budget {args.max_seconds:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_summarize.py - extractive summaries: raya_core.summarizer vs. the previous loops
+#
+#   python benchmarks/bench_summarize.py                 # synthetic 500-page document
+#   python benchmarks/bench_summarize.py --pages 2000
+#   python benchmarks/bench_summarize.py --pdf some.pdf  # a real PDF (needs PyPDF2)
+#
+# Exact mode must give the same summary as both previous implementations (the
+# CLI's summarize_text and the webhook's extract_summary); the run stops at
+# the first difference. Streaming mode is fed one page at a time.
+import os, re, sys, time, random, argparse
+from heapq import nlargest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raya_core.summarizer import Summarizer
+
+
+# ---------- previous implementations (reference) ----------
+def legacy_summarize_text(text, max_sentences=5):
+    if not text:
+        return ""
+    sentences = re.split(r'(?<=[.!?])\s+|\n', text)
+    word_freq = {}
+    for word in re.findall(r"\b[a-zA-Z]{4,}\b", text.lower()):
+        word_freq[word] = word_freq.get(word, 0) + 1
+    scores = {}
+    for s in sentences:
+        score = sum(word_freq.get(w, 0) for w in re.findall(r"\b[a-zA-Z]{4,}\b", s.lower()))
+        if s.strip():
+            scores[s] = score
+    top = nlargest(max_sentences, scores, key=scores.get)
+    return " ".join(top)
+
+
+def legacy_extract_summary(text, max_sentences=5):
+    if not text:
+        return ""
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    word_freq = {}
+    for w in re.findall(r'\w+', text.lower()):
+        if len(w) > 3:
+            word_freq[w] = word_freq.get(w, 0) + 1
+    sentence_scores = {}
+    for s in sentences:
+        score = 0
+        for w in re.findall(r'\w+', s.lower()):
+            score += word_freq.get(w, 0)
+        sentence_scores[s] = score
+    best = nlargest(min(max_sentences, len(sentences)), sentence_scores, key=sentence_scores.get)
+    return " ".join(best).strip()
+
+
+WORDS = (
+    "the of and to in is was for on that with as by at from river temple king monsoon crop farmer "
+    "harvest rainfall soil irrigation village market price trade empire dynasty language script "
+    "gravity quantum energy particle orbit planet solar system theory measurement experiment data "
+    "model network learning training history culture festival music dance poetry literature"
+).split()
+
+
+def synthetic_pages(pages, words_per_page=500, seed=11):
+    """Pages of plain prose with a Zipf-ish vocabulary, paragraphs and the odd heading."""
+    rng = random.Random(seed)
+    weights = [1.0 / (i + 1) for i in range(len(WORDS))]
+    out = []
+    for p in range(pages):
+        parts, n = [f"Chapter {p // 20 + 1}\n"], 0
+        while n < words_per_page:
+            k = rng.randint(6, 28)
+            words = rng.choices(WORDS, weights, k=k)
+            parts.append(" ".join(words).capitalize() + rng.choice(".....!?") + (" " if rng.random() < 0.85 else "\n"))
+            n += k
+        out.append("".join(parts))
+    return out
+
+
+def pdf_pages(path):
+    import PyPDF2
+    with open(path, "rb") as f:
+        return [page.extract_text() or "" for page in PyPDF2.PdfReader(f).pages]
+
+
+def timed(fn, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=500)
+    ap.add_argument("--pdf", help="summarize this PDF instead of synthetic pages")
+    ap.add_argument("--sentences", type=int, default=6)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    pages = pdf_pages(args.pdf) if args.pdf else synthetic_pages(args.pages)
+    text = "".join(pages)
+    n = args.sentences
+    cli = Summarizer()
+    bot = Summarizer(word_pattern=r'\w+', split_pattern=r'(?<=[.!?])\s+', min_word_len=4)
+    words = len(text.split())
+    print(f"{len(pages):,} pages, {len(text) / 1e6:.1f} MB, {words:,} words")
+
+    rows = [
+        ("summarize_text", lambda: legacy_summarize_text(text, n), lambda: cli.summarize(text, n),
+         lambda: cli.summarize_stream(pages, n)),
+        ("extract_summary", lambda: legacy_extract_summary(text, n), lambda: bot.summarize(text, n).strip(),
+         lambda: bot.summarize_stream(pages, n).strip()),
+    ]
+    for name, legacy, exact, stream in rows:
+        old, t_old = timed(legacy, args.repeat)
+        new, t_new = timed(exact, args.repeat)
+        streamed, t_stream = timed(stream, args.repeat)
+        if old != new:
+            sys.exit(f"MISMATCH in {name}:\n  legacy: {old[:200]!r}\n  new:    {new[:200]!r}")
+        print(f"{name}: exact output identical, streaming {'identical' if streamed == new else 'DIFFERENT'}")
+        print(f"  legacy loops        {t_old * 1000:8.1f} ms")
+        print(f"  Summarizer          {t_new * 1000:8.1f} ms  ({t_old / t_new:4.1f}x)")
+        print(f"  summarize_stream    {t_stream * 1000:8.1f} ms  ({t_old / t_stream:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
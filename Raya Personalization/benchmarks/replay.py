@@ -0,0 +1,342 @@
+# benchmarks/replay.py - replay logged queries through ask_raya against local stand-ins
+#
+#   python benchmarks/replay.py                                  # benchmarks/replay_queries.txt
+#   python benchmarks/replay.py --db raya_conversation.db --limit 500
+#   python benchmarks/replay.py --latency ollama=800 wikipedia=120 --fail duckduckgo=0.2
+#   python benchmarks/replay.py --out run.json --baseline benchmarks/replay_baseline.json
+#
+# Every outbound request (Ollama, OpenAI, Wikipedia, DuckDuckGo, RSS / arXiv)
+# goes to a stand-in from benchmarks/standins.py; anything else is refused, so
+# a replay never touches the network. Caches, traces and the cloud budget live
+# in a scratch directory. The report has throughput, per-stage latency
+# percentiles (from the trace spans) and cache hit rates; --out writes it as
+# JSON and --baseline compares against an earlier run (exit 1 on regression).
+import io, os, sys, json, time, sqlite3, argparse, tempfile, contextlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "raya_core"))  # the orchestrator imports `aggregator` flat
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import standins
+from raya_core import backend_cloud, cache, local_model, orchestrator, source_arxiv, source_news_topic
+from raya_core import tracing, transport, wiki
+from raya_core.cache import TieredCache
+from raya_core.cloud_client import CloudClient, LoopThread
+from raya_core.config import HTTP_POOL_HOSTS, HTTP_POOL_SIZE
+from raya_core.news_index import NewsPrefetcher
+
+QUERY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_queries.txt")
+SERVICES = ("ollama", "openai", "wikipedia", "duckduckgo", "rss")
+ARXIV_HOST = urlsplit(source_arxiv.API_URL).netloc
+# Typical response times (ms) of the real services; --latency overrides them.
+# Keeping them realistic makes runs dominated by the simulated network rather
+# than by scheduling noise, so reports stay comparable.
+DEFAULT_LATENCY = {"ollama": 400, "openai": 600, "wikipedia": 80, "duckduckgo": 120, "rss": 60}
+
+
+# ---------------- inputs ----------------
+def load_queries(db=None, path=None, limit=None):
+    """user_input rows of a conversations table (oldest first), or one query per line of a file."""
+    if db:
+        if not os.path.exists(db):
+            raise FileNotFoundError(db)
+        conn = sqlite3.connect(db)
+        try:
+            rows = conn.execute("SELECT user_input FROM conversations ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        queries = [r[0].strip() for r in rows if r[0] and r[0].strip()]
+    else:
+        with open(path or QUERY_FILE, "r", encoding="utf-8") as f:
+            queries = [l.strip() for l in f if l.strip() and not l.lstrip().startswith("#")]
+    return queries[:limit] if limit else queries
+
+
+def parse_specs(items, cast=float):
+    """["ollama=800", "rss=5"] -> {"ollama": 800.0, "rss": 5.0}"""
+    out = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        if name not in SERVICES:
+            raise ValueError(f"unknown service {name!r} (one of {', '.join(SERVICES)})")
+        out[name] = cast(value)
+    return out
+
+
+# ---------------- wiring ----------------
+class _Redirect(HTTPAdapter):
+    """Sends requests for known hosts to their stand-in and refuses everything else."""
+
+    def __init__(self, routes):
+        super().__init__(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+        self.routes = routes
+        self.blocked = {}
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        target = self.routes.get(parts.netloc.lower())
+        if target is None:
+            self.blocked[parts.netloc] = self.blocked.get(parts.netloc, 0) + 1
+            raise requests.exceptions.ConnectionError(f"replay: {parts.netloc} has no stand-in")
+        base = urlsplit(target)
+        request.url = urlunsplit((base.scheme, base.netloc, parts.path, parts.query, ""))
+        return super().send(request, **kwargs)
+
+
+class _CountingCache(TieredCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        value = super().get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+
+def _swap(stack, obj, attr, value):
+    old = getattr(obj, attr)
+    setattr(obj, attr, value)
+    stack.callback(setattr, obj, attr, old)
+    return value
+
+
+def _rate(hits, total):
+    return round(hits / total, 3) if total else None
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+    pick = lambda p: values[max(0, -(-len(values) * p // 100) - 1)]
+    return {"count": len(values), "p50": round(pick(50), 1), "p95": round(pick(95), 1),
+            "p99": round(pick(99), 1), "max": round(values[-1], 1)}
+
+
+# ---------------- replay ----------------
+def replay(queries, latency=None, jitter=None, fail=None, concurrency=1, weak_rate=0.3,
+           answer_cache=False, stream=False, seed=0, workdir=None, verbose=False):
+    """Run `queries` through the orchestrator against fresh stand-ins; returns the report dict."""
+    latency, jitter, fail = {**DEFAULT_LATENCY, **(latency or {})}, jitter or {}, fail or {}
+    vocabulary = {w for q in queries for w in q.lower().split() if w.isalpha() and len(w) > 3}
+    handlers = {
+        "ollama": standins.ollama(weak_rate),
+        "openai": standins.openai_chat(),
+        "wikipedia": standins.wikipedia(missing_rate=0.1),
+        "duckduckgo": standins.duckduckgo(empty_rate=0.2),
+        "rss": standins.rss(vocabulary, seed=seed),
+    }
+    servers = {name: standins.StandIn(name, h, latency.get(name, 0.0), jitter.get(name, 0.0),
+                                      fail.get(name, 0.0), seed).start()
+               for name, h in handlers.items()}
+    routes = {
+        urlsplit(local_model.LOCAL_API_URL).netloc: servers["ollama"].url,
+        urlsplit(wiki.API_URL).netloc: servers["wikipedia"].url,
+        "api.duckduckgo.com": servers["duckduckgo"].url,
+        ARXIV_HOST: servers["rss"].url,
+        **{urlsplit(u).netloc: servers["rss"].url for u in source_news_topic.NEWS_FEEDS.values()},
+    }
+    adapter = _Redirect(routes)
+    scratch = workdir or tempfile.mkdtemp(prefix="raya_replay_")
+    trace_file = os.path.join(scratch, "traces.jsonl")
+    if os.path.exists(trace_file):
+        os.remove(trace_file)
+
+    with contextlib.ExitStack() as stack:
+        session = transport.get_session()
+        for prefix in ("http://", "https://"):
+            stack.callback(session.mount, prefix, session.get_adapter(prefix + "x"))
+            session.mount(prefix, adapter)
+        previous = tracing.configure()
+        stack.callback(tracing.configure, previous.path, tracing._ENABLED)
+        tracing.configure(path=trace_file, enabled=True)
+
+        answers = _swap(stack, cache, "_STORE", TieredCache(os.path.join(scratch, "answers.sqlite")))
+        _swap(stack, cache, "CACHE_ENABLED", answer_cache)
+        _swap(stack, orchestrator, "_SEMANTIC", None)
+        wiki_cache = _swap(stack, wiki, "_CACHE", _CountingCache(os.path.join(scratch, "wiki.sqlite")))
+        arxiv_cache = _swap(stack, source_arxiv, "_CACHE", _CountingCache(os.path.join(scratch, "arxiv.sqlite")))
+        news = _swap(stack, source_news_topic, "_PREFETCHER", NewsPrefetcher(source_news_topic.NEWS_FEEDS))
+        stack.callback(news.stop)
+
+        loop = LoopThread()
+        cloud = CloudClient("replay-key", backend_cloud.CLOUD_MODEL_NAME, daily_limit=10 ** 9,
+                            base_url=servers["openai"].url + "/v1",
+                            budget_path=os.path.join(scratch, "cloud_budget.json"))
+        _swap(stack, backend_cloud, "OPENAI_API_KEY", "replay-key")
+        _swap(stack, backend_cloud, "_LOOP", loop)
+        _swap(stack, backend_cloud, "_CLIENT", cloud)
+        stack.callback(loop.run, cloud.close(), 5)
+        coalesced_before = orchestrator.coalescing_stats()
+        db_file = os.path.join(scratch, "custom_db.sqlite")
+
+        def one(query):
+            t0 = time.perf_counter()
+            first = None
+            if stream:
+                gen = orchestrator.ask_raya_stream(query, db_file)
+                try:
+                    while True:
+                        next(gen)
+                        first = first or time.perf_counter() - t0
+                except StopIteration as stop:
+                    result = stop.value
+            else:
+                result = orchestrator.ask_raya(query, db_file)
+            return result, time.perf_counter() - t0, first
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if verbose else out):
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                runs = list(pool.map(one, queries))
+            wall = time.perf_counter() - t0
+        tracing.flush()
+        stages = tracing.summarize(trace_file, window=None)
+
+        sources = {}
+        for result, _, _ in runs:
+            name = next(iter(result.sources), "none") if result else "none"
+            sources[name] = sources.get(name, 0) + 1
+        qa_sources = {}
+        for rec in tracing._records(trace_file):
+            if rec.get("name") == "qa":
+                src = rec.get("attrs", {}).get("source", "?")
+                qa_sources[src] = qa_sources.get(src, 0) + 1
+        coalesced = orchestrator.coalescing_stats()
+        semantic = orchestrator.cache_stats() if answer_cache else {}  # paraphrase layer
+        answered_from_cache = sum(1 for r, _, _ in runs if r and r.meta.get("cache"))
+
+        report = {
+            "config": {
+                "queries": len(queries), "distinct": len(set(queries)), "concurrency": concurrency,
+                "stream": stream, "answer_cache": answer_cache, "weak_local_rate": weak_rate, "seed": seed,
+                "latency_ms": latency, "jitter_ms": jitter, "fail_rate": fail,
+            },
+            "throughput_qps": round(len(queries) / wall, 2) if wall else None,
+            "wall_s": round(wall, 3),
+            "end_to_end_ms": _percentiles([d * 1000 for _, d, _ in runs]),
+            "first_chunk_ms": _percentiles([f * 1000 for _, _, f in runs if f is not None]),
+            "stages": {name: {k: (round(v, 1) if isinstance(v, float) else v) for k, v in s.items()}
+                       for name, s in sorted(stages.items())},
+            "answers": dict(sorted(sources.items())),
+            "qa_sources": dict(sorted(qa_sources.items())),
+            "caches": {
+                "answer": {"hits": answered_from_cache, "entries": len(answers),
+                           "hit_rate": _rate(answered_from_cache, len(queries))},
+                "semantic": {"hits": semantic.get("hits", 0), "misses": semantic.get("misses", 0),
+                             "hit_rate": _rate(semantic.get("hits", 0),
+                                               semantic.get("hits", 0) + semantic.get("misses", 0))},
+                "qa_knowledge": {"hits": qa_sources.get("cache", 0),
+                                 "hit_rate": _rate(qa_sources.get("cache", 0), sum(qa_sources.values()))},
+                "wikipedia": {"hits": wiki_cache.hits, "misses": wiki_cache.misses,
+                              "hit_rate": _rate(wiki_cache.hits, wiki_cache.hits + wiki_cache.misses)},
+                "arxiv": {"hits": arxiv_cache.hits, "misses": arxiv_cache.misses,
+                          "hit_rate": _rate(arxiv_cache.hits, arxiv_cache.hits + arxiv_cache.misses)},
+                "coalesced_calls": coalesced["coalesced"] - coalesced_before["coalesced"],
+            },
+            "upstream": {name: dict(s.stats) for name, s in servers.items()},
+            "blocked_hosts": dict(adapter.blocked),
+        }
+
+    for s in servers.values():
+        s.stop()
+    return report
+
+
+# ---------------- baseline ----------------
+def compare(report, baseline, tolerance=0.2, min_ms=5.0, min_count=5):
+    """
+    Regressions of `report` against `baseline`: throughput down, or a stage's
+    p95 up, by more than `tolerance`. Stages faster than min_ms or seen fewer
+    than min_count times are too noisy to judge and are skipped.
+    """
+    problems = []
+    old_qps, new_qps = baseline.get("throughput_qps"), report.get("throughput_qps")
+    if old_qps and new_qps is not None and new_qps < old_qps * (1 - tolerance):
+        problems.append(f"throughput {new_qps} qps < baseline {old_qps} qps")
+    rows = [("end_to_end", baseline.get("end_to_end_ms", {}), report.get("end_to_end_ms", {}))]
+    rows += [(n, s, report.get("stages", {}).get(n, {})) for n, s in baseline.get("stages", {}).items()]
+    for name, old, new in rows:
+        if "p95" not in old or "p95" not in new or min(old["count"], new["count"]) < min_count:
+            continue
+        if max(old["p95"], new["p95"]) >= min_ms and new["p95"] > old["p95"] * (1 + tolerance):
+            problems.append(f"{name}: p95 {new['p95']} ms > baseline {old['p95']} ms")
+    return problems
+
+
+def format_report(report):
+    lines = [
+        f"{report['config']['queries']} queries ({report['config']['distinct']} distinct), "
+        f"concurrency {report['config']['concurrency']}: {report['throughput_qps']} q/s, {report['wall_s']} s",
+        f"end to end  p50 {report['end_to_end_ms'].get('p50')} ms  p95 {report['end_to_end_ms'].get('p95')} ms",
+    ]
+    if report["first_chunk_ms"]:
+        lines.append(f"first chunk p50 {report['first_chunk_ms']['p50']} ms  p95 {report['first_chunk_ms']['p95']} ms")
+    lines.append("")
+    lines.append(tracing.format_summary(report["stages"]))
+    lines.append("")
+    lines.append("answers   " + ", ".join(f"{k}={v}" for k, v in report["answers"].items()))
+    lines.append("caches    " + ", ".join(
+        f"{k}={v.get('hit_rate')}" if isinstance(v, dict) else f"{k}={v}" for k, v in report["caches"].items()))
+    lines.append("upstream  " + ", ".join(
+        f"{k}={v['requests']}" + (f" ({v['failures']} failed)" if v["failures"] else "")
+        for k, v in report["upstream"].items()))
+    if report["blocked_hosts"]:
+        lines.append("blocked   " + ", ".join(f"{k}={v}" for k, v in report["blocked_hosts"].items()))
+    return "\n".join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--db", help="replay user_input rows of this conversations database")
+    src.add_argument("--queries", help=f"query file, one per line (default {os.path.relpath(QUERY_FILE, ROOT)})")
+    ap.add_argument("--limit", type=int)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--latency", nargs="*", metavar="SERVICE=MS", help="added latency per stand-in")
+    ap.add_argument("--jitter", nargs="*", metavar="SERVICE=MS", help="extra random latency, 0..MS")
+    ap.add_argument("--fail", nargs="*", metavar="SERVICE=RATE", help="share of requests answered 503")
+    ap.add_argument("--weak-local", type=float, default=0.3, help="share of prompts the local model can't answer")
+    ap.add_argument("--answer-cache", action="store_true", help="enable the answer cache (off by default, as in raya)")
+    ap.add_argument("--stream", action="store_true", help="use ask_raya_stream and report time to first chunk")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="write the report as JSON")
+    ap.add_argument("--baseline", help="compare against this JSON report")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--verbose", action="store_true", help="show RAYA's own prints")
+    args = ap.parse_args()
+
+    queries = load_queries(args.db, args.queries, args.limit)
+    report = replay(
+        queries, latency=parse_specs(args.latency), jitter=parse_specs(args.jitter), fail=parse_specs(args.fail),
+        concurrency=args.concurrency, weak_rate=args.weak_local, answer_cache=args.answer_cache,
+        stream=args.stream, seed=args.seed, verbose=args.verbose,
+    )
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        print("\nbaseline: " + ("no regressions" if not problems else "REGRESSIONS"))
+        for p in problems:
+            print("  " + p)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# benchmarks/standins.py - local stand-ins for the services RAYA talks to (used by replay.py)
+#
+# Each stand-in is a ThreadingHTTPServer on 127.0.0.1 with its own latency,
+# jitter and failure rate, so the replay harness can measure RAYA itself
+# without touching the network. Answers are deterministic per request.
+import json
+import time
+import random
+import hashlib
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+# handler(method, path, params, body) -> (status, content type, body bytes, extra headers)
+Reply = Tuple[int, str, bytes, Dict[str, str]]
+Handler = Callable[[str, str, Dict[str, str], bytes, Dict[str, str]], Reply]
+
+
+def _bucket(text: str) -> float:
+    """Stable 0..1 value for `text` (same on every run, unlike hash())."""
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+
+
+def _json(status: int, payload) -> Reply:
+    return status, "application/json", json.dumps(payload).encode(), {}
+
+
+class StandIn:
+    """
+    One fake service. `latency_ms` (+ up to `jitter_ms`) is added to every
+    request; `fail_rate` of them get a 503 instead of an answer.
+    """
+
+    def __init__(self, name: str, handler: Handler, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 fail_rate: float = 0.0, seed: int = 0):
+        self.name = name
+        self.handler = handler
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.stats = {"requests": 0, "failures": 0}
+        self._rng = random.Random(f"{seed}:{name}")
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def _plan(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000.0
+            fail = self._rng.random() < self.fail_rate
+            if fail:
+                self.stats["failures"] += 1
+        return delay, fail
+
+    def start(self) -> "StandIn":
+        standin = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+
+            def _serve(self):
+                parts = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                delay, fail = standin._plan()
+                time.sleep(delay)
+                if fail:
+                    status, ctype, data, extra = _json(503, {"error": {"message": "injected failure"}})
+                else:
+                    status, ctype, data, extra = standin.handler(self.command, parts.path, params, body,
+                                                                 dict(self.headers))
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in extra.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name=f"standin-{self.name}", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+# ---------------- service handlers ----------------
+def ollama(weak_rate: float = 0.0) -> Handler:
+    """
+    /api/generate. `weak_rate` of prompts get an "I don't know" answer, which
+    the router scores low, so the cascade moves on to the pipeline.
+    """
+    def handle(method, path, params, body, headers):
+        payload = json.loads(body or b"{}")
+        prompt = payload.get("prompt", "")
+        if _bucket(prompt) < weak_rate:
+            text = "I don't know."
+        else:
+            text = f"Here is what I know about {prompt.strip()[:80]}: it is a well documented topic."
+        if not payload.get("stream"):
+            return _json(200, {"model": payload.get("model"), "response": text, "done": True})
+        words = text.split(" ")
+        lines = [json.dumps({"response": w + (" " if i < len(words) - 1 else ""), "done": False})
+                 for i, w in enumerate(words)]
+        lines.append(json.dumps({"response": "", "done": True}))
+        return 200, "application/x-ndjson", ("\n".join(lines) + "\n").encode(), {}
+    return handle
+
+
+def openai_chat() -> Handler:
+    """/v1/chat/completions, answering with the prompt's first words."""
+    def handle(method, path, params, body, headers):
+        payload = json.loads(body or b"{}")
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        return _json(200, {
+            "id": "chatcmpl-replay", "object": "chat.completion", "created": 0, "model": payload.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"Cloud answer: {prompt[:120]}"}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 20,
+                      "total_tokens": len(prompt) // 4 + 20},
+        })
+    return handle
+
+
+def wikipedia(missing_rate: float = 0.0) -> Handler:
+    """
+    MediaWiki API (formatversion=2). A search returns the topic page, a film
+    of the same name and a disambiguation page; `missing_rate` of topics have
+    no pages at all.
+    """
+    def handle(method, path, params, body, headers):
+        if params.get("list") == "search":
+            q = params.get("srsearch", "").strip()
+            if not q or _bucket(q) < missing_rate:
+                return _json(200, {"query": {"search": []}})
+            titles = [q.title(), f"{q.title()} (film)", f"{q.title()} (disambiguation)"]
+            return _json(200, {"query": {"search": [{"title": t} for t in titles[:int(params.get("srlimit", 3))]]}})
+        title = params.get("titles", "")
+        if title.endswith("(disambiguation)"):
+            page = {"title": title, "extract": "", "pageprops": {"disambiguation": ""}}
+        elif title.endswith("(film)"):
+            page = {"title": title, "extract": f"{title} is a film directed by a stand-in director."}
+        elif _bucket(title.lower()) < missing_rate:
+            page = {"title": title, "missing": True}
+        else:
+            page = {"title": title, "extract": (f"{title} is the subject of this stand-in article. "
+                                                f"It has a long history. Scholars have studied {title} widely.")}
+        return _json(200, {"query": {"pages": [page]}})
+    return handle
+
+
+def duckduckgo(empty_rate: float = 0.0) -> Handler:
+    """Instant Answer API: AbstractText for most queries, nothing for `empty_rate`."""
+    def handle(method, path, params, body, headers):
+        q = params.get("q", "")
+        if _bucket(q) < empty_rate:
+            return _json(200, {"AbstractText": "", "Heading": "", "RelatedTopics": []})
+        return _json(200, {"AbstractText": f"{q} (instant answer from the stand-in).", "Heading": q})
+    return handle
+
+
+def rss(vocabulary: Iterable[str], items: int = 40, seed: int = 0) -> Handler:
+    """
+    RSS for the news feeds and Atom-ish results for arXiv. Headlines are
+    built from `vocabulary` (the replayed queries' words) so topic searches
+    can hit. ETag / If-None-Match give 304s like real feeds.
+    """
+    words = sorted(set(vocabulary)) or ["world"]
+    rng = random.Random(seed)
+    headlines = [f"{' '.join(rng.sample(words, min(2, len(words))))} update {i}" for i in range(items)]
+    now = formatdate(usegmt=True)
+
+    def feed(titles) -> bytes:
+        entries = "".join(
+            f"<item><title>{escape(t)}</title><link>https://example.org/{i}</link>"
+            f"<description>{escape(t)}</description><pubDate>{now}</pubDate></item>"
+            for i, t in enumerate(titles)
+        )
+        return f'<?xml version="1.0"?><rss version="2.0"><channel><title>stand-in</title>{entries}</channel></rss>'.encode()
+
+    def handle(method, path, params, body, headers):
+        if "search_query" in params:  # arXiv: one entry per OR'ed clause, containing its terms
+            clauses = params["search_query"].replace("(", "").replace(")", "").split(" OR ")
+            titles = [" ".join(t.split(":", 1)[-1] for t in c.split(" AND ")) + " revisited" for c in clauses]
+            return 200, "application/atom+xml", feed(titles), {}
+        etag = f'"{hashlib.sha1(path.encode()).hexdigest()[:12]}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, "application/rss+xml", b"", {"ETag": etag}
+        return 200, "application/rss+xml", feed(headlines), {"ETag": etag}
+    return handle
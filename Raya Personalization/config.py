@@ -11,5 +11,14 @@ DB_PATH = os.path.join(os.path.dirname(__file__), "raya.db")
 CACHE_PATH = os.path.join(os.path.dirname(__file__), "final_raya_cache.json")
 
 # ---- Orchestrator behavior
-ENGINE_ORDER = ["local", "wikipedia", "llm"]  # priority: offline → web → LLM
+# Cascade stages, tried in order, each at most once per query:
+#   local (Ollama via router), pipeline (QA + notes + news + arXiv),
+#   wikipedia, web (Google snippet), llm (cloud)
+ENGINE_ORDER = ["local", "pipeline", "llm"]  # priority: offline → sources → cloud LLM
+# Seconds a stage may take before the cascade moves on without it
+STAGE_BUDGETS = {"local": 35, "pipeline": 10, "wikipedia": 8, "web": 6, "llm": 30}
+# A stage result at/above this confidence is final; below it the next stage runs
+STAGE_ACCEPT = {"local": 0.7, "pipeline": 0.6, "wikipedia": 0.7, "web": 0.6, "llm": 0.0}
+# Answers below this confidence (and the fallback) are returned but not cached or reused for paraphrases
+CACHE_MIN_CONFIDENCE = 0.6
 WIKI_SENTENCES = 3
@@ -0,0 +1,39 @@
+# conftest.py - keep test runs out of the real trace file and answer cache; local HTTP stubs
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from raya_core import cache, tracing
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_traces(tmp_path_factory):
+    # not restored afterwards: sources that outlive their deadline still finish (and trace) later
+    tracing.configure(path=str(tmp_path_factory.mktemp("traces") / "traces.jsonl"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_answer_cache(tmp_path, monkeypatch):
+    # opened lazily, so tests that never touch the cache never create it
+    monkeypatch.setattr(cache, "CACHE_DB", str(tmp_path / "final_raya_cache.sqlite"))
+    monkeypatch.setattr(cache, "CACHE_FILE", str(tmp_path / "final_raya_cache.json"))
+    monkeypatch.setattr(cache, "_STORE", None)
+
+
+@pytest.fixture
+def http_stub():
+    """http_stub(handler_cls) -> base URL of a server on 127.0.0.1, shut down and closed after the test."""
+    servers = []
+
+    def start(handler_cls) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
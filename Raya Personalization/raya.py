@@ -1,67 +1,31 @@
 # RAYA.py  -- cleaned CLI + utilities, delegates Q/A to engine.respond_to_query
 # Corrected full file based on the version you provided. Keep a backup of your original.
+#
+# Startup only imports what the prompt needs. Heavy dependencies (PIL, PyPDF2,
+# pywhatkit, pyfiglet, bs4, the raya_core Q&A stack) are imported inside the
+# command handlers that use them, on first use. See COMMANDS below.
 import os
 import re
 import json
-import csv
 import time
 import random
 import sqlite3
-import requests
-import feedparser
-import pywhatkit
-import wikipedia
-import pyfiglet
-import pygame
-from PIL import Image, ExifTags
+import importlib
 from datetime import datetime, date, timezone
-from heapq import nlargest
-from bs4 import BeautifulSoup
+from urllib.parse import quote
 from colorama import init, Fore
-import PyPDF2
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'raya_core'))
-from raya_core.orchestrator import ask_raya
+from raya_core.persistence import get_store
 
 # -------------------------
-# Robust imports: prefer raya_core package if present, else local modules.
+# Optional raya_core helpers, resolved on first use (None if unavailable).
 # -------------------------
-respond_to_query = None
-answer_question_func = None
-detect_intents = None
-search_topic_news = None
-
-try:
-    from raya_core.qa_engine import answer_question as _aq
-    from raya_core.engine import respond_to_query as _rtq
-    from raya_core.intent import detect_intents as _di
-    from raya_core.source_news_topic import search_topic_news as _stn
-
-    answer_question_func = _aq
-    respond_to_query = _rtq
-    detect_intents = _di
-    search_topic_news = _stn
-except Exception:
+def _optional(module: str, attr: str):
     try:
-        # local fallback (if modules live in project root)
-        import sys
-        sys.path.append(os.path.dirname(__file__))  # ensure project root is importable
-        # Attempt local module imports
-        from raya_core.qa_engine import answer_question as _aq
-        from raya_core.engine import respond_to_query as _rtq
-        from raya_core.intent import detect_intents as _di
-        from raya_core.source_news_topic import search_topic_news as _stn
-
-        answer_question_func = _aq
-        respond_to_query = _rtq
-        detect_intents = _di
-        search_topic_news = _stn
+        return getattr(importlib.import_module(module), attr)
     except Exception:
-        # Final fallback: keep None and handle gracefully at runtime
-        answer_question_func = None
-        respond_to_query = None
-        detect_intents = None
-        search_topic_news = None
+        return None
 
 # =========================
 # CONFIG / DEV
@@ -72,10 +36,10 @@ CACHE_PATH = "final_raya_cache.json"
 init(autoreset=True)
 DEV_MODE = True
 
-# Ensure folders exist
-os.makedirs("assets/images", exist_ok=True)
-os.makedirs("assets/pdfs", exist_ok=True)
-os.makedirs("exports", exist_ok=True)
+def ensure_dirs(*paths):
+    """Output folders are created by the handlers that write to them."""
+    for p in paths:
+        os.makedirs(p, exist_ok=True)
 
 # =========================
 # DATABASE INITIALIZATION
@@ -135,86 +99,54 @@ def init_db():
             alias TEXT
         )
     ''')
+    # one entity per alias: keep the oldest row of any duplicates, then enforce it
+    c.execute("DELETE FROM entity_aliases WHERE id NOT IN (SELECT MIN(id) FROM entity_aliases GROUP BY alias)")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS entity_aliases_alias ON entity_aliases(alias)")
     conn.commit()
     conn.close()
 
 # =========================
 # DATABASE UTILITIES
 # =========================
+def _db():
+    """Shared WAL store: writes are queued and committed in batches off the main thread."""
+    return get_store(DB_FILE)
+
 def store_data(user_id, data_type, content, tags=""):
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute(
-            "INSERT INTO raya_data (timestamp, user_id, data_type, content, tags) VALUES (?, ?, ?, ?, ?)",
-            (datetime.now().isoformat(), user_id, data_type, content, tags)
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"[DB] store_data error: {e}")
+    if "news" in data_type:
+        from raya_core.retriever import record_news
+        record_news(content)
+    _db().execute(
+        "INSERT INTO raya_data (timestamp, user_id, data_type, content, tags) VALUES (?, ?, ?, ?, ?)",
+        (datetime.now().isoformat(), user_id, data_type, content, tags)
+    )
 
 def save_conversation(user_input, ai_output, message_type="text"):
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute("INSERT INTO conversations (user_input, ai_output, message_type) VALUES (?, ?, ?)",
+    # keep the in-memory context window current (before the write is queued,
+    # so a cold-start load cannot see this turn twice)
+    from raya_core.retriever import record_turn
+    record_turn(user_input, ai_output)
+    _db().execute("INSERT INTO conversations (user_input, ai_output, message_type) VALUES (?, ?, ?)",
                   (user_input, ai_output, message_type))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"[DB] save_conversation error: {e}")
 
 def log_image_db(image_name, detected_objects, ai_description):
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute("""INSERT INTO image_logs (timestamp, image_name, detected_objects, ai_description)
+    _db().execute("""INSERT INTO image_logs (timestamp, image_name, detected_objects, ai_description)
                      VALUES (?, ?, ?, ?)""",
                   (datetime.now().isoformat(), image_name, json.dumps(detected_objects), ai_description))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"[DB] log_image_db error: {e}")
 
 def log_pdf_db(pdf_name, extracted_text, summary):
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute("""INSERT INTO pdf_logs (timestamp, pdf_name, extracted_text, summary)
+    _db().execute("""INSERT INTO pdf_logs (timestamp, pdf_name, extracted_text, summary)
                      VALUES (?, ?, ?, ?)""",
                   (datetime.now().isoformat(), pdf_name, extracted_text, summary))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"[DB] log_pdf_db error: {e}")
 
 def save_entity(entity_name: str):
-    """Creates alias rows for an entity (keeps simple)."""
-    aliases = generate_aliases(entity_name)
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        for alias in aliases:
-            c.execute("INSERT INTO entity_aliases (entity_name, alias) VALUES (?, ?)", (entity_name, alias))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"[DB] save_entity error: {e}")
+    """Creates alias rows for an entity (write-through: the in-memory resolver sees them at once)."""
+    from raya_core.entity_resolver import get_resolver
+    get_resolver(DB_FILE).add(entity_name, generate_aliases(entity_name))
 
 def resolve_entity(word: str) -> str:
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        lw = word.lower()
-        c.execute("SELECT entity_name FROM entity_aliases WHERE alias = ? LIMIT 1", (lw,))
-        row = c.fetchone()
-        conn.close()
-        if row:
-            return row[0]
-    except Exception as e:
-        print(f"[DB] resolve_entity error: {e}")
-    return word
+    from raya_core.entity_resolver import get_resolver  # aliases load once, then lookups stay in memory
+    return get_resolver(DB_FILE).resolve(word)
 
 # =========================
 # ALIASES / CLEANER
@@ -241,16 +173,9 @@ def clean_query(q: str) -> str:
 # =========================
 # IMAGE HANDLING
 # =========================
-def is_valid_image(path):
-    try:
-        with Image.open(path) as img:
-            img.verify()
-            fmt = (img.format or "").lower()
-            return fmt in ["jpeg", "jpg", "png"]
-    except Exception:
-        return False
-
 def process_image():
+    from PIL import Image
+    ensure_dirs("assets/images")
     image_path = input("Enter image path:").strip()
     try:
         img = Image.open(image_path)
@@ -267,83 +192,91 @@ def process_image():
 def analyze_image(image_path):
     if not os.path.exists(image_path):
         return "Image not found."
-    if not is_valid_image(image_path):
-        return "File is not a recognized JPEG/PNG image."
+    from raya_core.image_analysis import analyze, describe  # reduced decode, EXIF from the header
     try:
-        with Image.open(image_path) as img:
-            w, h = img.size
-            mode = img.mode
-            camera = "Unknown"
-            try:
-                raw_exif = img._getexif() or {}
-                exif_data = {}
-                for k, v in raw_exif.items():
-                    tag = ExifTags.TAGS.get(k, k)
-                    exif_data[tag] = v
-                camera = exif_data.get("Model") or exif_data.get("Make") or "Unknown"
-            except Exception:
-                pass
-            small = img.resize((32, 32))
-            colors = small.getcolors(32*32) or []
-            dominant_rgb = max(colors, key=lambda t: t[0])[1] if colors else (0,0,0)
-            r,g,b = dominant_rgb[:3] if isinstance(dominant_rgb, tuple) else (0,0,0)
-            tag_guess = "balanced"
-            if g > r and g > b: tag_guess = "likely vegetation/outdoor"
-            elif b > r and b > g: tag_guess = "likely sky/water"
-            elif r > g and r > b: tag_guess = "likely warm/indoor or objects"
-            desc = f"Image {os.path.basename(image_path)} — {w}x{h}px, mode {mode}. Camera: {camera}. Dominant RGB: {r},{g},{b} ({tag_guess})."
-            log_image_db(os.path.basename(image_path), [], desc)
-            store_data(USER_ID, "image", desc, tags=tag_guess)
-            return desc
+        info = analyze(image_path)
+    except ValueError:
+        return "File is not a recognized JPEG/PNG image."
     except Exception as e:
         return f"Failed to analyze image: {e}"
+    desc = describe(info)
+    log_image_db(info["name"], [], desc)
+    store_data(USER_ID, "image", desc, tags=info["tag"])
+    return desc
+
+def analyze_image_dir(directory):
+    """Analyze every JPEG/PNG in a folder (process pool), skip near-duplicate shots, log the rest in bulk."""
+    if not os.path.isdir(directory):
+        return "Folder not found."
+    from raya_core.image_analysis import analyze_dir, describe
+    result = analyze_dir(directory)
+    kept, duplicates, failed = result["kept"], result["duplicates"], result["failed"]
+    if not (kept or failed):
+        return "No JPEG/PNG images in that folder."
+    now = datetime.now().isoformat()
+    descs = [describe(info) for info in kept]
+    _db().executemany("""INSERT INTO image_logs (timestamp, image_name, detected_objects, ai_description)
+                         VALUES (?, ?, ?, ?)""",
+                      [(now, info["name"], "[]", d) for info, d in zip(kept, descs)])
+    _db().executemany("INSERT INTO raya_data (timestamp, user_id, data_type, content, tags) VALUES (?, ?, ?, ?, ?)",
+                      [(now, USER_ID, "image", d, info["tag"]) for info, d in zip(kept, descs)])
+    lines = [f"Analyzed {len(kept)} image(s) in {directory}."]
+    lines += [f"- {d}" for d in descs]
+    if duplicates:
+        lines.append(f"Skipped {len(duplicates)} near-duplicate(s): "
+                     + ", ".join(f"{dup} (same as {orig})" for dup, orig in duplicates))
+    if failed:
+        lines.append("Could not read: " + ", ".join(f"{f['name']} ({f['error']})" for f in failed))
+    return "\n".join(lines)
 
 # =========================
 # PDF HANDLING
 # =========================
-def extract_pdf_text(pdf_path):
+def extract_pdf_text(pdf_path, max_pages=None):
     if not os.path.exists(pdf_path):
         return ""
-    text = ""
+    from raya_core.pdf_extract import extract_text  # page ranges in parallel for long PDFs
     try:
-        with open(pdf_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+        return extract_text(pdf_path, max_pages)
     except Exception as e:
         return f"[PDF read error] {e}"
-    return text
 
 def summarize_text(text, max_sentences=5):
-    if not text:
-        return ""
-    sentences = re.split(r'(?<=[.!?])\s+|\n', text)
-    word_freq = {}
-    for word in re.findall(r"\b[a-zA-Z]{4,}\b", text.lower()):
-        word_freq[word] = word_freq.get(word,0)+1
-    scores = {}
-    for s in sentences:
-        score = sum(word_freq.get(w,0) for w in re.findall(r"\b[a-zA-Z]{4,}\b", s.lower()))
-        if s.strip():
-            scores[s] = score
-    top = nlargest(max_sentences, scores, key=scores.get)
-    return " ".join(top)
-
-def process_pdf(pdf_path):
-    extracted = extract_pdf_text(pdf_path)
+    from raya_core.summarizer import summarize
+    return summarize(text, max_sentences)
+
+def process_pdf(pdf_path, max_pages=None):
+    """Summarize a PDF. Re-sent files (same bytes) come from the cache; long ones show a running summary."""
+    ensure_dirs("assets/pdfs")
+    if not os.path.exists(pdf_path):
+        return "Couldn't extract text (file missing or unreadable)."
+    from raya_core.pdf_extract import summarize_pdf
+    last = [0.0]
+
+    def progress(done, total, summary):
+        if time.time() - last[0] >= 2 or done == total:
+            last[0] = time.time()
+            print(f"[PDF] {done}/{total} pages so far: {summary[:300]}")
+
+    try:
+        result = summarize_pdf(pdf_path, max_sentences=6, max_pages=max_pages, progress=progress)
+    except Exception as e:
+        return f"[PDF read error] {e}"
+    extracted, summary = result["text"], result["summary"]
     if not extracted:
         return "Couldn't extract text (file missing or unreadable)."
-    summary = summarize_text(extracted, max_sentences=6)
     log_pdf_db(os.path.basename(pdf_path), extracted, summary)
     store_data(USER_ID, "pdf", f"PDF:{os.path.basename(pdf_path)} | len={len(extracted)}", tags="summary")
-    return f"Summary of {os.path.basename(pdf_path)}:\n{summary}"
+    scope = f" (first {result['pages']} of {result['total_pages']} pages)" if result["pages"] < result["total_pages"] else ""
+    return f"Summary of {os.path.basename(pdf_path)}{scope}:\n{summary}"
 
 # =========================
 # WEATHER & LOCATION
 # =========================
 def get_location_by_ip():
+    from raya_core import transport
     try:
-        response = requests.get("https://ipinfo.io", timeout=5)
+        response = transport.get("https://ipinfo.io", timeout=5)
         city = response.json().get("city", "")
         if city:
             print(f"RAYA SAY: Detected your current location as {city}")
@@ -363,8 +296,9 @@ def get_weather(city=""):
         print("RAYA SAY: Weather API key not set.")
         return
     url = f"https://api.openweathermap.org/data/2.5/weather?appid={api_key}&q={city}&units=metric"
+    from raya_core import transport
     try:
-        response = requests.get(url, timeout=10)
+        response = transport.get(url, timeout=10)
         data = response.json()
         if data.get("cod") != "404":
             main = data["main"]
@@ -383,10 +317,11 @@ def get_weather(city=""):
 # NEWS SOURCES (interactive)
 # =========================
 def get_bbc_headlines():
+    from bs4 import BeautifulSoup
+    from raya_core import transport
     try:
         url = "https://www.bbc.com/news"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = transport.get(url, timeout=10)
         soup = BeautifulSoup(response.text, "html.parser")
         headlines = [tag.get_text(strip=True) for tag in soup.find_all('h2') if tag.get_text(strip=True)]
         return headlines[:10]
@@ -395,10 +330,11 @@ def get_bbc_headlines():
         return []
 
 def get_cnn_headlines():
+    from bs4 import BeautifulSoup
+    from raya_core import transport
     try:
         url = "http://edition.cnn.com"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=8)
+        response = transport.get(url, timeout=8)
         soup = BeautifulSoup(response.text, "html.parser")
         headlines = []
         for span in soup.find_all("span", class_="container__headline-text"):
@@ -410,38 +346,41 @@ def get_cnn_headlines():
         return []
 
 def get_ndtv_headlines():
+    from raya_core import transport
     try:
         url = "https://feeds.feedburner.com/ndtvnews-top-stories"
-        feed = feedparser.parse(url)
+        feed = transport.fetch_feed(url)
         return [entry.title for entry in feed.entries[:10]]
     except Exception:
         return []
 
 def get_aljazeera_headlines():
+    from raya_core import transport
     try:
         url = "https://aljazeera.com/xml/rss/all.xml"
-        feed = feedparser.parse(url)
+        feed = transport.fetch_feed(url)
         return [entry.title for entry in feed.entries[:10]]
     except Exception:
         return []
 
 # =========================
-# HELPERS: fallback intent detector if module missing
+# STREAMED OUTPUT
 # =========================
-def _fallback_detect_intents(text: str):
-    t = (text or "").strip().lower()
-    if not t:
-        return {"fact": 0.5}
-    if t == "news":
-        return {"news": 1.0}
-    if t.startswith("news "):
-        return {"news": 0.9}
-    if re.search(r"^(who|what|when|where|why|how)\b", t) or "?" in t:
-        return {"fact": 0.9, "qa": 0.7}
-    return {"fact": 0.6, "qa": 0.5}
-
-if detect_intents is None:
-    detect_intents = _fallback_detect_intents
+def print_streamed(stream) -> str:
+    """Print answer chunks as they arrive; returns the final answer text."""
+    print("RAYA SAY: ", end="", flush=True)
+    parts = []
+    result = None
+    try:
+        while True:
+            chunk = next(stream)
+            parts.append(chunk)
+            print(chunk, end="", flush=True)
+    except StopIteration as stop:
+        result = stop.value
+    finally:
+        print()
+    return result.text if result is not None else "".join(parts)
 
 # =========================
 # BRANDING/INTRO
@@ -450,12 +389,222 @@ def branding_intro():
     if DEV_MODE:
         print("Raya Dev Mode: Skipping boot sequence.\n")
         return
+    import pyfiglet
     banner = pyfiglet.figlet_format("V.E.D.A", font="slant")
     print(Fore.CYAN + banner)
     print(Fore.YELLOW + "Civilization Protocols//Responsive Intelligence Tier 1.0")
     print(Fore.CYAN + "="*60)
     time.sleep(0.6)
 
+# =========================
+# COMMAND HANDLERS
+# =========================
+# Checked in registration order; the first matching handler owns the input.
+# Handlers import their heavy dependencies on first use, so none of them
+# cost anything at startup.
+COMMANDS = []
+
+def command(match):
+    """Register a handler(user_input, command) for inputs where match(command) is true."""
+    def register(fn):
+        COMMANDS.append((match, fn))
+        return fn
+    return register
+
+def reply(user_input, ans):
+    print(f"RAYA SAY: {ans}")
+    save_conversation(user_input, ans, message_type="text")
+
+@command(lambda c: c == "time")
+def cmd_time(user_input, command):
+    reply(user_input, f"The current time is {datetime.now().strftime('%H:%M:%S')}")
+
+@command(lambda c: c == "date")
+def cmd_date(user_input, command):
+    reply(user_input, f"Today's date is {date.today()}")
+
+# ---- Weather handling ----
+@command(lambda c: c.strip().lower() == "weather")
+def cmd_weather(user_input, command):
+    city = input("RAYA SAY: Which city? (Leave blank to use your current location): ").strip()
+    if not city:
+        city = get_location_by_ip()
+    if city:
+        get_weather(city.strip().title())
+    save_conversation(user_input, f"[weather:{city or 'auto'}]", message_type="text")
+
+@command(lambda c: c.startswith(("what is weather", "how is weather", "explain weather")))
+def cmd_weather_concept(user_input, command):
+    # Conceptual question → engine or fallback text
+    respond_to_query = _optional("raya_core.engine", "respond_to_query")
+    if respond_to_query:
+        ans = respond_to_query(user_input, DB_FILE)
+        out = ans if str(ans).lstrip().startswith("RAYA") else f"RAYA SAY: {ans}"
+    else:
+        out = "RAYA SAY: Weather is the state of the atmosphere at a given time and place."
+    print(out)
+    save_conversation(user_input, out, message_type="text")
+
+@command(lambda c: c.startswith(("weather in", "forecast in", "temperature in")))
+def cmd_weather_in(user_input, command):
+    respond_to_query = _optional("raya_core.engine", "respond_to_query")
+    if respond_to_query:
+        ans = respond_to_query(user_input, DB_FILE)
+        out = ans if str(ans).lstrip().startswith("RAYA") else f"RAYA SAY: {ans}"
+    else:
+        out = f"RAYA SAY: Fetching weather info for {command}..."
+    print(out)
+    save_conversation(user_input, out, message_type="text")
+
+# Jokes
+@command(lambda c: "joke" in c)
+def cmd_joke(user_input, command):
+    jokes = [
+        "Why did the Python programmer go hungry? Because his food was in bytes!",
+        "I told my code to clean the house. Now my laptop is gone."
+    ]
+    reply(user_input, random.choice(jokes))
+
+# Search / Play
+@command(lambda c: c.startswith("search"))
+def cmd_search(user_input, command):
+    q = command.replace("search", "", 1).strip()
+    print(f"RAYA SAY: Searching Google for {q}")
+    try:
+        import pywhatkit
+        pywhatkit.search(q)
+    except Exception as e:
+        print(f"RAYA SAY: Could not open browser: {e}")
+    _db().execute(
+        "INSERT INTO search_logs (timestamp, search_query, search_results) VALUES (?, ?, ?)",
+        (datetime.now().isoformat(), q, "opened in browser")
+    )
+    store_data(USER_ID, "search", q)
+    save_conversation(user_input, f"Searched: {q}", message_type="text")
+
+@command(lambda c: c.startswith("play"))
+def cmd_play(user_input, command):
+    song = command.replace("play", "", 1).strip()
+    print(f"RAYA SAY: Playing {song} on YouTube")
+    try:
+        import pywhatkit
+        pywhatkit.playonyt(song)
+    except Exception as e:
+        print(f"RAYA SAY: Could not play: {e}")
+    save_conversation(user_input, f"Played: {song}", message_type="text")
+
+# Interactive news menu (exact "news")
+@command(lambda c: c.strip().lower() == "news")
+def cmd_news_menu(user_input, command):
+    print("RAYA SAY: Fetching Top News Headlines.....")
+    print("1. BBC\n2. CNN\n3. NDTV\n4. Al Jazeera")
+    choice = input("Your choice (1/2/3/4): ").strip()
+    headlines = []; source = ""
+    if choice == "1": headlines = get_bbc_headlines(); source = "BBC"
+    elif choice == "2": headlines = get_cnn_headlines(); source = "CNN"
+    elif choice == "3": headlines = get_ndtv_headlines(); source = "NDTV"
+    elif choice == "4": headlines = get_aljazeera_headlines(); source = "Al Jazeera"
+    else:
+        print("RAYA SAY: Invalid news source choice.")
+    if headlines:
+        ans = "Top 10 news from " + source + ":\n" + "\n".join([f"{i+1}. {h}" for i, h in enumerate(headlines)])
+        reply(user_input, ans)
+
+# Topic news: "news <topic>" or "latest news on ..."
+@command(lambda c: "news" in c)
+def cmd_topic_news(user_input, command):
+    topic = command
+    for pat in [
+        "latest news on", "latest news about", "latest news of",
+        "recent news on", "recent news", "news today",
+        "news on", "news about", "news of", "latest news", "news"
+    ]:
+        topic = re.sub(rf"\\b{pat}\\b", "", topic, flags=re.I)
+    topic = topic.strip()
+    if not topic:
+        topic = "latest"
+    print(f"RAYA SAY: Fetching news on {topic}....")
+
+    headlines = []
+    try:
+        # Attempt live Google News RSS query if search_topic_news unavailable
+        search_topic_news = _optional("raya_core.source_news_topic", "search_topic_news")
+        if search_topic_news:
+            headlines = search_topic_news(topic, max_items=10)
+        else:
+            from raya_core import transport
+            gnews_url = f"https://news.google.com/rss/search?q={quote(topic)}&hl=en-IN&gl=IN&ceid=IN:en"
+            feed = transport.fetch_feed(gnews_url)
+            headlines = [entry.title for entry in feed.entries[:10]]
+    except Exception as e:
+        print(f"[NEWS] search_topic_news error: {e}")
+
+    if headlines:
+        reply(user_input, "Here are some recent headlines:\n" + "\n".join([f"{i+1}. {h}" for i, h in enumerate(headlines)]))
+    else:
+        reply(user_input, f"Sorry, I couldn’t find recent news about {topic}.")
+
+# Image / PDF / Export handling
+@command(lambda c: c == "upload image")
+def cmd_upload_image(user_input, command):
+    process_image()
+
+@command(lambda c: c.startswith("images "))
+def cmd_images(user_input, command):
+    path = command.replace("images", "", 1).strip().strip('"').strip("'")
+    reply(user_input, analyze_image_dir(path))
+
+@command(lambda c: c.startswith("image "))
+def cmd_image(user_input, command):
+    path = command.replace("image", "", 1).strip().strip('"').strip("'")
+    reply(user_input, analyze_image(path))
+
+# "pdf <path>" or "pdf <path> --pages 50" (only the first 50 pages)
+@command(lambda c: c.startswith("pdf "))
+def cmd_pdf(user_input, command):
+    path = command.replace("pdf", "", 1).strip()
+    limit = re.search(r"\s+--pages\s+(\d+)$", path)
+    if limit:
+        path = path[:limit.start()]
+    path = path.strip().strip('"').strip("'")
+    out = f"RAYA SAY:\n{process_pdf(path, int(limit.group(1)) if limit else None)}"
+    print(out)
+    save_conversation(user_input, out, message_type="text")
+
+# "export" appends rows added since the last export (NDJSON + CSV); "export parquet" adds Parquet parts
+@command(lambda c: c in ["export", "export data", "export all", "export parquet"])
+def cmd_export(user_input, command):
+    from raya_core.exporter import export_all
+    formats = ("ndjson", "csv", "parquet") if command == "export parquet" else ("ndjson", "csv")
+    counts = export_all(DB_FILE, "exports", formats=formats)
+    total = sum(counts.values())
+    detail = ", ".join(f"{t} {n}" for t, n in counts.items() if n)
+    reply(user_input, f"Exported {total} new row(s) to the 'exports' folder" + (f" ({detail})." if detail else "."))
+
+# Latency report: "trace summary" (last hour) or "trace summary 15m" / "24h" / "all"
+@command(lambda c: c.startswith("trace summary"))
+def cmd_trace_summary(user_input, command):
+    from raya_core import tracing
+    try:
+        window = tracing.parse_window(command.replace("trace summary", "", 1) or "1h")
+    except ValueError:
+        print("RAYA SAY: Use a window like 15m, 2h, 1d or all.")
+        return
+    print(tracing.format_summary(tracing.summarize(window=window)))
+
+# ---- All other queries: delegate to the orchestrator ----
+def answer_query(user_input):
+    try:
+        from raya_core.orchestrator import ask_raya_stream  # Q&A stack loads on the first question
+        text = print_streamed(ask_raya_stream(user_input))  # prints tokens as they arrive
+        out = f"RAYA SAY: {text}"
+    except Exception as e:
+        print(f"[ORCHESTRATOR] error: {e}")
+        out = f"RAYA SAY: Sorry, I don't know the answer to that."
+        print(out)
+
+    save_conversation(user_input, out, message_type="text")
+
 # =========================
 # MAIN CLI LOOP
 # =========================
@@ -478,213 +627,12 @@ def main():
         # Log raw input
         store_data(USER_ID, "text", user_input)
 
-        # Fast local handlers (time/date/weather/joke/search/play/news sources)
-        if "time" in command and command == "time":
-            ans = f"The current time is {datetime.now().strftime('%H:%M:%S')}"
-            print(f"RAYA SAY: {ans}")
-            save_conversation(user_input, ans, message_type="text")
-            continue
-
-        if "date" in command and command == "date":
-            ans = f"Today's date is {date.today()}"
-            print(f"RAYA SAY: {ans}")
-            save_conversation(user_input, ans, message_type="text")
-            continue
-
-        # ---- Weather handling ----
-        if command.strip().lower() == "weather":
-            city = input("RAYA SAY: Which city? (Leave blank to use your current location): ").strip()
-            if not city:
-                city = get_location_by_ip()
-            if city:
-                get_weather(city.strip().title())
-            save_conversation(user_input, f"[weather:{city or 'auto'}]", message_type="text")
-            continue
-
-        elif command.startswith("what is weather") or command.startswith("how is weather") or command.startswith("explain weather"):
-            # Conceptual question → engine or fallback text
-            if respond_to_query:
-                ans = respond_to_query(user_input, DB_FILE)
-                out = ans if str(ans).lstrip().startswith("RAYA") else f"RAYA SAY: {ans}"
-            else:
-                out = "RAYA SAY: Weather is the state of the atmosphere at a given time and place."
-            print(out)
-            save_conversation(user_input, out, message_type="text")
-            continue
-
-        elif command.startswith("weather in") or command.startswith("forecast in") or command.startswith("temperature in"):
-            if respond_to_query:
-                ans = respond_to_query(user_input, DB_FILE)
-                out = ans if str(ans).lstrip().startswith("RAYA") else f"RAYA SAY: {ans}"
-            else:
-                out = f"RAYA SAY: Fetching weather info for {command}..."
-            print(out)
-            save_conversation(user_input, out, message_type="text")
-            continue
-
-        # Jokes
-        if "joke" in command or "jokes" in command:
-            jokes = [
-                "Why did the Python programmer go hungry? Because his food was in bytes!",
-                "I told my code to clean the house. Now my laptop is gone."
-            ]
-            ans = random.choice(jokes)
-            print(f"RAYA SAY: {ans}")
-            save_conversation(user_input, ans, message_type="text")
-            continue
-
-        # Search / Play
-        if command.startswith("search"):
-            q = command.replace("search", "", 1).strip()
-            print(f"RAYA SAY: Searching Google for {q}")
-            try:
-                pywhatkit.search(q)
-            except Exception as e:
-                print(f"RAYA SAY: Could not open browser: {e}")
-            conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-            c.execute(
-                "INSERT INTO search_logs (timestamp, search_query, search_results) VALUES (?, ?, ?)",
-                (datetime.now().isoformat(), q, "opened in browser")
-            )
-            conn.commit(); conn.close()
-            store_data(USER_ID, "search", q)
-            save_conversation(user_input, f"Searched: {q}", message_type="text")
-            continue
-
-        if command.startswith("play"):
-            song = command.replace("play", "", 1).strip()
-            print(f"RAYA SAY: Playing {song} on YouTube")
-            try:
-                pywhatkit.playonyt(song)
-            except Exception as e:
-                print(f"RAYA SAY: Could not play: {e}")
-            save_conversation(user_input, f"Played: {song}", message_type="text")
-            continue
-
-        # Interactive news menu (exact "news")
-        if command.strip().lower() == "news":
-            print("RAYA SAY: Fetching Top News Headlines.....")
-            print("1. BBC\n2. CNN\n3. NDTV\n4. Al Jazeera")
-            choice = input("Your choice (1/2/3/4): ").strip()
-            headlines = []; source = ""
-            if choice == "1": headlines = get_bbc_headlines(); source = "BBC"
-            elif choice == "2": headlines = get_cnn_headlines(); source = "CNN"
-            elif choice == "3": headlines = get_ndtv_headlines(); source = "NDTV"
-            elif choice == "4": headlines = get_aljazeera_headlines(); source = "Al Jazeera"
-            else:
-                print("RAYA SAY: Invalid news source choice.")
-            if headlines:
-                ans = "Top 10 news from " + source + ":\n" + "\n".join([f"{i+1}. {h}" for i, h in enumerate(headlines)])
-                out = f"RAYA SAY: {ans}"
-                print(out)
-                save_conversation(user_input, out, message_type="text")
-            continue
-
-        # Topic news: "news <topic>" or "latest news on ..."
-        # --- Fixed RAYA.py News Topic Fetch ---
-# This keeps your time/date/weather/news menu logic intact.
-# Only improves the "latest news on <topic>" & "news <topic>" pipeline.
-
-# Replace only the topic-news section:
-
-        # Topic news: "news <topic>" or "latest news on ..."
-        if "news" in command:
-            if command.strip() != "news":  # exact 'news' is handled above
-                topic = command
-                for pat in [
-                    "latest news on", "latest news about", "latest news of",
-                    "recent news on", "recent news", "news today",
-                    "news on", "news about", "news of", "latest news", "news"
-                ]:
-                    topic = re.sub(rf"\\b{pat}\\b", "", topic, flags=re.I)
-                topic = topic.strip()
-                if not topic:
-                    topic = "latest"
-                print(f"RAYA SAY: Fetching news on {topic}....")
-
-                headlines = []
-                try:
-                    # Attempt live Google News RSS query if search_topic_news unavailable
-                    if search_topic_news:
-                        headlines = search_topic_news(topic, max_items=10)
-                    else:
-                        gnews_url = f"https://news.google.com/rss/search?q={requests.utils.quote(topic)}&hl=en-IN&gl=IN&ceid=IN:en"
-                        feed = feedparser.parse(gnews_url)
-                        headlines = [entry.title for entry in feed.entries[:10]]
-                except Exception as e:
-                    print(f"[NEWS] search_topic_news error: {e}")
-
-                if headlines:
-                    ans = "Here are some recent headlines:\n" + "\n".join([f"{i+1}. {h}" for i, h in enumerate(headlines)])
-                    out = f"RAYA SAY: {ans}"
-                    print(out)
-                    save_conversation(user_input, out, message_type="text")
-                else:
-                    out = f"RAYA SAY: Sorry, I couldn’t find recent news about {topic}."
-                    print(out)
-                    save_conversation(user_input, out, message_type="text")
-                continue
-
-        # Image / PDF / Export handling
-        if command == "upload image":
-            process_image(); continue
-
-        if command.startswith("image "):
-            path = command.replace("image", "", 1).strip().strip('"').strip("'")
-            ans = analyze_image(path)
-            out = f"RAYA SAY: {ans}"
-            print(out)
-            save_conversation(user_input, out, message_type="text")
-            continue
-
-        if command.startswith("pdf "):
-            path = command.replace("pdf", "", 1).strip().strip('"').strip("'")
-            ans = process_pdf(path)
-            out = f"RAYA SAY:\n{ans}"
-            print(out)
-            save_conversation(user_input, out, message_type="text")
-            continue
-
-        if command in ["export", "export data", "export all"]:
-            conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-            tables = ["conversations","raya_data","image_logs","pdf_logs","search_logs"]
-            for t in tables:
-                rows = c.execute(f"SELECT * FROM {t}").fetchall()
-                cols = [d[0] for d in c.description] if c.description else []
-                csv_path = os.path.join("exports", f"{t}.csv")
-                with open(csv_path,"w",newline="",encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(cols)
-                    writer.writerows(rows)
-                json_path = os.path.join("exports", f"{t}.json")
-                dict_rows = [dict(zip(cols,r)) for r in rows]
-                with open(json_path,"w",encoding="utf-8") as f:
-                    json.dump(dict_rows,f,ensure_ascii=False, indent=2)
-            conn.close()
-            out = "RAYA SAY: Exported all data to the 'exports' folder."
-            print(out)
-            save_conversation(user_input, out, message_type="text")
-            continue
-
-        # ---- All other queries: delegate to QA engine or pipeline ----
-        try:
-            ans_obj = ask_raya(user_input)  # Returns object with .text
-            out = f"RAYA SAY: {ans_obj.text}"
-        except Exception as e:
-            print(f"[ORCHESTRATOR] error: {e}")
-            out = f"RAYA SAY: Sorry, I don't know the answer to that."
+        for match, handler in COMMANDS:
+            if match(command):
+                handler(user_input, command)
+                break
+        else:
+            answer_query(user_input)
 
-        print(out)
-        save_conversation(user_input, out, message_type="text")
-
-        # 1) Try QA engine (if available)
-        if answer_question_func:
-            try:
-                qa_res = answer_question_func(user_input)
-                # qa_engine returns an object wit-
-                out = f"RAYA SAY: {ans}"
-            finally: 
-                print(out)
-        save_conversation(user_input, out, message_type="text")
 if __name__ == "__main__":
     main()
@@ -12,6 +12,7 @@ HEADINGS = {
     "news": "News hits",
     "arxiv": "Research",
     "cache": "Curated Knowledge",
+    "local": "Local model",
 }
 
 def _trim(text: str, limit: int = 1200) -> str:
@@ -1,40 +1,57 @@
 # raya_core/backend_cloud.py
 import os
-from openai import OpenAI
+import asyncio
+import threading
+from typing import Optional
 from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv())
 
+from raya_core.cloud_client import BudgetExceeded, CloudClient, LoopThread
+from raya_core.config import CLOUD_TOTAL_TIMEOUT
 
-OPENAI_API_KEY = os.getenv( )
-CLOUD_MODEL_NAME = os.getenv("CLOUD_MODEL_NAME", "gpt-4o-mini")
 
-# Initialize client only if key exists
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+CLOUD_MODEL_NAME = os.getenv("CLOUD_MODEL_NAME", "gpt-4o-mini")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 
-# Soft limits (enforced later)
+# Hard limit: counted per day in cloud_budget.json, retries included
 MAX_CLOUD_CALLS_PER_DAY = int(os.getenv("MAX_CLOUD_CALLS_PER_DAY", "1000"))
 
+# One client and one event loop for the whole process, so every caller
+# shares the same rate limits, concurrency slots and daily budget.
+_LOOP: Optional[LoopThread] = None
+_CLIENT: Optional[CloudClient] = None
+_LOCK = threading.Lock()
+
+
+def _client():
+    global _LOOP, _CLIENT
+    if _CLIENT is None:
+        with _LOCK:
+            if _CLIENT is None:
+                _LOOP = LoopThread()
+                _CLIENT = CloudClient(OPENAI_API_KEY, CLOUD_MODEL_NAME, MAX_CLOUD_CALLS_PER_DAY,
+                                      base_url=OPENAI_BASE_URL)
+    return _LOOP, _CLIENT
+
 
 def ask_cloud(prompt, max_tokens=800, temperature=0.2):
     """
-    Cloud LLM call using new OpenAI SDK.
-    Gracefully disables itself if API key is missing.
+    Cloud LLM call through the shared rate-limited client.
+    Gracefully disables itself if API key is missing or today's budget is spent.
+    Retries included, the call gets CLOUD_TOTAL_TIMEOUT seconds; past that it
+    is cancelled, so the calling thread is never held for minutes.
     """
-    if not client:
+    if not OPENAI_API_KEY:
         return "[cloud disabled] OPENAI_API_KEY not set"
 
+    loop, client = _client()
     try:
-        response = client.chat.completions.create(
-            model=CLOUD_MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are RAYA, a precise assistant."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=max_tokens,
-            temperature=temperature,
-        )
-
-        return response.choices[0].message.content.strip()
-
+        return loop.run(asyncio.wait_for(client.complete(prompt, max_tokens=max_tokens, temperature=temperature),
+                                         CLOUD_TOTAL_TIMEOUT))
+    except BudgetExceeded as e:
+        return f"[cloud budget] {e}"
+    except asyncio.TimeoutError:
+        return f"[cloud error] no answer within {CLOUD_TOTAL_TIMEOUT:g}s"
     except Exception as e:
         return f"[cloud error] {e}"
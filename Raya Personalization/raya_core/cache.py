@@ -1,54 +1,222 @@
 import os
 import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict
 
 
 CACHE_ENABLED = False  # 🔥 Day-3 global switch
 
-# Change this to relative path from cache.py to your cache file
+# Legacy whole-file cache. Imported once into the store, never rewritten.
 CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "final_raya_cache.json")
+# Persistent tier
+CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), "final_raya_cache.sqlite")
 
+CACHE_MEMORY_ITEMS = 512        # hot entries kept in the in-memory LRU
+CACHE_MAX_ENTRIES = 20000       # persistent size cap; oldest-used entries are evicted
+CACHE_TTL = 30 * 24 * 3600      # default per-entry TTL in seconds (None = never expire)
 
 
-# Load cache at runtime
-if os.path.exists(CACHE_FILE):
-    try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            _CACHE: Dict[str, Dict] = json.load(f)
-    except Exception:
-        _CACHE = {}
-else:
-    _CACHE = {}
+class TieredCache:
+    """
+    Key -> dict cache with an in-memory LRU in front of a SQLite table.
+    Every write is its own transaction, so the store is never half-written.
+    """
+
+    def __init__(self, path: str, memory_items: int = CACHE_MEMORY_ITEMS,
+                 max_entries: int = CACHE_MAX_ENTRIES, ttl: Optional[float] = CACHE_TTL):
+        self.path = path
+        self.memory_items = memory_items
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires REAL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    # ---------- internal ----------
+    def _expires(self, ttl) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    def _remember(self, key: str, value: dict, expires: Optional[float]):
+        self._lru[key] = (value, expires)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_items:
+            self._lru.popitem(last=False)
+
+    def _evict(self):
+        """Drop expired rows, then least-recently-used rows down to 90% of the cap."""
+        now = time.time()
+        self._conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        excess = self._count - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            self._count -= excess
+        self._lru.clear()
+
+    # ---------- public ----------
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit is not None:
+                value, expires = hit
+                if expires is None or expires > now:
+                    self._lru.move_to_end(key)
+                    return value
+                del self._lru[key]
+
+            row = self._conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            value, expires = json.loads(row[0]), row[1]
+            if expires is not None and expires <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._count -= 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._remember(key, value, expires)
+            return value
+
+    def put(self, key: str, value: dict, ttl: Optional[float] = None):
+        expires = self._expires(ttl)
+        blob = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, expires, time.time()),
+            )
+            if not existed:
+                self._count += 1
+            self._remember(key, value, expires)
+            if self._count > self.max_entries:
+                self._evict()
+
+    def put_many(self, entries: Dict[str, dict], ttl: Optional[float] = None):
+        """Bulk upsert in a single transaction."""
+        expires = self._expires(ttl)
+        now = time.time()
+        rows = [(k, json.dumps(v, ensure_ascii=False), expires, now) for k, v in entries.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._lru.clear()
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._lru.pop(key, None)
+            cur = self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._count -= cur.rowcount
+
+    def items(self) -> Dict[str, dict]:
+        """Snapshot of every live entry (full scan; not for the hot path)."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM cache WHERE expires IS NULL OR expires > ?", (now,)
+            ).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def import_json_once(self, json_path: str):
+        """One-time migration of a legacy whole-file JSON cache into the store."""
+        with self._lock:
+            done = self._conn.execute("SELECT 1 FROM cache_meta WHERE name = 'json_imported'").fetchone()
+            if done or not os.path.exists(json_path):
+                return
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                data = {}
+            entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+            if entries:
+                self.put_many(entries)
+            self._conn.execute("INSERT OR REPLACE INTO cache_meta (name, value) VALUES ('json_imported', '1')")
+
+    def __len__(self):
+        return self._count
+
+
+_STORE: Optional[TieredCache] = None
+_LOCK = threading.Lock()
+
+
+def _store() -> TieredCache:
+    """The answer store, opened (and the legacy JSON imported) on first use."""
+    global _STORE
+    if _STORE is None:
+        with _LOCK:
+            if _STORE is None:
+                store = TieredCache(CACHE_DB)
+                store.import_json_once(CACHE_FILE)
+                _STORE = store
+    return _STORE
+
 
 def _make_key(query: str, intent: str = "fact") -> str:
     """Create a unique cache key per query + intent type."""
     return f"{query.strip().lower()}::{intent}"
 
+def get_entry(key: str) -> Optional[Dict]:
+    """Raw entry lookup by an already-normalized key."""
+    return _store().get(key)
+
+def put_entry(key: str, entry: Dict, ttl: Optional[float] = None):
+    """Raw entry store by an already-normalized key."""
+    try:
+        _store().put(key, entry, ttl=ttl)
+    except Exception as e:
+        print(f"[CACHE] put_entry error: {e}")
+
 def cache_get(query: str, intent: str = "fact") -> Optional[str]:
     key = _make_key(query, intent)
-    return _CACHE.get(key, {}).get("answer")
+    return (_store().get(key) or {}).get("answer")
 
 def cache_put(query: str, answer: str, sources: Dict[str, bool], intent: str = "fact"):
     key = _make_key(query, intent)
-    _CACHE[key] = {
-        "answer": answer,
-        "sources": sources
-    }
     try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(_CACHE, f, ensure_ascii=False, indent=2)
+        _store().put(key, {
+            "answer": answer,
+            "sources": sources
+        })
     except Exception:
         pass
+
 def load_cache():
-    """Return the entire cache dict."""
-    return _CACHE
+    """Return a snapshot of the entire cache as a dict."""
+    return _store().items()
 
 def save_cache(data):
-    """Overwrite the cache file with provided data."""
-    global _CACHE
-    _CACHE = data
+    """Upsert every entry in `data` (one transaction). Prefer put_entry for single answers."""
     try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(_CACHE, f, ensure_ascii=False, indent=2)
+        _store().put_many(data)
     except Exception as e:
         print(f"[CACHE] save_cache error: {e}")
@@ -0,0 +1,88 @@
+# raya_core/cascade.py - ordered backend cascade: each stage runs at most once per query
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as StageTimeout
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from raya_core.tracing import span
+
+MAX_WORKERS = 8
+
+
+@dataclass
+class StageResult:
+    text: str
+    confidence: float
+    source: str
+    meta: dict = field(default_factory=dict)
+
+
+@dataclass
+class Stage:
+    """
+    fn(query, earlier) -> StageResult or None, where `earlier` holds the results
+    of the stages that already ran (in order). The stage gets `budget` seconds;
+    a result at or above `accept` ends the cascade.
+    """
+    name: str
+    fn: Callable[[str, List[StageResult]], Optional[StageResult]]
+    budget: float
+    accept: float
+
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    # own pool: the pipeline stage fans out on the collector pool and waits on it
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="raya-stage")
+    return _EXECUTOR
+
+
+class Cascade:
+    def __init__(self, stages: Dict[str, Stage]):
+        self.stages = stages
+
+    def run(self, query: str, order: List[str],
+            earlier: Optional[List[StageResult]] = None) -> Tuple[Optional[StageResult], List[dict]]:
+        """
+        Run the stages named in `order` (unknown and repeated names are skipped)
+        until one is accepted. `earlier` seeds the results with answers produced
+        outside the cascade. Returns (chosen result, trail); the chosen result
+        is the accepted one, else the most confident one, else None.
+        """
+        results: List[StageResult] = list(earlier or [])
+        trail: List[dict] = []
+        for name in dict.fromkeys(order):
+            stage = self.stages.get(name)
+            if stage is None:
+                continue
+            with span(name, budget=stage.budget) as sp:
+                ctx = contextvars.copy_context()
+                fut = _executor().submit(ctx.run, stage.fn, query, list(results))
+                try:
+                    res = fut.result(timeout=stage.budget)
+                    status = "ok" if res else "empty"
+                except StageTimeout:
+                    res, status = None, "timeout"
+                    sp.fail(f"over budget ({stage.budget}s)")
+                except Exception as e:
+                    res, status = None, "error"
+                    sp.fail(e)
+                conf = res.confidence if res else 0.0
+                sp.set(status=status, confidence=conf)
+            trail.append({"stage": name, "status": status, "confidence": conf})
+            if res is None:
+                continue
+            results.append(res)
+            if conf >= stage.accept:
+                return res, trail
+
+        best = max(results, key=lambda r: r.confidence, default=None)  # first wins ties
+        return best, trail
@@ -0,0 +1,170 @@
+# raya_core/cloud_client.py - async OpenAI client with rate limits, a daily budget and jittered retry
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+from datetime import date
+from typing import Callable, Optional
+
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from raya_core.config import (
+    CLOUD_RPM, CLOUD_TPM, CLOUD_MAX_CONCURRENCY, CLOUD_MAX_RETRIES,
+    CLOUD_RETRY_BASE, CLOUD_RETRY_CAP, CLOUD_TIMEOUT,
+)
+from raya_core.retriever import estimate_tokens
+
+# Persisted per-day call counter
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cloud_budget.json")
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class TokenBucket:
+    """
+    `rate` units per minute, refilled continuously, holding at most `capacity`
+    (default: one minute's worth). acquire(n) waits until n units are available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate / 60.0
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self._last = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, n: float = 1.0):
+        n = min(n, self.capacity)  # an oversized request waits for a full bucket, not forever
+        async with self._lock:     # first come, first served
+            self._refill()
+            while self.tokens < n:
+                await asyncio.sleep((n - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= n
+
+
+class DailyBudget:
+    """Calls allowed per calendar day, counted in a small JSON file so restarts don't reset it."""
+
+    def __init__(self, limit: int, path: str = BUDGET_FILE, today: Callable[[], date] = date.today):
+        self.limit = limit
+        self.path = path
+        self.today = today
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            data = {}
+        if data.get("date") != self.today().isoformat():
+            data = {"date": self.today().isoformat(), "calls": 0}
+        return data
+
+    def used(self) -> int:
+        with self._lock:
+            return self._read()["calls"]
+
+    def spend(self):
+        """Count one call, or raise BudgetExceeded if today's limit is used up."""
+        with self._lock:
+            data = self._read()
+            if data["calls"] >= self.limit:
+                raise BudgetExceeded(f"daily limit of {self.limit} cloud calls reached")
+            data["calls"] += 1
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+
+def _retry_after(err: APIStatusError) -> Optional[float]:
+    try:
+        return float(err.response.headers.get("retry-after"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class CloudClient:
+    """
+    Chat completions with:
+      - a daily call budget (every attempt counts, retries included),
+      - RPM and TPM token buckets (prompt estimate + max_tokens),
+      - at most `max_concurrency` requests in flight,
+      - full-jitter exponential retry on 429 / 5xx / connection errors,
+        honouring Retry-After when the server sends it.
+    Create and use it on one event loop.
+    """
+
+    def __init__(self, api_key: str, model: str, daily_limit: int, base_url: Optional[str] = None,
+                 rpm: float = CLOUD_RPM, tpm: float = CLOUD_TPM, max_concurrency: int = CLOUD_MAX_CONCURRENCY,
+                 max_retries: int = CLOUD_MAX_RETRIES, budget_path: str = BUDGET_FILE,
+                 timeout: float = CLOUD_TIMEOUT):
+        self.model = model
+        self.max_retries = max_retries
+        self.budget = DailyBudget(daily_limit, budget_path)
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # retries are ours (jittered, budget-aware), not the SDK's
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+
+    async def complete(self, prompt: str, max_tokens: int = 800, temperature: float = 0.2,
+                       system: str = "You are RAYA, a precise assistant.") -> str:
+        cost = estimate_tokens(system) + estimate_tokens(prompt) + max_tokens
+        attempt = 0
+        while True:
+            self.budget.spend()
+            await self.requests.acquire(1)
+            await self.tokens.acquire(cost)
+            try:
+                async with self._slots:
+                    response = await self._client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": system},
+                            {"role": "user", "content": prompt},
+                        ],
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )
+                return (response.choices[0].message.content or "").strip()
+            except (RateLimitError, APIConnectionError, APITimeoutError, APIStatusError) as e:
+                retriable = not isinstance(e, APIStatusError) or isinstance(e, RateLimitError) \
+                    or e.status_code >= 500
+                if not retriable or attempt >= self.max_retries:
+                    raise
+                wait = _retry_after(e) if isinstance(e, APIStatusError) else None
+                if wait is None:
+                    wait = random.uniform(0, min(CLOUD_RETRY_CAP, CLOUD_RETRY_BASE * 2 ** attempt))
+                attempt += 1
+                await asyncio.sleep(wait)
+
+    async def close(self):
+        await self._client.close()
+
+
+class LoopThread:
+    """
+    One event loop on a daemon thread, so blocking callers (the orchestrator's
+    worker threads) can share a CloudClient and its limits.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="raya-cloud", daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
@@ -0,0 +1,94 @@
+# raya_core/collector.py - concurrent, deadline-bounded source fan-out
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+from raya_core.tracing import span
+
+# Source callables do blocking network / disk I/O, so threads are the right tool.
+MAX_WORKERS = 8
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for all fan-out calls (created lazily)."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="raya-src")
+    return _EXECUTOR
+
+
+def _run_source(name: str, fn: Callable[[], object]):
+    with span(f"source.{name}") as sp:
+        res = fn()
+        sp.set(hit=res is not None)
+        return res
+
+
+def collect(
+    sources: List[Tuple[str, Callable[[], object]]],
+    budget: float,
+    deadlines: Optional[Dict[str, float]] = None,
+    stop_when: Optional[Callable[[str, object], bool]] = None,
+) -> Tuple[Dict[str, object], List[str]]:
+    """
+    Run every (name, fn) in `sources` at the same time.
+
+    Each source gets its own deadline (seconds, from `deadlines`, capped at `budget`).
+    Returns ({name: result}, [timed_out_names]) with whatever arrived in time.
+    Sources that raise or return None are dropped. If `stop_when(name, result)` is
+    true for an arrived result, pending sources are cancelled and we return early.
+    """
+    deadlines = deadlines or {}
+    start = time.monotonic()
+    executor = get_executor()
+
+    due: Dict[object, float] = {}
+    names: Dict[object, str] = {}
+    for name, fn in sources:
+        # run in a copy of the caller's context so source spans nest under it
+        fut = executor.submit(contextvars.copy_context().run, _run_source, name, fn)
+        names[fut] = name
+        due[fut] = start + min(deadlines.get(name, budget), budget)
+
+    results: Dict[str, object] = {}
+    timed_out: List[str] = []
+    pending = set(names)
+
+    while pending:
+        now = time.monotonic()
+        # expire sources whose own deadline has passed
+        for fut in [f for f in pending if due[f] <= now]:
+            pending.discard(fut)
+            fut.cancel()
+            timed_out.append(names[fut])
+        if not pending:
+            break
+
+        next_due = min(due[f] for f in pending)
+        done, pending = wait(pending, timeout=max(0.0, next_due - now), return_when=FIRST_COMPLETED)
+
+        stop = False
+        for fut in done:
+            try:
+                res = fut.result()
+            except Exception:
+                continue
+            if res is None:
+                continue
+            results[names[fut]] = res
+            if stop_when and stop_when(names[fut], res):
+                stop = True
+        if stop:
+            for fut in pending:
+                fut.cancel()
+            break
+
+    return results, timed_out
+
@@ -1,4 +1,6 @@
 #cionfig.py Source weights / priorities and cache path
+import os
+
 CACHE_PATH = "final_raya_cache.json"
 
 # Priority used by aggregator (higher = preferred)
@@ -16,4 +18,93 @@ SUMMARY_SENTENCES = 3
 ENGINE_ORDER = ["qa", "local", "news", "wikipedia", "llm"]
 
 # Number of sentences for Wikipedia fallback
-WIKI_SENTENCES = 2
\ No newline at end of file
+WIKI_SENTENCES = 2
+
+# Pipeline fan-out: overall budget and per-source deadlines (seconds)
+PIPELINE_BUDGET = 8.0
+SOURCE_DEADLINES = {
+    "qa": 8.0,
+    "custom_db": 1.0,
+    "news": 5.0,
+    "arxiv": 5.0,
+}
+# A candidate at/above this confidence ends collection early (e.g. 0.95 cache hit)
+EARLY_STOP_CONFIDENCE = 0.95
+
+# Shared HTTP transport (raya_core/transport.py)
+HTTP_POOL_HOSTS = 16      # hosts kept in the keep-alive pool
+HTTP_POOL_SIZE = 8        # keep-alive connections per host
+DEFAULT_HOST_LIMIT = 4    # concurrent in-flight requests per host
+HOST_LIMITS = {
+    "localhost:11434": 2,     # Ollama: one model, don't pile up generations
+    "export.arxiv.org": 1,    # arXiv throttles bursts
+}
+DEFAULT_TIMEOUT = 10
+HOST_TIMEOUTS = {
+    "localhost:11434": 30,
+    "api.duckduckgo.com": 6,
+}
+
+# Paraphrase-tolerant answer reuse (raya_core/semantic_cache.py)
+SEMANTIC_DIM = 1024           # hashed feature buckets
+SEMANTIC_THRESHOLD = 0.85     # cosine needed to reuse a cached answer
+SEMANTIC_MAX_ENTRIES = 5000
+
+# Per-stage latency tracing (raya_core/tracing.py)
+TRACE_ENABLED = os.getenv("RAYA_TRACE", "1") == "1"
+TRACE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "raya_traces.jsonl")
+TRACE_MAX_BYTES = 20 * 1024 * 1024   # rotated to <file>.1 past this size
+
+# Topic news prefetcher (raya_core/news_index.py)
+NEWS_REFRESH_INTERVAL = 300       # seconds between background feed polls
+NEWS_RETENTION = 48 * 3600        # headlines older than this drop out of the index
+
+# arXiv source (raya_core/source_arxiv.py)
+ARXIV_CACHE_TTL = 6 * 3600     # cached results survive restarts for this long
+ARXIV_MISS_TTL = 30 * 60       # "nothing found" is remembered for less
+ARXIV_MIN_INTERVAL = 3.0       # seconds between export.arxiv.org requests (their guideline)
+ARXIV_BATCH_MAX = 8            # queued queries packed into one OR'ed request
+
+# Shared Wikipedia layer (raya_core/wiki.py)
+WIKI_CACHE_TTL = 7 * 24 * 3600    # search results, summaries and disambiguation outcomes
+WIKI_MISS_TTL = 24 * 3600         # "no such page" is re-checked sooner
+WIKI_WORKERS = 6                  # concurrent candidate summary fetches
+
+# Conversation context window (raya_core/retriever.py)
+CONTEXT_MAX_TOKENS = 1500     # history + news kept per session (estimated tokens)
+CONTEXT_MAX_TURNS = 6
+CONTEXT_MAX_NEWS = 5
+CONTEXT_MAX_SESSIONS = 1000   # windows kept in memory; the least recently used one is dropped past this
+
+# Cloud LLM client (raya_core/cloud_client.py)
+CLOUD_RPM = 60                 # requests per minute (token bucket)
+CLOUD_TPM = 90000              # prompt + completion tokens per minute (token bucket)
+CLOUD_MAX_CONCURRENCY = 4      # requests in flight at once
+CLOUD_MAX_RETRIES = 4          # retries on 429 / 5xx / connection errors
+CLOUD_RETRY_BASE = 0.5         # seconds; backoff is full-jitter exponential from here
+CLOUD_RETRY_CAP = 20.0
+CLOUD_TIMEOUT = 60.0
+CLOUD_TOTAL_TIMEOUT = 30.0     # one ask_cloud call, retries and backoff included
+
+# HTTP service (raya_server.py)
+SERVER_WORKERS = 8             # ask_raya calls running at once (blocking backends)
+SERVER_QUEUE = 32              # calls allowed to wait for a worker; beyond that -> 429
+SERVER_SHUTDOWN_GRACE = 30.0   # seconds in-flight calls get to finish on shutdown
+SERVER_REQUEST_TIMEOUT = 90.0  # a request waiting longer for its answer gets 504
+SERVER_TOKEN = os.getenv("RAYA_SERVER_TOKEN", "")  # bearer token for GET /v1/sessions/<user>; empty = endpoint off
+
+# PDF extraction (raya_core/pdf_extract.py)
+PDF_WORKERS = min(4, os.cpu_count() or 1)   # processes extracting page ranges
+PDF_PAGES_PER_TASK = 16        # pages one worker extracts per task
+PDF_PARALLEL_MIN_PAGES = 32    # shorter documents are extracted in-process
+PDF_PROGRESSIVE_PAGES = 200    # from this many pages, the summary is built (and shown) as pages arrive
+PDF_CACHE_TTL = 90 * 24 * 3600 # extracted text + summary per file content (SHA-256)
+
+# Image analysis (raya_core/image_analysis.py)
+IMAGE_ANALYSIS_SIZE = 32       # images are reduced to this square before colour / hash work
+IMAGE_WORKERS = min(4, os.cpu_count() or 1)   # processes for "images <dir>"
+IMAGE_PARALLEL_MIN = 8         # smaller folders are analysed in-process
+IMAGE_DEDUPE_DISTANCE = 6      # perceptual-hash bits two photos may differ by and still count as one shot
+
+# Incremental export (raya_core/exporter.py)
+EXPORT_BATCH = 1000            # rows fetched and written per step; memory stays flat as tables grow
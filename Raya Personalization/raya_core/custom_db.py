@@ -1,31 +1,146 @@
+import re
 import sqlite3
+import threading
 
-def query_local_db(db_file: str, text: str, max_chars: int = 1000) -> str | None:
+# base table -> (FTS5 table, indexed column)
+FTS_TABLES = {
+    "raya_data": ("raya_data_fts", "content"),
+    "conversations": ("conversations_fts", "ai_output"),
+}
+
+# BM25 ranks at most this many of the newest matches
+FTS_RANK_WINDOW = 2000
+
+# words that carry no signal for note lookup
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "of", "in", "on", "at", "to", "for", "and",
+    "or", "who", "what", "when", "where", "why", "how", "which", "do", "does", "did", "me",
+    "tell", "about", "please", "can", "you", "i", "my", "it", "this", "that",
+}
+
+_MIGRATED = set()
+_MIGRATE_LOCK = threading.Lock()
+
+
+def _has_table(c, name: str) -> bool:
+    return c.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def ensure_fts(conn: sqlite3.Connection) -> bool:
     """
-    Looks for relevant content in your existing SQLite:
-      - raya_data.content
-      - conversations.ai_output
-    Returns the most recent hit up to max_chars.
+    Create the FTS5 indexes (external-content, kept in sync by triggers) for any
+    base table that exists, and back-fill them from existing rows.
+    Safe to call repeatedly. Returns False if this SQLite build has no FTS5.
     """
     try:
-        like = f"%{text}%"
-        conn = sqlite3.connect(db_file)
-        c = conn.cursor()
+        for base, (fts, col) in FTS_TABLES.items():
+            if not _has_table(conn, base) or _has_table(conn, fts):
+                continue
+            conn.executescript(f"""
+                BEGIN;
+                CREATE VIRTUAL TABLE {fts} USING fts5({col}, content='{base}', content_rowid='id');
+                CREATE TRIGGER {fts}_ai AFTER INSERT ON {base} BEGIN
+                    INSERT INTO {fts}(rowid, {col}) VALUES (new.id, new.{col});
+                END;
+                CREATE TRIGGER {fts}_ad AFTER DELETE ON {base} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {col}) VALUES ('delete', old.id, old.{col});
+                END;
+                CREATE TRIGGER {fts}_au AFTER UPDATE OF {col} ON {base} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {col}) VALUES ('delete', old.id, old.{col});
+                    INSERT INTO {fts}(rowid, {col}) VALUES (new.id, new.{col});
+                END;
+                INSERT INTO {fts}({fts}) VALUES ('rebuild');
+                COMMIT;
+            """)
+        return True
+    except sqlite3.OperationalError:
+        if conn.in_transaction:
+            conn.rollback()
+        return False
 
-        # Try raya_data first
-        c.execute("SELECT content FROM raya_data WHERE content LIKE ? ORDER BY id DESC LIMIT 1", (like,))
-        row = c.fetchone()
-        if row and row[0]:
-            conn.close()
-            return row[0][:max_chars]
 
-        # Then conversations
-        c.execute("SELECT ai_output FROM conversations WHERE ai_output LIKE ? ORDER BY id DESC LIMIT 1", (like,))
-        row = c.fetchone()
+def migrate(db_file: str) -> bool:
+    """Add FTS indexes to an existing database (e.g. raya_conversation.db)."""
+    conn = sqlite3.connect(db_file)
+    try:
+        return ensure_fts(conn)
+    finally:
         conn.close()
+
+
+def _match_expr(text: str) -> str | None:
+    """All content words must appear (any order); quoted so user text can't inject FTS syntax."""
+    words = [w for w in re.findall(r"\w+", text.lower()) if w not in _STOPWORDS]
+    if not words:
+        return None
+    return " AND ".join(f'"{w}"' for w in dict.fromkeys(words))
+
+
+def _search_fts(c, text: str, max_chars: int) -> str | None:
+    expr = _match_expr(text)
+    if not expr:
+        return None
+    for base, (fts, col) in FTS_TABLES.items():
+        if not _has_table(c, fts):
+            continue
+        # rank only the newest FTS_RANK_WINDOW matches so very common terms stay cheap
+        c.execute(
+            f"SELECT b.{col} FROM ("
+            f"  SELECT rowid, bm25({fts}) AS score FROM {fts} WHERE {fts} MATCH ?"
+            f"  ORDER BY rowid DESC LIMIT ?"
+            f") hits JOIN {base} b ON b.id = hits.rowid ORDER BY hits.score, b.id DESC LIMIT 1",
+            (expr, FTS_RANK_WINDOW),
+        )
+        row = c.fetchone()
         if row and row[0]:
             return row[0][:max_chars]
+    return None
 
-        return None
+
+def _search_like(c, text: str, max_chars: int) -> str | None:
+    like = f"%{text}%"
+    # Try raya_data first
+    c.execute("SELECT content FROM raya_data WHERE content LIKE ? ORDER BY id DESC LIMIT 1", (like,))
+    row = c.fetchone()
+    if row and row[0]:
+        return row[0][:max_chars]
+
+    # Then conversations
+    c.execute("SELECT ai_output FROM conversations WHERE ai_output LIKE ? ORDER BY id DESC LIMIT 1", (like,))
+    row = c.fetchone()
+    if row and row[0]:
+        return row[0][:max_chars]
+    return None
+
+
+def query_local_db(db_file: str, text: str, max_chars: int = 1000) -> str | None:
+    """
+    Looks for relevant content in your existing SQLite:
+      - raya_data.content
+      - conversations.ai_output
+    Returns the best BM25-ranked hit (FTS5) up to max_chars, or the most
+    recent substring hit if this SQLite has no FTS5.
+    """
+    try:
+        conn = sqlite3.connect(db_file)
+        try:
+            if db_file not in _MIGRATED:
+                with _MIGRATE_LOCK:
+                    # only remember once every base table exists and is indexed
+                    if ensure_fts(conn) and all(_has_table(conn, b) for b in FTS_TABLES):
+                        _MIGRATED.add(db_file)
+            c = conn.cursor()
+            if any(_has_table(c, fts) for fts, _ in FTS_TABLES.values()):
+                return _search_fts(c, text, max_chars)
+            return _search_like(c, text, max_chars)
+        finally:
+            conn.close()
     except Exception:
         return None
+
+
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:] or ["raya_conversation.db"]:
+        print(f"{path}: {'FTS5 ready' if migrate(path) else 'FTS5 not available'}")
@@ -1,38 +1,54 @@
 # engine.py - central routing for Q/A usage by RAYA CLI
-import json, os, wikipedia, requests
+import json, os
 from datetime import datetime
 
-# local cache search using fuzzy matching
-from difflib import get_close_matches
+from raya_core import transport, wiki
+from raya_core.fuzzy_index import FuzzyIndex
 
-def search_local_knowledge(query):
-    try:
-        path = os.path.join(os.path.dirname(__file__), "final_raya_cache.json")
-        if not os.path.exists(path):
-            # also try parent directory
-            path = os.path.join(os.path.dirname(__file__), "..", "final_raya_cache.json")
+# local knowledge: parsed once, re-read only when the file changes
+_KNOWLEDGE = {"path": None, "mtime": None, "data": {}, "index": FuzzyIndex()}
+
+def _knowledge_path():
+    path = os.path.join(os.path.dirname(__file__), "final_raya_cache.json")
+    if not os.path.exists(path):
+        # also try parent directory
+        path = os.path.join(os.path.dirname(__file__), "..", "final_raya_cache.json")
+    return path
+
+def _load_knowledge():
+    path = _knowledge_path()
+    mtime = os.path.getmtime(path)
+    if path != _KNOWLEDGE["path"]:
+        _KNOWLEDGE.update(path=path, mtime=None, data={}, index=FuzzyIndex())
+    if mtime != _KNOWLEDGE["mtime"]:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         knowledge = data.get("knowledge", data)
-        keys = list(knowledge.keys())
-        match = get_close_matches(query.lower().strip(), keys, n=1, cutoff=0.6)
-        if match:
-            entry = knowledge[match[0]]
+        for k in knowledge:
+            _KNOWLEDGE["index"].add(k)  # only new keys are indexed
+        _KNOWLEDGE.update(mtime=mtime, data=knowledge)
+    return _KNOWLEDGE["data"], _KNOWLEDGE["index"]
+
+def search_local_knowledge(query):
+    try:
+        knowledge, index = _load_knowledge()
+        match = index.best_match(query.lower().strip(), cutoff=0.6)
+        if match and match in knowledge:
+            entry = knowledge[match]
             return entry.get("summary") or entry.get("answer")
     except Exception:
         pass
     return None
 
 def search_wikipedia(query):
-    try:
-        return wikipedia.summary(query, sentences=3, auto_suggest=False)
-    except Exception:
-        return None
+    return wiki.summary(query, sentences=3)
 
 def search_online(query):
     try:
-        url = f"https://api.duckduckgo.com/?q={query}&format=json&no_redirect=1&no_html=1"
-        r = requests.get(url, timeout=6)
+        r = transport.get(
+            "https://api.duckduckgo.com/",
+            params={"q": query, "format": "json", "no_redirect": 1, "no_html": 1},
+        )
         data = r.json()
         return data.get("AbstractText") or data.get("Heading") or None
     except Exception:
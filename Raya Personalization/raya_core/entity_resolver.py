@@ -0,0 +1,161 @@
+# raya_core/entity_resolver.py - alias -> entity resolution from memory: hash map + token trie, write-through inserts
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from raya_core.persistence import FLUSH_TIMEOUT, get_store
+
+_TOKEN = re.compile(r"\w+")
+_END = ""  # trie key holding the entity name (tokens are never empty)
+
+
+def tokens(text: str) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+class Match(NamedTuple):
+    start: int   # character span in the original text
+    end: int
+    text: str
+    entity: str
+
+
+class AliasTrie:
+    """
+    Aliases as token paths ("narendra modi" -> narendra -> modi), so one walk
+    over a query's tokens finds every alias it contains, longest first.
+    The first entity to claim an alias keeps it, like the unique index.
+    """
+
+    def __init__(self):
+        self._root: Dict[str, dict] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, alias: str, entity: str) -> bool:
+        path = tokens(alias)
+        if not path:
+            return False
+        node = self._root
+        for t in path:
+            node = node.setdefault(t, {})
+        if _END in node:
+            return False
+        node[_END] = entity
+        self._size += 1
+        return True
+
+    def longest(self, toks: List[str], i: int):
+        """(end index, entity) of the longest alias starting at toks[i], or None."""
+        node, best = self._root, None
+        for j in range(i, len(toks)):
+            node = node.get(toks[j])
+            if node is None:
+                break
+            if _END in node:
+                best = (j + 1, node[_END])
+        return best
+
+
+class EntityResolver:
+    """
+    Loads entity_aliases once, then answers from memory. add() updates the
+    map and trie at once and queues the insert (INSERT OR IGNORE against
+    the unique alias index), so later lookups never wait on SQLite.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._exact: Optional[Dict[str, str]] = None
+        self._trie = AliasTrie()
+
+    def _loaded(self) -> Dict[str, str]:
+        if self._exact is None:
+            with self._lock:
+                if self._exact is None:
+                    self._load()
+        return self._exact
+
+    def _load(self):
+        exact, trie = {}, AliasTrie()
+        store = get_store(self.db_file)
+        if not store.flush(FLUSH_TIMEOUT):
+            print(f"[DB] queued alias writes not committed after {FLUSH_TIMEOUT:g}s; loading without them")
+        try:
+            rows = store.query("SELECT entity_name, alias FROM entity_aliases ORDER BY id")
+        except sqlite3.OperationalError as e:  # table not created yet
+            print(f"[DB] entity aliases unavailable: {e}")
+            rows = []
+        for entity, alias in rows:
+            if alias:
+                exact.setdefault(alias.lower(), entity)
+                trie.add(alias, entity)
+        self._trie, self._exact = trie, exact
+
+    def reload(self):
+        """Re-read the table (for aliases written by another process)."""
+        with self._lock:
+            self._load()
+
+    def add(self, entity: str, aliases: Iterable[str]) -> int:
+        """Register aliases for `entity`; returns how many were new."""
+        exact = self._loaded()
+        new = []
+        with self._lock:
+            for alias in aliases:
+                key = (alias or "").lower()
+                if key and key not in exact:
+                    exact[key] = entity
+                    self._trie.add(key, entity)
+                    new.append((entity, key))
+        if new:
+            get_store(self.db_file).executemany(
+                "INSERT OR IGNORE INTO entity_aliases (entity_name, alias) VALUES (?, ?)", new)
+        return len(new)
+
+    def resolve(self, word: str) -> str:
+        """Entity whose alias is exactly `word` (case-insensitive), else `word` unchanged."""
+        return self._loaded().get((word or "").lower(), word)
+
+    def find(self, text: str) -> List[Match]:
+        """Every alias in `text`, scanning left to right and taking the longest match at each point."""
+        self._loaded()
+        spans = [(m.start(), m.end(), m.group().lower()) for m in _TOKEN.finditer(text or "")]
+        toks = [s[2] for s in spans]
+        out, i = [], 0
+        while i < len(toks):
+            hit = self._trie.longest(toks, i)
+            if hit is None:
+                i += 1
+                continue
+            end, entity = hit
+            start_c, end_c = spans[i][0], spans[end - 1][1]
+            out.append(Match(start_c, end_c, text[start_c:end_c], entity))
+            i = end
+        return out
+
+    def normalize(self, text: str) -> str:
+        """`text` with every alias found by find() replaced by its entity name."""
+        parts, pos = [], 0
+        for m in self.find(text):
+            parts += [text[pos:m.start], m.entity]
+            pos = m.end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+_RESOLVERS: Dict[str, EntityResolver] = {}
+_LOCK = threading.Lock()
+
+
+def get_resolver(db_file: str) -> EntityResolver:
+    """Shared resolver per database file (aliases load on first use)."""
+    resolver = _RESOLVERS.get(db_file)
+    if resolver is None:
+        with _LOCK:
+            resolver = _RESOLVERS.setdefault(db_file, EntityResolver(db_file))
+    return resolver
@@ -0,0 +1,202 @@
+# raya_core/exporter.py - incremental table export: batched cursor -> NDJSON / CSV / Parquet, per-table high-water marks
+import os
+import csv
+import json
+from typing import Dict, Iterable, List, Sequence
+
+from raya_core.config import EXPORT_BATCH
+from raya_core.persistence import FLUSH_TIMEOUT, get_store
+
+EXPORT_TABLES = ["conversations", "raya_data", "image_logs", "pdf_logs", "search_logs"]
+STATE_FILE = ".export_state.json"
+
+
+class _NDJSON:
+    on_close = False  # True: rows only count as exported once close() has run
+
+    def __init__(self, out_dir: str, table: str, cols: List[str]):
+        self.path = os.path.join(out_dir, f"{table}.ndjson")
+        self.cols = cols
+        self._f = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def reset(self):
+        """Empty output this exporter has no mark for (e.g. left by the old full export)."""
+        open(self.path, "w").close()
+
+    def write(self, rows: List[tuple]):
+        if self._f is None:
+            self._f = open(self.path, "a", encoding="utf-8")
+        self._f.writelines(json.dumps(dict(zip(self.cols, r)), ensure_ascii=False) + "\n" for r in rows)
+        self._f.flush()
+
+    def close(self, ok: bool = True):
+        if self._f is not None:
+            self._f.close()
+
+
+class _CSV(_NDJSON):
+    def __init__(self, out_dir: str, table: str, cols: List[str]):
+        super().__init__(out_dir, table, cols)
+        self.path = os.path.join(out_dir, f"{table}.csv")
+        self._writer = None
+
+    def write(self, rows: List[tuple]):
+        if self._f is None:
+            header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._f = open(self.path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._f)
+            if header:
+                self._writer.writerow(self.cols)
+        self._writer.writerows(rows)
+        self._f.flush()
+
+
+class _Parquet(_NDJSON):
+    """
+    Parquet files cannot be appended to, so each run that finds new rows
+    writes one more part file: <table>/part-<first id>-<last id>.parquet,
+    one row group per batch. "id" is int64, every other column a string.
+    """
+    on_close = True
+
+    def __init__(self, out_dir: str, table: str, cols: List[str]):
+        super().__init__(out_dir, table, cols)
+        self.dir = os.path.join(out_dir, table)
+        self._first = self._last = None
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.dir) and any(n.endswith(".parquet") for n in os.listdir(self.dir))
+
+    def reset(self):
+        for name in os.listdir(self.dir):
+            if name.endswith(".parquet"):
+                os.remove(os.path.join(self.dir, name))
+
+    def write(self, rows: List[tuple]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self._f is None:
+            os.makedirs(self.dir, exist_ok=True)
+            self._schema = pa.schema([(c, pa.int64() if c == "id" else pa.string()) for c in self.cols])
+            self.path = os.path.join(self.dir, f".part-{rows[0][0]}.tmp")
+            self._f = pq.ParquetWriter(self.path, self._schema)
+            self._first = rows[0][0]
+        columns = [
+            pa.array([r[i] if c == "id" or r[i] is None else str(r[i]) for r in rows], type=self._schema.field(c).type)
+            for i, c in enumerate(self.cols)
+        ]
+        self._f.write_batch(pa.RecordBatch.from_arrays(columns, schema=self._schema))
+        self._last = rows[-1][0]
+
+    def close(self, ok: bool = True):
+        """Publish the part file only if every batch made it in; a partial one is deleted."""
+        if self._f is not None:
+            self._f.close()
+            if ok:
+                os.replace(self.path, os.path.join(self.dir, f"part-{self._first}-{self._last}.parquet"))
+            else:
+                os.remove(self.path)
+
+
+_WRITERS = {"ndjson": _NDJSON, "csv": _CSV, "parquet": _Parquet}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def load_state(out_dir: str) -> Dict[str, Dict[str, int]]:
+    """{table: {format: last exported id}}"""
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(out_dir: str, state: Dict[str, Dict[str, int]]):
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _columns(conn, table: str) -> List[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def export_table(conn, table: str, out_dir: str, formats: Sequence[str], state: Dict[str, Dict[str, int]],
+                 batch: int = EXPORT_BATCH) -> int:
+    """
+    Append rows with id above each format's high-water mark. One ordered
+    query walks the primary key from the lowest mark; rows are fetched and
+    written `batch` at a time, and the marks are saved after every batch.
+    A format whose output was deleted starts over from the first row, and
+    output without a mark (from the old full export) is emptied and rebuilt.
+    """
+    cols = _columns(conn, table)
+    if "id" not in cols:
+        return 0
+    marks = state.setdefault(table, {})
+    writers = {fmt: _WRITERS[fmt](out_dir, table, cols) for fmt in formats}
+    for fmt, w in writers.items():
+        if not w.exists():
+            marks[fmt] = 0
+        elif fmt not in marks:
+            w.reset()  # appending would repeat every row already in it
+            marks[fmt] = 0
+    start = min(marks.get(fmt, 0) for fmt in formats)
+    id_col = cols.index("id")
+    pending: Dict[str, int] = {}  # marks of on_close writers, applied once their file is complete
+    written, ok = 0, False
+    cur = conn.execute(f"SELECT * FROM {table} WHERE id > ? ORDER BY id", (start,))
+    try:
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            for fmt, w in writers.items():
+                mark = pending.get(fmt, marks.get(fmt, 0))
+                new = rows if rows[0][id_col] > mark else [r for r in rows if r[id_col] > mark]
+                if new:
+                    w.write(new)
+                    (pending if w.on_close else marks)[fmt] = new[-1][id_col]
+            written += len(rows)
+            _save_state(out_dir, state)
+        ok = True
+    finally:
+        cur.close()
+        for w in writers.values():
+            w.close(ok)
+    marks.update(pending)
+    return written
+
+
+def export_all(db_file: str, out_dir: str = "exports", tables: Iterable[str] = EXPORT_TABLES,
+               formats: Sequence[str] = ("ndjson", "csv"), batch: int = EXPORT_BATCH) -> Dict[str, int]:
+    """Export new rows of every table; returns {table: rows appended}."""
+    formats = [f for f in formats if f in _WRITERS]
+    if "parquet" in formats and not parquet_available():
+        print("[WARN] pyarrow not installed; skipping Parquet export")
+        formats.remove("parquet")
+    os.makedirs(out_dir, exist_ok=True)
+    store = get_store(db_file)
+    if not store.flush(FLUSH_TIMEOUT):  # include writes still queued
+        print(f"[WARN] queued database writes not committed after {FLUSH_TIMEOUT:g}s; exporting without them")
+    state = load_state(out_dir)
+    counts: Dict[str, int] = {}
+    with store.reader() as conn:
+        existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in tables:
+            if table in existing and formats:
+                counts[table] = export_table(conn, table, out_dir, formats, state, batch)
+    _save_state(out_dir, state)
+    return counts
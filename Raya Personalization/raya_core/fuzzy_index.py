@@ -0,0 +1,74 @@
+# raya_core/fuzzy_index.py - trigram-prefiltered fuzzy key lookup
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from rapidfuzz import fuzz, process
+
+MAX_SCAN = 20000      # posting entries scanned per lookup (rarest trigrams first)
+CANDIDATES = 64       # keys handed to rapidfuzz for the final score
+
+
+def trigrams(text: str) -> set:
+    t = f"  {text} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Approximate string lookup over a growing set of keys.
+
+    Keys are indexed by character trigrams. A lookup scans the postings of
+    the query's rarest trigrams (bounded by MAX_SCAN), keeps the keys that
+    share the most trigrams, and scores only those with rapidfuzz. Lookup
+    cost therefore depends on the query, not on how many keys are indexed.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        for k in keys:
+            self.add(k)
+
+    def add(self, key: str):
+        """Index one key; adding a key twice is a no-op."""
+        if key in self._ids:
+            return
+        kid = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = kid
+        for g in trigrams(key):
+            self._postings.setdefault(g, []).append(kid)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def candidates(self, query: str, limit: int = CANDIDATES) -> List[str]:
+        lists = [self._postings[g] for g in trigrams(query) if g in self._postings]
+        if not lists:
+            return []
+        lists.sort(key=len)
+        counts: Counter = Counter()
+        scanned = 0
+        for ids in lists:
+            if scanned >= MAX_SCAN:
+                break
+            take = ids[:MAX_SCAN - scanned]
+            counts.update(take)
+            scanned += len(take)
+        best = heapq.nlargest(limit, counts.items(), key=lambda kv: kv[1])
+        return [self._keys[kid] for kid, _ in best]
+
+    def best_match(self, query: str, cutoff: float = 0.7) -> Optional[str]:
+        """Closest key with similarity >= cutoff (0..1), like difflib.get_close_matches(n=1)."""
+        if query in self._ids:
+            return query
+        cands = self.candidates(query)
+        if not cands:
+            return None
+        hit = process.extractOne(query, cands, scorer=fuzz.ratio, score_cutoff=cutoff * 100)
+        return hit[0] if hit else None
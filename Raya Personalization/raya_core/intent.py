@@ -1,6 +1,9 @@
 # intent.py
+import os
 import re
-from typing import Set
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, List, Set
 
 # ---------- Keywords ----------
 QUESTION_WORDS = {
@@ -34,6 +37,54 @@ YESNO_PREFIXES = (
 )
 
 
+# ---------- Compiled matchers ----------
+def _trie(words) -> str:
+    """Alternation of `words` factored into a trie ("n(?:ew(?:est|s)?|ow)"), which re scans much faster."""
+    root: dict = {}
+    for w in words:
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        branches = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(root)
+
+
+_NEWS_WORDS = RECENCY_HINTS | MONTHS | {"news"}
+# FACT_QUESTION_PATTERNS split into "^word\b" openers and "\bphrase\b" phrases
+_FACT_OPENERS = {p[1:-2] for p in FACT_QUESTION_PATTERNS if p.startswith("^")}
+_FACT_PHRASES = {p[2:-2] for p in FACT_QUESTION_PATTERNS if not p.startswith("^")}
+_FIRST = "".join(sorted({w[0] for w in RESEARCH_HINTS | _NEWS_WORDS | _FACT_PHRASES} | {"2", "?"}))
+
+# Every keyword set in one regex. The alternatives sit in a lookahead, so
+# finditer reports each position where some keyword starts (overlapping ones
+# included) and the named group says which intent it belongs to; the leading
+# character class lets re skip positions no keyword can start at. Keywords
+# are substrings, as before: "now" also matches "known".
+_KEYWORDS_RE = re.compile(
+    f"(?=[{re.escape(_FIRST)}])(?=(?:"
+    f"(?P<research>{_trie(RESEARCH_HINTS)})"
+    f"|(?P<news>{_trie(_NEWS_WORDS)}|\\b20\\d{{2}}\\b)"
+    f"|(?P<fact>\\b{_trie(_FACT_PHRASES)}\\b|\\?)"
+    "))"
+)
+
+# is_factual_question's opener: the whole first word is a question word
+_QUESTION_WORD_RE = re.compile(f"(?:{_trie(QUESTION_WORDS)})(?:\\s|$)")
+# Every fact opener, tried once at the start: "what's ...", "whom ...", "does ..."
+_OPENER_RE = re.compile(f"(?:{_trie(_FACT_OPENERS)})\\b|{_QUESTION_WORD_RE.pattern}|{_trie(YESNO_PREFIXES)}")
+
+_COMMANDS = {"date", "time", "news"}
+_ALL = 3  # research, news, fact
+
+
 # ---------- Main Functions ----------
 def is_factual_question(text: str) -> bool:
     """Lightweight classifier: check if a query looks like a factual Q."""
@@ -43,14 +94,10 @@ def is_factual_question(text: str) -> bool:
     t = text.strip().lower()
 
     # ignore simple system commands
-    if t in {"date", "time", "news"}:
+    if t in _COMMANDS:
         return False
 
-    return (
-        "?" in t
-        or t.split()[0] in QUESTION_WORDS
-        or t.startswith(YESNO_PREFIXES)
-    )
+    return "?" in t or bool(_QUESTION_WORD_RE.match(t) or t.startswith(YESNO_PREFIXES))
 
 
 def detect_intents(text: str) -> Set[str]:
@@ -63,29 +110,68 @@ def detect_intents(text: str) -> Set[str]:
         return {"fact"}
 
     q = text.strip().lower()
-    intents: Set[str] = set()
 
     # special-case UI command
     if q == "news":
         return {"news_section"}
 
-    # --- Research ---
-    if any(h in q for h in RESEARCH_HINTS):
-        intents.add("research")
-
-    # --- News ---
-    year_hit = bool(re.search(r"\b20\d{2}\b", q))
-    month_hit = any(m in q for m in MONTHS)
-    recency_hit = any(h in q for h in RECENCY_HINTS)
-    if "news" in q or year_hit or month_hit or recency_hit:
-        intents.add("news")
-
-    # --- Fact ---
-    if any(re.search(p, q) for p in FACT_QUESTION_PATTERNS) or is_factual_question(q):
-        intents.add("fact")
+    intents: Set[str] = {"fact"} if _OPENER_RE.match(q) else set()
+    for m in _KEYWORDS_RE.finditer(q):
+        intents.add(m.lastgroup)
+        if len(intents) == _ALL:
+            break
 
     # --- Fallback ---
     if not intents:
         intents.add("fact")
 
     return intents
+
+
+def detect_intents_batch(texts: Iterable[str]) -> List[Set[str]]:
+    """
+    detect_intents for many queries at once (e.g. the logged conversations).
+    Logged queries repeat a lot, so each distinct text is classified once.
+    """
+    seen: Dict[str, frozenset] = {}
+    out: List[Set[str]] = []
+    for text in texts:
+        hit = seen.get(text)
+        if hit is None:
+            hit = seen[text] = frozenset(detect_intents(text))
+        out.append(set(hit))
+    return out
+
+
+def classify_conversations(db_file: str, chunk: int = 50000) -> Counter:
+    """
+    Count intents over every logged user query, reading the conversations
+    table in chunks so memory stays flat however large it is.
+    """
+    if not os.path.exists(db_file):
+        raise FileNotFoundError(db_file)  # sqlite3 would create an empty one
+    counts: Counter = Counter()
+    conn = sqlite3.connect(db_file)
+    try:
+        cur = conn.execute("SELECT user_input FROM conversations")
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            for intents in detect_intents_batch(r[0] for r in rows):
+                counts.update(intents)
+            counts["_queries"] += len(rows)
+    finally:
+        conn.close()
+    return counts
+
+
+if __name__ == "__main__":
+    # python -m raya_core.intent [raya_conversation.db]
+    import sys
+    db = sys.argv[1] if len(sys.argv) > 1 else "raya_conversation.db"
+    counts = classify_conversations(db)
+    total = counts.pop("_queries", 0)
+    print(f"{total} queries")
+    for intent, n in counts.most_common():
+        print(f"  {intent:<13} {n:>9}  {n / max(total, 1):6.1%}")
@@ -1,7 +1,9 @@
 # raya_core/local_llm.py
-import os, requests
+import os
 from dotenv import load_dotenv, find_dotenv
 
+from raya_core import transport
+
 load_dotenv(find_dotenv())
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 LOCAL_MODEL = os.getenv("LOCAL_MODEL_NAME", "llama3.2:3b")
@@ -13,7 +15,7 @@ def ask_local(prompt, max_tokens=512):
     try:
         url = f"{OLLAMA_HOST}/api/generate"
         payload = {"model": LOCAL_MODEL, "prompt": prompt, "max_tokens": max_tokens}
-        r = requests.post(url, json=payload, timeout=30)
+        r = transport.post(url, json=payload, timeout=30)
         r.raise_for_status()
         j = r.json()
         if "choices" in j and j["choices"]:
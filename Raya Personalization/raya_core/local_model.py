@@ -1,8 +1,11 @@
 # raya_core/local_model.py
 import os
+import json
 import requests
 from dotenv import load_dotenv, find_dotenv
 
+from raya_core import transport
+
 load_dotenv(find_dotenv())
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
@@ -26,7 +29,7 @@ def ask_local(prompt: str, timeout: int = 30) -> str:
     }
 
     try:
-        response = requests.post(
+        response = transport.post(
             LOCAL_API_URL,
             json=payload,
             timeout=timeout
@@ -51,3 +54,60 @@ def ask_local(prompt: str, timeout: int = 30) -> str:
 
     except Exception as e:
         return f"[local error] {str(e)}"
+
+
+def stream_local(prompt: str, timeout: int = 30):
+    """
+    Streaming variant of ask_local: yields text chunks as Ollama produces them.
+    Errors are yielded once in the same "[local error] ..." form as ask_local,
+    and only if nothing has been streamed yet.
+    """
+
+    if not prompt or not prompt.strip():
+        yield "[local error] empty prompt"
+        return
+
+    payload = {
+        "model": LOCAL_MODEL_NAME,
+        "prompt": prompt,
+        "stream": True
+    }
+
+    produced = False
+    try:
+        with transport.stream(
+            "POST",
+            LOCAL_API_URL,
+            json=payload,
+            timeout=timeout
+        ) as response:
+            response.raise_for_status()
+
+            # Ollama streams one JSON object per line
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                chunk = data.get("response", "")
+                if chunk:
+                    produced = True
+                    yield chunk
+                if data.get("done"):
+                    break
+
+        if not produced:
+            yield "[local error] empty response"
+
+    except requests.exceptions.Timeout:
+        if not produced:
+            yield "[local error] timeout"
+
+    except requests.exceptions.ConnectionError:
+        if not produced:
+            yield "[local error] ollama not running"
+
+    except Exception as e:
+        if not produced:
+            yield f"[local error] {str(e)}"
@@ -0,0 +1,166 @@
+# raya_core/news_index.py - background feed prefetcher with an in-memory headline index
+import re
+import time
+import calendar
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from raya_core import transport
+from raya_core.config import NEWS_REFRESH_INTERVAL, NEWS_RETENTION
+
+# words that say "this is a news question" rather than what it is about
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "of", "in", "on", "at", "to", "for", "and", "or",
+    "what", "who", "about", "me", "tell", "show", "any", "latest", "recent", "breaking",
+    "news", "today", "headlines", "update", "updates",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+
+class NewsIndex:
+    """
+    Headlines keyed by link, with a token -> headline-id inverted index.
+    Each headline carries its publish time (or first-seen time), and
+    expire() drops anything older than the retention window.
+    """
+
+    def __init__(self, retention: float = NEWS_RETENTION):
+        self.retention = retention
+        self._items: Dict[str, dict] = {}          # id -> {"title", "feed", "ts"}
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, feed: str, title: str, link: Optional[str] = None, ts: Optional[float] = None) -> bool:
+        """Index one headline; returns False if it is already known or empty."""
+        title = (title or "").strip()
+        if not title:
+            return False
+        hid = link or title
+        with self._lock:
+            if hid in self._items:
+                return False
+            self._items[hid] = {"title": title, "feed": feed, "ts": ts or time.time()}
+            for t in set(_tokens(title)):
+                self._postings.setdefault(t, set()).add(hid)
+        return True
+
+    def search(self, topic: str, max_items: int = 10) -> List[str]:
+        """Newest headlines containing every content word of `topic`."""
+        words = [t for t in dict.fromkeys(_tokens(topic)) if t not in _STOPWORDS]
+        if not words:
+            return []
+        with self._lock:
+            lists = sorted((self._postings.get(t, set()) for t in words), key=len)
+            hits = set(lists[0]).intersection(*lists[1:]) if lists[0] else set()
+            items = sorted((self._items[h] for h in hits), key=lambda it: it["ts"], reverse=True)
+        return list(dict.fromkeys(it["title"] for it in items))[:max_items]
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop headlines older than the retention window; returns how many."""
+        cutoff = (now or time.time()) - self.retention
+        with self._lock:
+            old = [h for h, it in self._items.items() if it["ts"] < cutoff]
+            for h in old:
+                for t in set(_tokens(self._items.pop(h)["title"])):
+                    ids = self._postings.get(t)
+                    if ids is not None:
+                        ids.discard(h)
+                        if not ids:
+                            del self._postings[t]
+        return len(old)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def _entry_time(entry) -> Optional[float]:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return calendar.timegm(parsed) if parsed else None
+
+
+class NewsPrefetcher:
+    """
+    Polls every feed on a schedule with conditional GETs (ETag / Last-Modified),
+    parses new entries once and adds them to a NewsIndex. Topic queries are then
+    answered from memory; nothing is downloaded on the query path.
+    """
+
+    def __init__(self, feeds: Dict[str, str], index: Optional[NewsIndex] = None,
+                 interval: float = NEWS_REFRESH_INTERVAL):
+        self.feeds = feeds
+        self.index = index if index is not None else NewsIndex()
+        self.interval = interval
+        self._validators: Dict[str, tuple] = {}   # feed -> (etag, modified)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.last_refresh: Optional[float] = None
+        self.stats = {"fetched": 0, "not_modified": 0, "errors": 0}
+
+    def _count(self, what: str):
+        with self._stats_lock:
+            self.stats[what] += 1
+
+    def refresh_feed(self, name: str, url: str) -> int:
+        """Fetch one feed (conditionally); returns the number of new headlines."""
+        etag, modified = self._validators.get(name, (None, None))
+        try:
+            feed = transport.fetch_feed(url, etag=etag, modified=modified)
+        except Exception as e:
+            self._count("errors")
+            print(f"[WARN] Failed fetching from {url}: {e}")
+            return 0
+        status = feed.get("status", 200)
+        if status == 304:
+            self._count("not_modified")
+            return 0
+        if status >= 400:
+            # an error page is not a feed: keep the old validators and retry next cycle
+            self._count("errors")
+            print(f"[WARN] Failed fetching from {url}: HTTP {status}")
+            return 0
+        self._count("fetched")
+        self._validators[name] = (feed.get("etag"), feed.get("modified"))
+        return sum(
+            self.index.add(name, e.get("title", ""), e.get("link"), _entry_time(e))
+            for e in feed.entries
+        )
+
+    def refresh(self) -> int:
+        """Poll every feed concurrently, then expire old headlines."""
+        # own short-lived pool: refresh() may itself run on a collector worker
+        with ThreadPoolExecutor(max_workers=max(1, len(self.feeds)), thread_name_prefix="raya-feed") as pool:
+            added = sum(pool.map(lambda kv: self.refresh_feed(*kv), self.feeds.items()))
+        self.index.expire()
+        self.last_refresh = time.time()
+        return added
+
+    def start(self):
+        """Fill the index once (blocking), then keep it fresh in the background."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.refresh()
+            self._thread = threading.Thread(target=self._run, name="raya-news", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[WARN] news refresh failed: {e}")
+
+    def search(self, topic: str, max_items: int = 10) -> List[str]:
+        self.start()
+        return self.index.search(topic, max_items)
@@ -1,23 +1,46 @@
-# orchestrator.py - unified entry for all queries (with deep debug)
+# orchestrator.py - unified entry for all queries (traced per stage, see raya_core/tracing.py)
 import re
-import wikipedia
-import requests
 from bs4 import BeautifulSoup
 from typing import Optional
-from config import ENGINE_ORDER, WIKI_SENTENCES
-from raya_core.cache import load_cache, save_cache
+from config import ENGINE_ORDER, STAGE_BUDGETS, STAGE_ACCEPT, WIKI_SENTENCES, CACHE_MIN_CONFIDENCE
+from raya_core.cache import get_entry, put_entry, load_cache
+from raya_core.semantic_cache import SemanticIndex
+from raya_core.singleflight import SingleFlight
 from raya_core.pipeline import run_pipeline
-from aggregator import aggregate
+from raya_core.cascade import Cascade, Stage, StageResult
 from raya_core.base import EngineResult
+from raya_core import transport, wiki
+from raya_core.tracing import span
 from raya_core.cache import cache_get, cache_put
-from raya_core.router import ask_via_router
-from raya_core.local_model import ask_local
+from raya_core.router import ask_via_router, choose_model, local_confidence
+from raya_core.local_model import stream_local
 from raya_core.backend_cloud import ask_cloud
 
-DEBUG = True  # Turn off in production
+_SEMANTIC: Optional[SemanticIndex] = None
+# concurrent identical queries share one execution
+_IN_FLIGHT = SingleFlight()
 
-# Load persistent cache
-_CACHE = None #load_cache()
+def _semantic_index() -> SemanticIndex:
+    """Similarity index over answered queries, warmed from the persistent cache once."""
+    global _SEMANTIC
+    if _SEMANTIC is None:
+        index = SemanticIndex()
+        for k, entry in load_cache().items():
+            if "::" not in k and entry.get("text") and _reusable(entry.get("source"), entry.get("confidence", 0.8)):
+                index.add(k, k)
+        _SEMANTIC = index
+    return _SEMANTIC
+
+def _reusable(source: Optional[str], confidence: float) -> bool:
+    return source != "Fallback" and confidence >= CACHE_MIN_CONFIDENCE
+
+def cache_stats() -> dict:
+    """Hit/miss metrics of the paraphrase layer."""
+    return _semantic_index().stats()
+
+def coalescing_stats() -> dict:
+    """How many ask_raya calls ran vs. piggybacked on an identical in-flight call."""
+    return _IN_FLIGHT.stats()
 
 def _cache_key(q: str) -> str:
     q = q.strip().lower()
@@ -25,137 +48,92 @@ def _cache_key(q: str) -> str:
     return " ".join(q.split())
 
 def _try_wikipedia(query: str) -> Optional[str]:
-    if DEBUG: print(f"[Stage: Wikipedia] 🔍 Searching for: {query}")
-    try:
-        result = wikipedia.summary(query, sentences=WIKI_SENTENCES)
-
-        # ---- Wikipedia Relevance Filter ----
-        irrelevant_keywords = [
-            "film", "album", "song", "television", "episode", "novel",
-            "character", "fictional", "video game", "band", "music", "movie", "drama"
-        ]
-        if result and any(word in result.lower() for word in irrelevant_keywords):
-            if DEBUG: print("[Stage: Wikipedia] ⚠️ Irrelevant Wikipedia result detected — skipping.")
-            result = None
-        # ------------------------------------
-
-        if result:
-            if DEBUG: print(f"[Stage: Wikipedia] ✅ Relevant summary accepted ({len(result)} chars)")
-            return result
-        else:
-            if DEBUG: print("[Stage: Wikipedia] 🚫 No valid Wikipedia summary, moving to next stage...")
+    # ---- Wikipedia Relevance Filter ----
+    irrelevant_keywords = [
+        "film", "album", "song", "television", "episode", "novel",
+        "character", "fictional", "video game", "band", "music", "movie", "drama"
+    ]
 
-    except Exception as e:
-        if DEBUG: print(f"[Stage: Wikipedia] ⚠️ Error: {e}")
+    def relevant(text: str) -> bool:
+        return not any(word in text.lower() for word in irrelevant_keywords)
+    # ------------------------------------
+
+    with span("wikipedia") as sp:
+        # candidate pages are fetched together; the first relevant summary wins
+        hit = wiki.first_acceptable(wiki.search(query), sentences=WIKI_SENTENCES, accept=relevant)
+        if hit:
+            sp.set(title=hit[0], chars=len(hit[1]))
+            return hit[1]
+        sp.set(hit=False)
     return None
 
 
 def _try_web_search(query: str) -> Optional[str]:
-    if DEBUG: print(f"[Stage: WebSearch] 🌐 Searching web for: {query}")
-    try:
-        url = f"https://www.google.com/search?q={query}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code != 200:
-            if DEBUG: print(f"[Stage: WebSearch] ❌ HTTP {response.status_code}")
-            return None
-        soup = BeautifulSoup(response.text, "html.parser")
-        snippet = soup.find("div", class_="BNeawe").text if soup.find("div", class_="BNeawe") else None
-        if snippet:
-            if DEBUG: print(f"[Stage: WebSearch] ✅ Got snippet: {snippet[:80]}...")
-            return snippet
-        else:
-            if DEBUG: print("[Stage: WebSearch] ❌ No snippet found.")
-    except Exception as e:
-        if DEBUG: print(f"[Stage: WebSearch] ⚠️ Error: {e}")
+    with span("web_search") as sp:
+        try:
+            response = transport.get("https://www.google.com/search", params={"q": query}, timeout=5)
+            sp.set(http_status=response.status_code)
+            if response.status_code != 200:
+                return None
+            soup = BeautifulSoup(response.text, "html.parser")
+            snippet = soup.find("div", class_="BNeawe").text if soup.find("div", class_="BNeawe") else None
+            sp.set(hit=bool(snippet))
+            if snippet:
+                return snippet
+        except Exception as e:
+            sp.fail(e)
     return None
 
-def ask_raya(query: str, db_file: str = "custom_db.sqlite", intents: list = []) -> EngineResult:
-    key = _cache_key(query)
-    if DEBUG:
-        print(f"\n[Orchestrator] 🧠 Query: '{query}'")
+def _cached_result(key: str) -> Optional[EngineResult]:
+    from raya_core.cache import CACHE_ENABLED
 
+    if not CACHE_ENABLED:
+        return None
+    with span("cache.lookup") as sp:
+        cached = get_entry(key)
+        meta = {"cache": True}
+        if not cached:
+            # paraphrase of something already answered?
+            hit = _semantic_index().lookup(key)
+            if hit:
+                similar_key, score = hit
+                cached = get_entry(similar_key)
+                meta.update(semantic_match=similar_key, similarity=round(score, 3))
+                sp.set(semantic_match=similar_key, similarity=round(score, 3))
+        if not cached:
+            sp.set(hit=False)
+            return None
 
-    from raya_core.cache import CACHE_ENABLED
+        # 🚫 Never reuse disabled / over-budget / failed cloud responses
+        if cached.get("text", "").startswith(("[cloud disabled]", "[cloud budget]", "[cloud error]")):
+            sp.set(hit=False, skipped="cloud_disabled")
+            return None
 
-    # 1️⃣ Check cache
-    if CACHE_ENABLED and key in _CACHE:
-        cached = _CACHE[key]
-
-    # 🚫 Never reuse disabled-cloud responses
-    if cached.get("text", "").startswith("[cloud disabled]"):
-        if DEBUG:
-            print("[Orchestrator] 🚫 Skipping stale cloud-disabled cache")
-    else:
-        if DEBUG:
-            print("[Orchestrator] 💾 Using cached result")
+        sp.set(hit=True)
         return EngineResult(
             sources={cached.get("source", "cache"): True},
             text=cached.get("text", ""),
             confidence=cached.get("confidence", 0.8),
-            meta={**cached.get("meta", {}), "cache": True},
+            meta={**cached.get("meta", {}), **meta},
         )
 
-    # 2️⃣ Router Decision
-    route = ask_via_router(query)
-    if DEBUG:
-        print(f"[Router] 🧭 Route selected: {route}")
-
-    # 3️⃣ Local LLM (Primary Brain)
-    if route in ("local", "hybrid"):
-        try:
-            if DEBUG:
-                print("[Stage: Local LLM] 🧠 Generating with llama3.2:3b")
-            final_text = ask_local(query)
-            best_source = "Local LLM"
-        except Exception as e:
-            if DEBUG:
-                print(f"[Stage: Local LLM] ⚠️ Error: {e}")
-
-    # 4️⃣ Pipeline as Support (if needed)
-    if route == "hybrid" or not final_text:
-        try:
-            if DEBUG:
-                print("[Stage: Pipeline] ⚙️ Running pipeline support")
-            pipeline_text, metadata = run_pipeline(query, db_file, intents)
-            if pipeline_text:
-                final_text = aggregate([final_text, pipeline_text])
-                best_source = "LLM + Pipeline"
-        except Exception as e:
-            if DEBUG:
-                print(f"[Stage: Pipeline] ⚠️ Error: {e}")
-
-    # 5️⃣ Cloud LLM (Fallback)
-    if not final_text or route == "cloud":
-        try:
-            if DEBUG:
-                print("[Stage: Cloud LLM] ☁️ Escalating to cloud")
-            final_text = ask_cloud(query)
-            best_source = "Cloud LLM"
-        except Exception as e:
-            if DEBUG:
-                print(f"[Stage: Cloud LLM] ❌ Error: {e}")
-
-    # 6️⃣ Final Fallback
-    if not final_text:
-        final_text = "Sorry, I couldn't process that request."
-        best_source = "Fallback"
-
-    # 7 Cache result
-    confidence = 0.9 if best_source != "Fallback" else 0.2
-    _CACHE[key] = {
-        "source": best_source,
-        "text": final_text,
-        "confidence": confidence,
-        "meta": metadata,
-        "sources": {best_source: True},  # store as dictionary
-    }
-    save_cache(_CACHE)
-
-    if DEBUG:
-        print(f"[Orchestrator] ✅ Final Source: {best_source}")
-        print(f"[Orchestrator] ✅ Confidence: {confidence}")
-        print(f"[Orchestrator] ✅ Preview: {final_text[:100]}")
+def _store_result(key: str, best_source: str, final_text: str, metadata: dict,
+                  confidence: Optional[float] = None) -> EngineResult:
+    if confidence is None:
+        confidence = 0.9 if best_source != "Fallback" else 0.2
+    with span("cache.save", source=best_source, confidence=confidence, chars=len(final_text)) as sp:
+        if not _reusable(best_source, confidence):
+            # a failed or weak answer must not come back for this query or its paraphrases
+            sp.set(skipped="low_confidence")
+        else:
+            put_entry(key, {
+                "source": best_source,
+                "text": final_text,
+                "confidence": confidence,
+                "meta": metadata,
+                "sources": {best_source: True},  # store as dictionary
+            })
+            _semantic_index().add(key, key)
 
     return EngineResult(
         sources={best_source: True},  # ✅ dictionary
@@ -163,3 +141,143 @@ def ask_raya(query: str, db_file: str = "custom_db.sqlite", intents: list = [])
         confidence=confidence,
         meta=metadata,
     )
+
+def ask_raya(query: str, db_file: str = "custom_db.sqlite", intents: list = []) -> EngineResult:
+    key = _cache_key(query)
+    return _IN_FLIGHT.do(key, lambda: _ask_raya(key, query, db_file, intents))
+
+def _ask_raya(key: str, query: str, db_file: str, intents: list) -> EngineResult:
+    with span("ask_raya", query=query) as root:
+        result = _run_stages(key, query, db_file, intents)
+        root.set(source=next(iter(result.sources), None), confidence=result.confidence,
+                 cached=bool(result.meta.get("cache")))
+        return result
+
+# ---------------- cascade stages ----------------
+def _local_stage(query: str, earlier: list) -> Optional[StageResult]:
+    # the router runs the one local generation and scores it
+    res = ask_via_router(query)
+    text = res.get("text") or ""
+    if not text or text.startswith("[local error]"):
+        return None
+    return StageResult(text, res.get("confidence", 0.0), "Local LLM", {"reason": res.get("reason")})
+
+def _pipeline_stage(db_file: str, intents: list):
+    def run(query: str, earlier: list) -> Optional[StageResult]:
+        # a weak local answer is kept alongside the sources instead of being regenerated;
+        # a streamed one was already shown, so the pipeline answer must not repeat it
+        prior = [("local", r.text) for r in earlier if r.source == "Local LLM" and not r.meta.get("streamed")]
+        text, metadata = run_pipeline(query, db_file, intents, earlier=prior)
+        best = metadata.get("best_source")
+        if not best:
+            return None
+        confidence = dict(metadata.get("candidates", [])).get(best) or 0.5
+        return StageResult(text, confidence, "LLM + Pipeline" if prior else "Pipeline", metadata)
+    return run
+
+def _wikipedia_stage(query: str, earlier: list) -> Optional[StageResult]:
+    text = _try_wikipedia(query)
+    return StageResult(text, 0.8, "Wikipedia") if text else None
+
+def _web_stage(query: str, earlier: list) -> Optional[StageResult]:
+    text = _try_web_search(query)
+    return StageResult(text, 0.6, "Web Search") if text else None
+
+def _cloud_stage(query: str, earlier: list) -> Optional[StageResult]:
+    text = ask_cloud(query)
+    if not text or text.startswith(("[cloud disabled]", "[cloud budget]", "[cloud error]")):
+        return None
+    return StageResult(text, 0.9, "Cloud LLM")
+
+def _cascade(db_file: str, intents: list) -> Cascade:
+    fns = {
+        "local": _local_stage,
+        "pipeline": _pipeline_stage(db_file, intents),
+        "wikipedia": _wikipedia_stage,
+        "web": _web_stage,
+        "llm": _cloud_stage,
+    }
+    return Cascade({
+        name: Stage(name, fn, budget=STAGE_BUDGETS.get(name, 10), accept=STAGE_ACCEPT.get(name, 0.7))
+        for name, fn in fns.items()
+    })
+
+def _run_stages(key: str, query: str, db_file: str, intents: list,
+                streamed: Optional[StageResult] = None) -> EngineResult:
+    # 1️⃣ Check cache (ask_raya_stream already did before streaming)
+    if streamed is None:
+        cached = _cached_result(key)
+        if cached:
+            return cached
+
+    # 2️⃣ Router decides where the cascade starts
+    with span("router") as sp:
+        route = choose_model(query)
+        sp.set(route=route)
+    order = (["llm"] if route == "cloud" else []) + list(ENGINE_ORDER)
+    earlier, trail = [], []
+    if streamed is not None:
+        # the local answer was already generated while streaming; it joins as the local stage's result
+        order = [name for name in order if name != "local"]
+        earlier = [streamed]
+        trail = [{"stage": "local", "status": "streamed", "confidence": streamed.confidence}]
+
+    # 3️⃣ Stages in order, each backend at most once; stop at the first confident answer
+    best, stage_trail = _cascade(db_file, intents).run(query, order, earlier)
+    trail += stage_trail
+
+    # 4️⃣ Final Fallback
+    if best is None:
+        return _store_result(key, "Fallback", "Sorry, I couldn't process that request.", {"cascade": trail})
+
+    # 5️⃣ Cache result
+    return _store_result(key, best.source, best.text, {**best.meta, "cascade": trail}, best.confidence)
+
+
+def ask_raya_stream(query: str, db_file: str = "custom_db.sqlite", intents: list = []):
+    """
+    Streaming variant of ask_raya.
+    Yields text chunks as they are produced and returns the final EngineResult
+    (available as StopIteration.value), after caching it like ask_raya does.
+    Cache hits and non-local answers are yielded as a single chunk. A streamed
+    local answer below STAGE_ACCEPT["local"] goes on through the cascade, and
+    the answer that replaces it follows as one more chunk.
+    """
+    key = _cache_key(query)
+    with span("ask_raya_stream", query=query) as root:
+        cached = _cached_result(key)
+        if cached:
+            root.set(source=next(iter(cached.sources), None), cached=True)
+            yield cached.text
+            return cached
+
+        if choose_model(query) == "local":
+            parts = []
+            with span("local_llm.stream") as sp:
+                for chunk in stream_local(query):
+                    if not parts and chunk.startswith("[local error]"):
+                        sp.fail(chunk)
+                        break
+                    if not parts:
+                        sp.event("first_token")
+                    parts.append(chunk)
+                    yield chunk
+                sp.set(chunks=len(parts))
+            final_text = "".join(parts).strip()
+            if final_text:
+                confidence = local_confidence(final_text)
+                if confidence >= STAGE_ACCEPT.get("local", 0.7):
+                    root.set(source="Local LLM", confidence=confidence)
+                    return _store_result(key, "Local LLM", final_text, {"streamed": True}, confidence)
+                streamed = StageResult(final_text, confidence, "Local LLM", {"streamed": True})
+                result = _IN_FLIGHT.do(key, lambda: _run_stages(key, query, db_file, intents, streamed))
+                root.set(source=next(iter(result.sources), None), confidence=result.confidence)
+                if result.text != final_text:
+                    yield "\n" + result.text
+                return result
+
+        # Nothing streamed: fall back to the regular cascade
+        result = ask_raya(query, db_file, intents)
+        root.set(source=next(iter(result.sources), None))
+        yield result.text
+        return result
@@ -0,0 +1,171 @@
+# raya_core/pdf_extract.py - PDF text: page ranges over a process pool, cached by content hash
+import io
+import os
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from raya_core.cache import TieredCache
+from raya_core.config import (
+    PDF_WORKERS, PDF_PAGES_PER_TASK, PDF_PARALLEL_MIN_PAGES, PDF_PROGRESSIVE_PAGES, PDF_CACHE_TTL,
+)
+from raya_core.summarizer import Summarizer, summarize
+
+# Persistent tier: "<sha256>:<page limit>" -> extracted text + summary
+PDF_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), "pdf_cache.sqlite")
+
+_CACHE: Optional[TieredCache] = None
+_POOL: Optional[ProcessPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def _cache() -> TieredCache:
+    global _CACHE
+    if _CACHE is None:
+        with _LOCK:
+            if _CACHE is None:
+                _CACHE = TieredCache(PDF_CACHE_DB, memory_items=16, max_entries=500, ttl=PDF_CACHE_TTL)
+    return _CACHE
+
+
+def _pool() -> ProcessPoolExecutor:
+    # page text extraction is pure-Python CPU work, so threads would not help;
+    # spawn, not fork: the CLI already runs writer, trace and poller threads
+    global _POOL
+    if _POOL is None:
+        with _LOCK:
+            if _POOL is None:
+                _POOL = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _POOL
+
+
+def _reset_pool():
+    global _POOL
+    with _LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of the file's bytes (the cache key: renamed or re-sent copies still hit)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _open(path: str):
+    """PdfReader over the file's bytes; opening walks the whole page tree, so reuse it."""
+    import PyPDF2
+    with open(path, "rb") as f:
+        return PyPDF2.PdfReader(io.BytesIO(f.read()))
+
+
+def _page_texts(reader, start: int, stop: int) -> List[str]:
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+# worker process only: the last document it opened, keyed by path + mtime + size
+_WORKER_READER: Tuple[Optional[tuple], object] = (None, None)
+
+
+def _extract_range(path: str, start: int, stop: int) -> List[str]:
+    """Texts of pages [start, stop). Runs in a worker process."""
+    global _WORKER_READER
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if _WORKER_READER[0] != key:
+        _WORKER_READER = (key, _open(path))
+    return _page_texts(_WORKER_READER[1], start, stop)
+
+
+def _ranges(stop: int, size: int) -> List[Tuple[int, int]]:
+    return [(s, min(s + size, stop)) for s in range(0, stop, size)]
+
+
+def _iter_ranges(path: str, reader, stop: int) -> Iterator[List[str]]:
+    ranges = _ranges(stop, PDF_PAGES_PER_TASK)
+    done = 0
+    if stop >= PDF_PARALLEL_MIN_PAGES and PDF_WORKERS > 1:
+        try:
+            starts, stops = zip(*ranges)
+            for pages in _pool().map(_extract_range, repeat(path), starts, stops):
+                yield pages
+                done += 1
+            return
+        except BrokenProcessPool as e:
+            print(f"[WARN] PDF worker pool failed ({e}); reading the rest in-process")
+            _reset_pool()
+    for start, end in ranges[done:]:
+        yield _page_texts(reader, start, end)
+
+
+def iter_pages(path: str, max_pages: Optional[int] = None) -> Iterator[List[str]]:
+    """
+    Page texts in document order, one list per range of PDF_PAGES_PER_TASK
+    pages, yielded as soon as that range (and every earlier one) is done.
+    Long documents are spread over the process pool; short ones, or a
+    broken pool, are read in this process.
+    """
+    reader = _open(path)
+    total = len(reader.pages)
+    return _iter_ranges(path, reader, min(total, max_pages) if max_pages else total)
+
+
+def extract_text(path: str, max_pages: Optional[int] = None) -> str:
+    parts: List[str] = []
+    for pages in iter_pages(path, max_pages):
+        parts.extend(pages)
+    return "".join(parts)
+
+
+def summarize_pdf(path: str, max_sentences: int = 6, max_pages: Optional[int] = None,
+                  progress: Optional[Callable[[int, int, str], None]] = None) -> dict:
+    """
+    Extract and summarize `path` (its first `max_pages` pages if given).
+
+    Returns {"sha256", "text", "summary", "pages", "total_pages", "cached"}.
+    A file whose bytes were seen before is answered from the cache without
+    opening the PDF. For documents of PDF_PROGRESSIVE_PAGES pages or more,
+    `progress(pages_done, pages, summary_so_far)` is called after each range,
+    and the summary is built incrementally (SummaryStream) as pages arrive.
+    """
+    digest = file_digest(path)
+    key = f"{digest}:{max_pages or 'all'}"
+    hit = _cache().get(key)
+    if hit is not None:
+        if hit.get("sentences") != max_sentences:
+            hit = {**hit, "summary": summarize(hit["text"], max_sentences), "sentences": max_sentences}
+            _cache().put(key, hit)
+        return {**hit, "cached": True}
+
+    reader = _open(path)
+    total = len(reader.pages)
+    n = min(total, max_pages) if max_pages else total
+    parts: List[str] = []
+    if progress is not None and n >= PDF_PROGRESSIVE_PAGES:
+        stream = Summarizer().stream(max_sentences)
+        for pages in _iter_ranges(path, reader, n):
+            parts.extend(pages)
+            for page in pages:
+                stream.feed(page)
+            progress(len(parts), n, stream.summary())
+        summary = stream.finish()
+        text = "".join(parts)
+    else:
+        for pages in _iter_ranges(path, reader, n):
+            parts.extend(pages)
+        text = "".join(parts)
+        summary = summarize(text, max_sentences)
+
+    entry = {"sha256": digest, "text": text, "summary": summary, "pages": n, "total_pages": total,
+             "sentences": max_sentences}
+    if text.strip():
+        _cache().put(key, entry)
+    return {**entry, "cached": False}
@@ -0,0 +1,176 @@
+# raya_core/persistence.py - WAL SQLite with a background batched writer and pooled reads
+import time
+import queue
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+WRITE_BATCH = 128          # statements committed per transaction (at most)
+WRITE_INTERVAL = 0.05      # seconds the writer waits to fill a batch
+READ_POOL_SIZE = 4
+WRITE_RETRIES = 5          # attempts per batch while another connection holds the write lock
+WRITE_RETRY_WAIT = 0.2     # seconds before the first retry, doubled after each
+FLUSH_TIMEOUT = 30.0       # how long readers that need queued writes (export, alias load) wait for them
+
+_STOP = object()
+
+
+def _is_busy(e: Exception) -> bool:
+    return isinstance(e, sqlite3.OperationalError) and ("locked" in str(e) or "busy" in str(e))
+
+
+class Store:
+    """
+    One long-lived writer connection fed by a queue.
+
+    execute()/executemany() only enqueue, so callers never wait on disk sync.
+    The writer thread commits whatever has queued up in a single transaction.
+    flush() blocks until everything queued so far is committed; close() (also
+    run at exit) flushes and stops the writer. Reads use a small pool of
+    separate connections, which WAL mode lets run alongside the writer.
+    """
+
+    def __init__(self, db_file: str, batch_size: int = WRITE_BATCH,
+                 interval: float = WRITE_INTERVAL, read_pool: int = READ_POOL_SIZE):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._readers: "queue.LifoQueue" = queue.LifoQueue()
+        self._read_slots = threading.BoundedSemaphore(read_pool)
+        self._closed = False
+
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._thread = threading.Thread(target=self._run, name="raya-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- writes ----------
+    def execute(self, sql: str, params: Iterable = ()):
+        self._queue.put((sql, tuple(params), False))
+
+    def executemany(self, sql: str, rows: Iterable[Iterable]):
+        self._queue.put((sql, [tuple(r) for r in rows], True))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write queued before this call is committed."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._conn.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # gather whatever else arrives within the interval
+            while len(batch) < self.batch_size and item is not _STOP and not isinstance(item, threading.Event):
+                try:
+                    item = self._queue.get(timeout=self.interval)
+                except queue.Empty:
+                    break
+                batch.append(item)
+            try:
+                self._commit([i for i in batch if i is not _STOP and not isinstance(i, threading.Event)])
+            except Exception as e:
+                # the writer must outlive any batch: otherwise later writes queue forever and flush() never returns
+                print(f"[DB] writer error: {e}")
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if batch[-1] is _STOP:
+                return
+
+    def _commit(self, writes):
+        """One transaction for `writes`, retried with backoff while the database is locked."""
+        if not writes:
+            return
+        for attempt in range(WRITE_RETRIES):
+            try:
+                self._write(writes)
+                return
+            except Exception as e:
+                self._rollback()
+                if not _is_busy(e) or attempt == WRITE_RETRIES - 1:
+                    print(f"[DB] commit error, {len(writes)} writes dropped: {e}")
+                    return
+                time.sleep(WRITE_RETRY_WAIT * 2 ** attempt)
+
+    def _write(self, writes):
+        self._conn.execute("BEGIN IMMEDIATE")  # take the write lock up front, so a busy database fails here
+        for sql, params, many in writes:
+            try:
+                if many:
+                    self._conn.executemany(sql, params)
+                else:
+                    self._conn.execute(sql, params)
+            except Exception as e:
+                if _is_busy(e):
+                    raise
+                print(f"[DB] write error: {e}")
+        self._conn.execute("COMMIT")
+
+    def _rollback(self):
+        try:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+        except sqlite3.Error as e:
+            print(f"[DB] rollback error: {e}")
+
+    # ---------- reads ----------
+    @contextmanager
+    def reader(self):
+        """Borrow a pooled read connection."""
+        self._read_slots.acquire()
+        try:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+        finally:
+            self._read_slots.release()
+
+    def query(self, sql: str, params: Iterable = ()) -> list:
+        with self.reader() as conn:
+            return conn.execute(sql, tuple(params)).fetchall()
+
+
+_STORES: Dict[str, Store] = {}
+_LOCK = threading.Lock()
+
+
+def get_store(db_file: str) -> Store:
+    """Shared Store per database file (created on first use, closed at exit)."""
+    store = _STORES.get(db_file)
+    if store is None:
+        with _LOCK:
+            store = _STORES.get(db_file)
+            if store is None:
+                store = _STORES[db_file] = Store(db_file)
+    return store
+
+
+@atexit.register
+def close_all():
+    for store in list(_STORES.values()):
+        store.close()
+    _STORES.clear()
@@ -8,6 +8,9 @@ from raya_core.cache import cache_get
 from raya_core.custom_db import query_local_db
 from raya_core.source_news_topic import search_topic_news
 from raya_core.source_arxiv import search_arxiv
+from raya_core.collector import collect
+from raya_core.tracing import span
+from raya_core.config import PIPELINE_BUDGET, SOURCE_DEADLINES, EARLY_STOP_CONFIDENCE
 from aggregator import aggregate
 
 Candidate = Tuple[str, str, float, Optional[dict]]
@@ -27,47 +30,58 @@ def _fuzzy_match_score(a: str, b: str) -> float:
     return fuzz.ratio(a, b) / 100.0  # 0..1
 
 # ---------------- collect candidates ----------------
-def _collect_candidates(user_text: str, db_file: str, intents: list) -> List[Candidate]:
-    candidates: List[Candidate] = []
+def _qa_source(q: str) -> Optional[Candidate]:
+    qa_res = qa_engine.answer_question(q)
+    if qa_res and qa_res.answer:
+        return ("qa", qa_res.answer, qa_res.confidence, {"source_type": qa_res.source_type})
+    return None
+
+def _db_source(q: str, db_file: str) -> Optional[Candidate]:
+    local = query_local_db(db_file, q)
+    if local:
+        return ("custom_db", local, 0.9, None)
+    return None
+
+def _news_source(q: str) -> Optional[Candidate]:
+    news_hits = search_topic_news(q)
+    if news_hits:
+        return ("news", "\n".join(news_hits[:6]), 0.55, None)
+    return None
+
+def _arxiv_source(q: str) -> Optional[Candidate]:
+    ax = search_arxiv(q, max_results=3)
+    if ax:
+        return ("arxiv", ax, 0.5, None)
+    return None
+
+def _collect_candidates(user_text: str, db_file: str, intents: list,
+                        budget: float = PIPELINE_BUDGET) -> List[Candidate]:
+    """
+    Fan all sources out at once; each has its own deadline and the whole
+    collection is bounded by `budget`. A high-confidence hit stops early.
+    """
     q = user_text
-
-    # 1. QA Engine (cache + wiki + online + llm)
-    try:
-        qa_res = qa_engine.answer_question(q)
-        if qa_res and qa_res.answer:
-            candidates.append(
-                ("qa", qa_res.answer, qa_res.confidence, {"source_type": qa_res.source_type})
-            )
-    except Exception:
-        pass
-
-    # 2. Local DB
-    try:
-        local = query_local_db(db_file, q)
-        if local:
-            candidates.append(("custom_db", local, 0.9, None))
-    except Exception:
-        pass
-
-    # 3. News (optional)
-    try:
-        if "news" in intents or any(k in q.lower() for k in ["latest", "breaking", "today"]):
-            news_hits = search_topic_news(q)
-            if news_hits:
-                candidates.append(("news", "\n".join(news_hits[:6]), 0.55, None))
-    except Exception:
-        pass
-
-    # 4. ArXiv / research papers (optional)
-    try:
-        if "research" in intents or any(k in q.lower() for k in ["paper", "study", "arxiv"]):
-            ax = search_arxiv(q, max_results=3)
-            if ax:
-                candidates.append(("arxiv", ax, 0.5, None))
-    except Exception:
-        pass
-
-    return candidates
+    ql = q.lower()
+
+    # order here is the tie-break order for scoring
+    sources = [
+        ("qa", lambda: _qa_source(q)),                  # cache + wiki + online + llm
+        ("custom_db", lambda: _db_source(q, db_file)),  # local notes
+    ]
+    if "news" in intents or any(k in ql for k in ["latest", "breaking", "today"]):
+        sources.append(("news", lambda: _news_source(q)))
+    if "research" in intents or any(k in ql for k in ["paper", "study", "arxiv"]):
+        sources.append(("arxiv", lambda: _arxiv_source(q)))
+
+    with span("pipeline.collect", sources=[name for name, _ in sources]) as sp:
+        arrived, timed_out = collect(
+            sources,
+            budget=budget,
+            deadlines=SOURCE_DEADLINES,
+            stop_when=lambda _name, cand: (cand[2] or 0.0) >= EARLY_STOP_CONFIDENCE,
+        )
+        sp.set(arrived=list(arrived), timed_out=timed_out)
+    return [arrived[name] for name, _ in sources if name in arrived]
 
 # ---------------- scoring & selection ----------------
 def _score_and_select(candidates: List[Candidate]) -> Tuple[Optional[Candidate], List[Candidate]]:
@@ -85,7 +99,9 @@ def _score_and_select(candidates: List[Candidate]) -> Tuple[Optional[Candidate],
     return best, extras
 
 # ---------------- main pipeline ----------------
-def run_pipeline(user_text: str, db_file: str, intents: list) -> Tuple[str, dict]:
+def run_pipeline(user_text: str, db_file: str, intents: list,
+                 earlier: Optional[List[Tuple[str, str]]] = None) -> Tuple[str, dict]:
+    """`earlier`: (source, text) answers from earlier cascade stages, appended after the sources."""
     # 1. Collect candidates from QA Engine + DB + News + ArXiv
     candidates = _collect_candidates(user_text, db_file, intents)
 
@@ -95,9 +111,11 @@ def run_pipeline(user_text: str, db_file: str, intents: list) -> Tuple[str, dict
     # 3. Build candidate pairs for aggregator
     best_pair = (best[0], best[1]) if best else None
     extras_pairs = [(src, ans) for src, ans, *_ in extras] if extras else []
+    extras_pairs += earlier or []
 
     # 4. Aggregate final string
-    final = aggregate(best_pair, extras_pairs)
+    with span("pipeline.aggregate", best=best_pair[0] if best_pair else None, extras=len(extras_pairs)):
+        final = aggregate(best_pair, extras_pairs)
 
     # 5. Metadata for debug / tracking
     metadata = {
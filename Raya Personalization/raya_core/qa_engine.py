@@ -1,9 +1,11 @@
 # qa_engine.py - robust, always tries wiki → online → llm
-import os, re, json, difflib, requests, wikipedia
+import os, re, json
 from dataclasses import dataclass
 from typing import Optional
 
-DEBUG = os.getenv("RAYA_DEBUG", "1") == "1"
+from raya_core import transport, wiki
+from raya_core.fuzzy_index import FuzzyIndex
+from raya_core.tracing import span
 
 # Cache (optional)
 CACHE_FILE = os.path.join(os.path.dirname(__file__), "final_raya_cache.json")
@@ -16,8 +18,7 @@ if os.path.exists(CACHE_FILE):
             QA_CACHE = {k.lower().strip(): v for k, v in RAW_K.items()}
     except Exception:
         QA_CACHE = {}
-
-wikipedia.set_lang("en")
+QA_INDEX = FuzzyIndex(QA_CACHE)
 
 @dataclass
 class QAResult:
@@ -42,45 +43,43 @@ def search_cache(query: str) -> Optional[QAResult]:
         if text:
             return QAResult(text, "cache", confidence=0.95)
     # Fuzzy match
-    keys = list(QA_CACHE.keys())
-    match = difflib.get_close_matches(q, keys, n=1, cutoff=0.7)
+    match = QA_INDEX.best_match(q, cutoff=0.7)
     if match:
-        entry = QA_CACHE[match[0]]
+        entry = QA_CACHE[match]
         text = entry.get("summary") or entry.get("answer")
         if text:
             return QAResult(text, "cache", confidence=0.9)
     return None
 
+def add_knowledge(key: str, entry: dict):
+    """Add/replace a knowledge entry; the fuzzy index is updated in place."""
+    k = key.lower().strip()
+    QA_CACHE[k] = entry
+    QA_INDEX.add(k)
+
 # ---------------- wikipedia ----------------
 def wiki_best_summary(query: str, max_pages: int = 3) -> QAResult:
-    try:
-        titles = wikipedia.search(query, results=max_pages)
-    except Exception:
-        titles = []
-    for t in titles:
-        if t and (t.lower() == query.lower() or query.lower() in t.lower()):
-            try:
-                summary = wikipedia.summary(t, sentences=3, auto_suggest=False)
-                return QAResult(summary, "wikipedia", confidence=0.85)
-            except Exception:
-                continue
-    for t in titles:
-        try:
-            summary = wikipedia.summary(t, sentences=2, auto_suggest=False)
-            return QAResult(summary, "wikipedia", confidence=0.8)
-        except Exception:
-            continue
-    try:
-        summary = wikipedia.summary(query, sentences=2, auto_suggest=False)
+    titles = wiki.search(query, results=max_pages)
+    # titles containing the query first; within a tier the first summary to arrive wins
+    preferred = [t for t in titles if t.lower() == query.lower() or query.lower() in t.lower()]
+    hit = wiki.first_acceptable(preferred, sentences=3)
+    if hit:
+        return QAResult(hit[1], "wikipedia", confidence=0.85)
+    hit = wiki.first_acceptable([t for t in titles if t not in preferred], sentences=2)
+    if hit:
+        return QAResult(hit[1], "wikipedia", confidence=0.8)
+    summary = wiki.summary(query, sentences=2)
+    if summary:
         return QAResult(summary, "wikipedia", confidence=0.75)
-    except Exception:
-        return QAResult(None, "wikipedia", confidence=0.0)
+    return QAResult(None, "wikipedia", confidence=0.0)
 
 # ---------------- online search ----------------
 def search_online(query: str) -> QAResult:
     try:
-        url = f"https://api.duckduckgo.com/?q={query}&format=json&no_redirect=1&no_html=1"
-        r = requests.get(url, timeout=6)
+        r = transport.get(
+            "https://api.duckduckgo.com/",
+            params={"q": query, "format": "json", "no_redirect": 1, "no_html": 1},
+        )
         data = r.json()
         text = data.get("AbstractText") or data.get("Heading")
         if not text:
@@ -111,29 +110,35 @@ def llm_fallback(query: str) -> QAResult:
 
 # ---------------- main ----------------
 def answer_question(question: str) -> QAResult:
-    # 1. Cache
-    cache_ans = search_cache(question)
-    if cache_ans and cache_ans.answer:
-        if DEBUG: print("[QA] Using cache")
-        return cache_ans
+    with span("qa") as sp:
+        # 1. Cache
+        with span("qa.cache"):
+            cache_ans = search_cache(question)
+        if cache_ans and cache_ans.answer:
+            sp.set(source="cache")
+            return cache_ans
 
-    # 2. Wikipedia
-    wiki_ans = wiki_best_summary(question)
-    if wiki_ans and wiki_ans.answer:
-        if DEBUG: print("[QA] Using Wikipedia")
-        return wiki_ans
+        # 2. Wikipedia
+        with span("qa.wikipedia"):
+            wiki_ans = wiki_best_summary(question)
+        if wiki_ans and wiki_ans.answer:
+            sp.set(source="wikipedia")
+            return wiki_ans
 
-    # 3. Online search
-    online_ans = search_online(question)
-    if online_ans and online_ans.answer:
-        if DEBUG: print("[QA] Using Online Search")
-        return online_ans
+        # 3. Online search
+        with span("qa.online"):
+            online_ans = search_online(question)
+        if online_ans and online_ans.answer:
+            sp.set(source="online")
+            return online_ans
 
-    # 4. LLM fallback
-    llm_ans = llm_fallback(question)
-    if llm_ans and llm_ans.answer:
-        if DEBUG: print("[QA] Using LLM Fallback")
-        return llm_ans
+        # 4. LLM fallback
+        with span("qa.llm"):
+            llm_ans = llm_fallback(question)
+        if llm_ans and llm_ans.answer:
+            sp.set(source="llm")
+            return llm_ans
 
-    # 5. Absolute fallback
-    return QAResult("Sorry, I couldn't find an answer.", "fallback", confidence=0.1)
+        # 5. Absolute fallback
+        sp.set(source="fallback")
+        return QAResult("Sorry, I couldn't find an answer.", "fallback", confidence=0.1)
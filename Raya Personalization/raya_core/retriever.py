@@ -1,35 +1,145 @@
 # raya_core/retriever.py
-import sqlite3, os
+import sqlite3, os, threading
+from collections import OrderedDict, deque
+from typing import Optional
 from dotenv import load_dotenv, find_dotenv
+
+from raya_core.config import CONTEXT_MAX_TOKENS, CONTEXT_MAX_TURNS, CONTEXT_MAX_NEWS, CONTEXT_MAX_SESSIONS
+
 load_dotenv(find_dotenv())
 DB_FILE = os.getenv("DB_FILE", "raya_conversation.db")
 
-def last_conversation(n=6):
+SYSTEM_PROMPT = "System: You are RAYA, a helpful assistant. Answer concisely and cite sources if available."
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~4 characters per token, but never fewer than the word count."""
+    if not text:
+        return 0
+    return max((len(text) + 3) // 4, text.count(" ") + 1)
+
+def _recent_turns(n=6, db_file=None):
     try:
-        conn = sqlite3.connect(DB_FILE); c = conn.cursor()
+        conn = sqlite3.connect(db_file or DB_FILE); c = conn.cursor()
         c.execute("SELECT user_input, ai_output FROM conversations ORDER BY id DESC LIMIT ?", (n,))
         rows = c.fetchall(); conn.close()
-        parts = []
-        for u,a in reversed(rows):
-            parts.append(f"User: {u}\nRAYA: {a}")
-        return "\n".join(parts)
+        return list(reversed(rows))
     except:
-        return ""
+        return []
 
-def latest_news_snippets(limit=5):
+def _turn_text(user_input, ai_output) -> str:
+    return f"User: {user_input}\nRAYA: {ai_output}"
+
+def last_conversation(n=6, db_file=None):
+    return "\n".join(_turn_text(u, a) for u, a in _recent_turns(n, db_file))
+
+def latest_news_snippets(limit=5, db_file=None):
     try:
-        conn = sqlite3.connect(DB_FILE); c = conn.cursor()
+        conn = sqlite3.connect(db_file or DB_FILE); c = conn.cursor()
         c.execute("SELECT content FROM raya_data WHERE data_type LIKE '%news%' ORDER BY id DESC LIMIT ?", (limit,))
         rows = c.fetchall(); conn.close()
         return [r[0] for r in rows]
     except:
         return []
 
-def build_context(user_query: str) -> str:
-    history = last_conversation(6)
-    news = latest_news_snippets(5)
-    parts = ["System: You are RAYA, a helpful assistant. Answer concisely and cite sources if available."]
-    if history: parts.append("Conversation history:\n" + history)
-    if news: parts.append("Recent news:\n" + ("\n".join(news)))
-    parts.append("User query:\n" + user_query)
-    return "\n\n".join(parts)
+class ContextWindow:
+    """
+    The recent turns and news snippets of one session, kept in memory.
+    Turns are appended as they are saved; the oldest ones drop out once the
+    window passes max_turns or its token budget. The rendered history is
+    rebuilt only when the window changes, so building a prompt is constant work.
+    """
+
+    def __init__(self, max_tokens: int = CONTEXT_MAX_TOKENS, max_turns: int = CONTEXT_MAX_TURNS,
+                 max_news: int = CONTEXT_MAX_NEWS):
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self._turns = deque()                # (text, tokens)
+        self._news = deque(maxlen=max_news)  # (text, tokens), newest last
+        self._tokens = 0
+        self._history = ""
+        self._news_text = ""
+        self._lock = threading.Lock()
+        self.warm = False
+
+    def _trim(self):
+        news_tokens = sum(t for _, t in self._news)
+        while self._turns and (len(self._turns) > self.max_turns or self._tokens + news_tokens > self.max_tokens):
+            self._tokens -= self._turns.popleft()[1]
+        self._history = "\n".join(text for text, _ in self._turns)
+        self._news_text = "\n".join(text for text, _ in reversed(self._news))
+
+    def add_turn(self, user_input: str, ai_output: str):
+        text = _turn_text(user_input, ai_output)
+        tokens = estimate_tokens(text)
+        with self._lock:
+            self._turns.append((text, tokens))
+            self._tokens += tokens
+            self._trim()
+
+    def add_news(self, snippet: str):
+        with self._lock:
+            self._news.append((snippet, estimate_tokens(snippet)))
+            self._trim()
+
+    def load(self, db_file: Optional[str] = None):
+        """Cold start: seed the window from the database (once)."""
+        turns = [_turn_text(u, a) for u, a in _recent_turns(self.max_turns, db_file)]
+        news = latest_news_snippets(self._news.maxlen, db_file)
+        with self._lock:
+            if self.warm:
+                return
+            self._turns = deque((t, estimate_tokens(t)) for t in turns)
+            self._tokens = sum(t for _, t in self._turns)
+            self._news = deque(((n, estimate_tokens(n)) for n in reversed(news)), maxlen=self._news.maxlen)
+            self._trim()
+            self.warm = True
+
+    def render(self, user_query: str) -> str:
+        parts = [SYSTEM_PROMPT]
+        if self._history: parts.append("Conversation history:\n" + self._history)
+        if self._news_text: parts.append("Recent news:\n" + self._news_text)
+        parts.append("User query:\n" + user_query)
+        return "\n\n".join(parts)
+
+    def tokens(self) -> int:
+        return self._tokens + sum(t for _, t in self._news)
+
+    def turns(self) -> list:
+        """The turns currently in the window, oldest first."""
+        with self._lock:
+            return [text for text, _ in self._turns]
+
+# The conversations table has no session column, so only the CLI's default
+# session can be seeded from it; other sessions start empty. Sessions are
+# kept LRU-first, and past CONTEXT_MAX_SESSIONS the least recently used one
+# (never the default) is dropped.
+DEFAULT_SESSION = "default"
+_SESSIONS: "OrderedDict[str, ContextWindow]" = OrderedDict()
+_SESSIONS_LOCK = threading.Lock()
+
+def get_window(session_id: str = DEFAULT_SESSION, db_file: Optional[str] = None) -> ContextWindow:
+    """The session's window; the default session's first use reads the last turns from the database."""
+    with _SESSIONS_LOCK:
+        window = _SESSIONS.get(session_id)
+        if window is None:
+            window = _SESSIONS[session_id] = ContextWindow()
+            if session_id != DEFAULT_SESSION:
+                window.warm = True
+            while len(_SESSIONS) > CONTEXT_MAX_SESSIONS:
+                oldest = next(k for k in _SESSIONS if k != DEFAULT_SESSION)
+                del _SESSIONS[oldest]
+        else:
+            _SESSIONS.move_to_end(session_id)
+    if not window.warm:
+        window.load(db_file)
+    return window
+
+def record_turn(user_input: str, ai_output: str, session_id: str = DEFAULT_SESSION):
+    """Call when a turn is saved (before its DB write is queued) to keep the window current."""
+    get_window(session_id).add_turn(user_input, ai_output)
+
+def record_news(snippet: str, session_id: str = DEFAULT_SESSION):
+    get_window(session_id).add_news(snippet)
+
+def build_context(user_query: str, session_id: str = DEFAULT_SESSION) -> str:
+    return get_window(session_id).render(user_query)
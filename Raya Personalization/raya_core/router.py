@@ -43,7 +43,7 @@ def choose_model(user_query: str) -> str:
 
     return "local"
 
-def _local_confidence(text: str) -> float:
+def local_confidence(text: str) -> float:
     """
     Heuristic confidence for local LLM output.
     No ML. Deterministic.
@@ -64,7 +64,7 @@ def ask_via_router(prompt: str, fallback_to_cloud: bool = True) -> dict:
 
     # Force local while cloud is disabled
     local_text = ask_local(prompt)
-    confidence = _local_confidence(local_text)
+    confidence = local_confidence(local_text)
 
     # Never escalate to cloud in Day-3
     return {
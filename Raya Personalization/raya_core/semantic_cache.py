@@ -0,0 +1,142 @@
+# raya_core/semantic_cache.py - paraphrase-tolerant answer reuse (offline, hashed TF-IDF)
+import re
+import zlib
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from raya_core.config import SEMANTIC_DIM, SEMANTIC_THRESHOLD, SEMANTIC_MAX_ENTRIES
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "of", "in", "on", "at", "to", "for",
+    "and", "or", "who", "what", "when", "where", "why", "how", "which", "do", "does", "did",
+    "me", "tell", "about", "please", "can", "you", "i", "my", "it", "its", "this", "that",
+}
+
+# short forms people type -> the words a cached answer was asked with
+EXPANSIONS = {
+    "pm": "prime minister",
+    "cm": "chief minister",
+    "usa": "united states",
+    "uk": "united kingdom",
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "govt": "government",
+}
+
+
+def tokens(text: str) -> List[str]:
+    out = []
+    for w in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        w = EXPANSIONS.get(w, w)
+        for t in w.split():
+            if t in STOPWORDS:
+                continue
+            if len(t) > 3 and t.endswith("s") and not t.endswith("ss"):
+                t = t[:-1]
+            out.append(t)
+    return out
+
+
+class SemanticIndex:
+    """
+    Hashed term-frequency vectors in a NumPy matrix, scored with TF-IDF cosine.
+    Maps a query to the cache key of the most similar previously answered query.
+    Holds at most `max_entries` rows; the oldest row is overwritten when full.
+    """
+
+    def __init__(self, dim: int = SEMANTIC_DIM, threshold: float = SEMANTIC_THRESHOLD,
+                 max_entries: int = SEMANTIC_MAX_ENTRIES):
+        self.dim = dim
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._rows = np.zeros((min(256, max_entries), dim), dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float32)
+        self._keys: List[Optional[str]] = []
+        self._row_of = {}
+        self._next = 0          # ring position once full
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for t in tokens(text):
+            vec[zlib.crc32(t.encode()) % self.dim] += 1.0
+        nz = vec > 0
+        vec[nz] = 1.0 + np.log(vec[nz])  # sublinear tf
+        return vec
+
+    def _slot(self) -> int:
+        n = len(self._keys)
+        if n < self.max_entries:
+            if n == len(self._rows):
+                grown = np.zeros((min(n * 2, self.max_entries), self.dim), dtype=np.float32)
+                grown[:n] = self._rows
+                self._rows = grown
+            self._keys.append(None)
+            return n
+        slot = self._next
+        self._next = (self._next + 1) % self.max_entries
+        old = self._keys[slot]
+        if old is not None:
+            self._row_of.pop(old, None)
+            self._df -= self._rows[slot] > 0
+        return slot
+
+    def add(self, query: str, key: str):
+        """Remember that `query` was answered under cache key `key`."""
+        vec = self._vector(query)
+        if not vec.any():
+            return
+        with self._lock:
+            slot = self._row_of.get(key)
+            if slot is None:
+                slot = self._slot()
+            else:
+                self._df -= self._rows[slot] > 0
+            self._rows[slot] = vec
+            self._df += vec > 0
+            self._keys[slot] = key
+            self._row_of[key] = slot
+
+    def search(self, query: str, k: int = 1) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine) pairs, best first."""
+        q = self._vector(query)
+        with self._lock:
+            n = len(self._keys)
+            if n == 0 or not q.any():
+                return []
+            idf = np.log((1.0 + n) / (1.0 + self._df)) + 1.0
+            m = self._rows[:n] * idf
+            q = q * idf
+            norms = np.linalg.norm(m, axis=1) * np.linalg.norm(q)
+            norms[norms == 0] = 1.0
+            sims = (m @ q) / norms
+            k = min(k, n)
+            top = np.argpartition(-sims, k - 1)[:k]
+            top = top[np.argsort(-sims[top])]
+            return [(self._keys[i], float(sims[i])) for i in top if self._keys[i] is not None]
+
+    def lookup(self, query: str) -> Optional[Tuple[str, float]]:
+        """Best (key, score) at or above the threshold; counts a hit or a miss."""
+        best = self.search(query, k=1)
+        if best and best[0][1] >= self.threshold:
+            self.hits += 1
+            return best[0]
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._row_of),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "threshold": self.threshold,
+        }
+
+    def __len__(self):
+        return len(self._row_of)
@@ -1,24 +1,208 @@
 #source_arxiv.py
-import feedparser
+import os
+import re
+import time
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote_plus
 
+from raya_core import transport
+from raya_core.cache import TieredCache
+from raya_core.config import ARXIV_CACHE_TTL, ARXIV_MISS_TTL, ARXIV_MIN_INTERVAL, ARXIV_BATCH_MAX
+
+API_URL = "https://export.arxiv.org/api/query"
+# Persistent result cache (query terms -> formatted answer)
+ARXIV_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), "arxiv_cache.sqlite")
+
+# question words and the words that made the pipeline pick arXiv in the first place
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "of", "in", "on", "at", "to", "for", "and", "or",
+    "what", "who", "how", "about", "me", "tell", "show", "find", "any", "new", "latest",
+    "recent", "paper", "papers", "study", "studies", "research", "arxiv",
+}
+
+_CACHE: Optional[TieredCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache() -> TieredCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = TieredCache(ARXIV_CACHE_DB, memory_items=256, max_entries=5000, ttl=ARXIV_CACHE_TTL)
+    return _CACHE
+
+
+def _terms(query: str) -> List[str]:
+    words = re.findall(r"\w+", (query or "").lower())
+    return sorted({w for w in words if w not in _STOPWORDS})
+
+
+def _format(entries, max_results: int) -> Optional[str]:
+    items = []
+    for e in entries[:max_results]:
+        title = (getattr(e, "title", "") or "").strip()
+        when = (getattr(e, "updated", "") or getattr(e, "published", "") or "").strip()
+        link = (getattr(e, "link", "") or "").strip()
+        if title:
+            items.append(f"{title} ({when})\n{link}")
+    return "\n".join(items) if items else None
+
+
+def _fetch(groups: List[List[str]], max_results: int):
+    """One export.arxiv.org request: (all:a AND all:b) OR (all:c) ..., newest first."""
+    clauses = [" AND ".join(f"all:{t}" for t in terms) for terms in groups]
+    expr = clauses[0] if len(clauses) == 1 else " OR ".join(f"({c})" for c in clauses)
+    url = (f"{API_URL}?search_query={quote_plus(expr)}"
+           f"&sortBy=lastUpdatedDate&sortOrder=descending&max_results={max_results}")
+    feed = transport.fetch_feed(url)
+    status = feed.get("status", 200)
+    if status >= 400:
+        # 503/429 is arXiv throttling us, not "no papers": fail so the miss is not cached
+        raise RuntimeError(f"arXiv API returned HTTP {status}")
+    return feed.entries
+
+
+def _matches(entry, terms: List[str]) -> bool:
+    text = f"{getattr(entry, 'title', '')} {getattr(entry, 'summary', '')}".lower()
+    # arXiv stems terms, so "networks" also found "network"
+    return all((t[:-1] if len(t) > 3 and t.endswith("s") else t) in text for t in terms)
+
+
+class _RateLimiter:
+    """At most one call per `interval` seconds; wait() blocks until it is our turn."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _Batcher:
+    """
+    Queues arXiv lookups. The first caller becomes the dispatcher: it waits for
+    the rate limiter, then takes everything queued by then (up to ARXIV_BATCH_MAX)
+    and sends it as one OR'ed request, so a burst costs one request, not many.
+    """
+
+    def __init__(self, limiter: _RateLimiter, batch_max: int = ARXIV_BATCH_MAX):
+        self.limiter = limiter
+        self.batch_max = batch_max
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, int], Future] = {}
+        self._dispatching = False
+        self.requests = 0
+
+    def submit(self, items: List[Tuple[List[str], int]]) -> List[Future]:
+        """Queue (terms, max_results) lookups; identical ones share a future."""
+        with self._lock:
+            futures = []
+            for terms, n in items:
+                key = (" ".join(terms), n)
+                fut = self._pending.get(key)
+                if fut is None:
+                    fut = self._pending[key] = Future()
+                futures.append(fut)
+            lead = not self._dispatching
+            self._dispatching = True
+        if lead:
+            self._drain()
+        return futures
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._dispatching = False
+                    return
+            self.limiter.wait()  # lookups queued meanwhile join this batch
+            with self._lock:
+                batch = list(self._pending.items())[:self.batch_max]
+                for key, _ in batch:
+                    del self._pending[key]
+            try:
+                self._run(batch)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+    def _run(self, batch):
+        groups = [key[0].split() for key, _ in batch]
+        want = min(100, sum(n for (_, n), _ in batch) * 4)
+        self.requests += 1
+        entries = _fetch(groups, want)
+        if len(batch) == 1:
+            (_, n), fut = batch[0]
+            fut.set_result(_format(entries, n))
+            return
+        # split the combined result back out per query (order stays newest first)
+        for (terms_key, n), fut in batch:
+            terms = terms_key.split()
+            mine = [e for e in entries if _matches(e, terms)]
+            if not mine and len(entries) >= want:
+                # crowded out by the other queries: ask for this one alone
+                self.limiter.wait()
+                self.requests += 1
+                mine = _fetch([terms], n)
+            fut.set_result(_format(mine, n))
+
+
+_BATCHER = _Batcher(_RateLimiter(ARXIV_MIN_INTERVAL))
+
+
+def search_arxiv_batch(queries: List[str], max_results: int = 3) -> Dict[str, Optional[str]]:
+    """
+    Look up several queries at once. Cached ones are answered from the
+    persistent cache; the rest go out together as one OR'ed arXiv request.
+    Returns {query: formatted results or None}.
+    """
+    out: Dict[str, Optional[str]] = {}
+    todo: Dict[str, List[str]] = {}
+    for query in queries:
+        terms = _terms(query)
+        if not terms:
+            out[query] = None
+            continue
+        hit = _cache().get(f"{' '.join(terms)}|{max_results}")
+        if hit is not None:
+            out[query] = hit.get("text")
+        else:
+            todo[query] = terms
+
+    if todo:
+        futures = _BATCHER.submit([(terms, max_results) for terms in todo.values()])
+        for (query, terms), fut in zip(todo.items(), futures):
+            try:
+                text = fut.result()
+            except Exception:
+                out[query] = None  # network trouble: don't remember it
+                continue
+            _cache().put(f"{' '.join(terms)}|{max_results}", {"text": text},
+                         ttl=ARXIV_CACHE_TTL if text else ARXIV_MISS_TTL)
+            out[query] = text
+    return out
+
+
 def search_arxiv(query: str, max_results: int = 3) -> str | None:
     """
     Simple arXiv query using RSS. No API key needed.
+    Results are cached per query terms (restart-safe, ARXIV_CACHE_TTL) and
+    concurrent lookups are packed into one rate-limited request.
     """
     if not query:
         return None
-    q = quote_plus(query)
-    url = f"https://export.arxiv.org/api/query?search_query=all:{q}&sortBy=lastUpdatedDate&sortOrder=descending&max_results={max_results}"
     try:
-        feed = feedparser.parse(url)
-        items = []
-        for e in feed.entries[:max_results]:
-            title = (getattr(e, "title", "") or "").strip()
-            when = (getattr(e, "updated", "") or getattr(e, "published", "") or "").strip()
-            link = (getattr(e, "link", "") or "").strip()
-            if title:
-                items.append(f"{title} ({when})\n{link}")
-        return "\n".join(items) if items else None
+        return search_arxiv_batch([query], max_results)[query]
     except Exception:
         return None
@@ -1,7 +1,6 @@
 # source_news_topic.py
-import requests
-import feedparser
-import wikipedia
+from raya_core import wiki
+from raya_core.news_index import NewsPrefetcher
 
 # Try multiple sources: NDTV, BBC, CNN, Al Jazeera
 NEWS_FEEDS = {
@@ -11,49 +10,35 @@ NEWS_FEEDS = {
     "aljazeera": "https://www.aljazeera.com/xml/rss/all.xml",
 }
 
-def _fetch_from_feed(url: str, topic: str, max_items: int = 10):
-    try:
-        feed = feedparser.parse(url)
-        results = []
-        for entry in feed.entries[:30]:  # take more, filter later
-            title = entry.get("title", "")
-            if topic.lower() in title.lower():
-                results.append(title.strip())
-            if len(results) >= max_items:
-                break
-        return results
-    except Exception as e:
-        print(f"[WARN] Failed fetching from {url}: {e}")
-        return []
+_PREFETCHER = NewsPrefetcher(NEWS_FEEDS)
+
+def news_index_stats() -> dict:
+    """Headline count and conditional-GET counters of the background poller."""
+    return {"headlines": len(_PREFETCHER.index), "last_refresh": _PREFETCHER.last_refresh, **_PREFETCHER.stats}
 
 def search_topic_news(topic: str, max_items: int = 10):
     """
     Search topic-related news from multiple feeds.
+    Feeds are polled in the background (raya_core/news_index.py), so this is an
+    in-memory index lookup; the first call waits for the initial download.
     If no matches → fallback to Wikipedia summary lines.
     """
     topic = topic.strip()
     if not topic:
         return []
 
-    results = []
-    for name, url in NEWS_FEEDS.items():
-        hits = _fetch_from_feed(url, topic, max_items)
-        if hits:
-            results.extend(hits)
-        if len(results) >= max_items:
-            break
+    results = _PREFETCHER.search(topic, max_items)
 
     # Deduplicate + trim
     results = list(dict.fromkeys(results))[:max_items]
 
     # Wikipedia fallback if no live news found
     if not results:
-        try:
-            print(f"[DEBUG] Falling back to Wikipedia for topic: {topic}")
-            summary = wikipedia.summary(topic, sentences=3, auto_suggest=False, redirect=True)
+        print(f"[DEBUG] Falling back to Wikipedia for topic: {topic}")
+        summary = wiki.summary(topic, sentences=3)
+        if summary:
             results = [line.strip() for line in summary.split(". ") if line.strip()][:max_items]
-        except Exception as e:
-            print(f"[WARN] Wikipedia fallback failed for {topic}: {e}")
-            results = []
+        else:
+            print(f"[WARN] Wikipedia fallback found nothing for {topic}")
 
     return results
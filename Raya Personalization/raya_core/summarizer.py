@@ -0,0 +1,181 @@
+# raya_core/summarizer.py - frequency-based extractive summaries (tokenize once, score with NumPy)
+import re
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# raya.py's original rules: ASCII words of 4+ letters, sentences end at . ! ? or a line break
+WORD_PATTERN = r"\b[a-zA-Z]{4,}\b"
+SPLIT_PATTERN = r"(?<=[.!?])\s+|\n"
+
+
+class _Vocab:
+    """Token -> integer id, plus per-id flags kept as arrays that grow with it."""
+
+    def __init__(self, min_word_len: int):
+        self.min_word_len = min_word_len
+        self.ids: Dict[str, int] = {}
+        self.is_break = np.zeros(0, dtype=bool)
+        self.weight = np.zeros(0)  # 1.0 for a scoring word, 0.0 for a break or short word
+
+    def encode(self, tokens: List[str]) -> np.ndarray:
+        start = len(self.ids)
+        ids = np.fromiter((self.ids.setdefault(t, len(self.ids)) for t in tokens),
+                          dtype=np.int64, count=len(tokens))
+        if len(self.ids) > start:
+            new = list(islice(self.ids, start, None))
+            brk = np.fromiter((t[0].isspace() for t in new), dtype=bool, count=len(new))
+            long_ = np.fromiter((len(t) >= self.min_word_len for t in new), dtype=bool, count=len(new))
+            self.is_break = np.concatenate([self.is_break, brk])
+            self.weight = np.concatenate([self.weight, (long_ & ~brk).astype(float)])
+        return ids
+
+
+class Summarizer:
+    """
+    Scores each sentence by the document frequency of its words and returns
+    the top ones (highest first, ties in document order), like the old
+    summarize_text. The text is lowercased and tokenized in one regex pass
+    that also yields the sentence breaks; words become integer ids and all
+    scoring is bincount over those ids.
+
+    word_pattern and split_pattern must not overlap: words never contain
+    whitespace and sentence breaks are whitespace only. Words shorter than
+    min_word_len still count as words but add nothing to a score.
+    """
+
+    def __init__(self, word_pattern: str = WORD_PATTERN, split_pattern: str = SPLIT_PATTERN,
+                 min_word_len: int = 4):
+        self.min_word_len = min_word_len
+        self._split = re.compile(split_pattern)
+        self._tokens = re.compile(f"{word_pattern}|{split_pattern}")
+
+    def _scan(self, text: str, vocab: _Vocab) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """(sentences, token ids, sentence index per token) for one piece of text."""
+        sentences = self._split.split(text)
+        ids = vocab.encode(self._tokens.findall(text.lower()))
+        return sentences, ids, np.cumsum(vocab.is_break[ids])
+
+    @staticmethod
+    def _ranked(sentences: List[str], scores: np.ndarray, skip=()) -> np.ndarray:
+        """Indexes of the distinct non-empty sentences, best score first (stable)."""
+        first: Dict[str, int] = {}
+        for i, s in enumerate(sentences):
+            if s not in first and s not in skip and s.strip():
+                first[s] = i
+        idx = np.fromiter(first.values(), dtype=np.int64, count=len(first))
+        return idx[np.argsort(-scores[idx], kind="stable")]
+
+    # ---------- public ----------
+    def top_sentences(self, text: str, max_sentences: int = 5) -> List[str]:
+        if not text or max_sentences <= 0:
+            return []
+        vocab = _Vocab(self.min_word_len)
+        sentences, ids, sentence_of = self._scan(text, vocab)
+        w = vocab.weight[ids]
+        freq = np.bincount(ids, weights=w, minlength=len(vocab.ids))
+        scores = np.bincount(sentence_of, weights=freq[ids] * w, minlength=len(sentences))
+        return [sentences[i] for i in self._ranked(sentences, scores)[:max_sentences]]
+
+    def summarize(self, text: str, max_sentences: int = 5) -> str:
+        return " ".join(self.top_sentences(text, max_sentences))
+
+    def stream(self, max_sentences: int = 5, candidates: Optional[int] = None) -> "SummaryStream":
+        return SummaryStream(self, max_sentences, candidates)
+
+    def summarize_stream(self, chunks: Iterable[str], max_sentences: int = 5,
+                         candidates: Optional[int] = None) -> str:
+        """summarize() for a document given piece by piece (pages, file blocks); see SummaryStream."""
+        stream = self.stream(max_sentences, candidates)
+        for chunk in chunks:
+            stream.feed(chunk)
+        return stream.finish()
+
+
+class SummaryStream:
+    """
+    Incremental summary: feed() pieces of a document, read summary() at any
+    point, finish() at the end. Holds only the word counts and a bounded set
+    of candidate sentences, never the whole text.
+
+    Word counts are global, but a sentence is first judged against the
+    counts seen so far: each piece keeps its `candidates` best sentences
+    (default 4 x max_sentences) and the kept ones are rescored with the
+    current counts whenever a summary is read. On ordinary documents the
+    final summary picks the same sentences as summarize(); it is an
+    approximation, not a guarantee.
+    """
+
+    def __init__(self, summarizer: Summarizer, max_sentences: int = 5, candidates: Optional[int] = None):
+        self.summarizer = summarizer
+        self.max_sentences = max_sentences
+        self.keep = candidates or 4 * max_sentences
+        self._vocab = _Vocab(summarizer.min_word_len)
+        self._freq = np.zeros(0)
+        self._pool: Dict[str, np.ndarray] = {}  # candidate sentence -> its scoring word ids
+        self._carry = ""  # text after the last complete sentence break
+
+    def _ranked_pool(self) -> List[str]:
+        texts = list(self._pool)
+        words = [self._pool[t] for t in texts]
+        owner = np.repeat(np.arange(len(texts)), [len(w) for w in words])
+        flat = np.concatenate(words) if words else np.zeros(0, dtype=np.int64)
+        totals = np.bincount(owner, weights=self._freq[flat], minlength=len(texts))
+        return [texts[i] for i in np.argsort(-totals, kind="stable")]
+
+    def _take(self, text: str):
+        sentences, ids, sentence_of = self.summarizer._scan(text, self._vocab)
+        w = self._vocab.weight[ids]
+        size = len(self._vocab.ids)
+        self._freq = np.concatenate([self._freq, np.zeros(size - len(self._freq))])
+        self._freq += np.bincount(ids, weights=w, minlength=size)
+        scores = np.bincount(sentence_of, weights=self._freq[ids] * w, minlength=len(sentences))
+        words, owner = ids[w > 0], sentence_of[w > 0]  # sorted by sentence, so each is a slice
+        for i in sorted(Summarizer._ranked(sentences, scores, skip=self._pool)[:self.keep].tolist()):
+            lo, hi = np.searchsorted(owner, [i, i + 1])
+            self._pool[sentences[i]] = words[lo:hi]
+        if len(self._pool) > 4 * self.keep:
+            for t in self._ranked_pool()[self.keep:]:
+                del self._pool[t]
+
+    def feed(self, chunk: str):
+        if not chunk or self.max_sentences <= 0:
+            return
+        text = self._carry + chunk
+        # cut after the last sentence break that is certainly complete
+        # (one touching the end could continue in the next chunk)
+        cut = None
+        for m in self.summarizer._split.finditer(text):
+            if m.end() < len(text):
+                cut = m
+        if cut is None:
+            self._carry = text
+            return
+        self._carry = text[cut.end():]
+        self._take(text[:cut.start()])
+
+    def summary(self) -> str:
+        """Best sentences among the complete ones fed so far."""
+        if self.max_sentences <= 0:
+            return ""
+        return " ".join(self._ranked_pool()[:self.max_sentences])
+
+    def finish(self) -> str:
+        if self._carry.strip():
+            self._take(self._carry)
+        self._carry = ""
+        return self.summary()
+
+
+_DEFAULT = Summarizer()
+
+
+def summarize(text: str, max_sentences: int = 5) -> str:
+    """Top `max_sentences` sentences of `text` by word frequency."""
+    return _DEFAULT.summarize(text, max_sentences)
+
+
+def summarize_stream(chunks: Iterable[str], max_sentences: int = 5) -> str:
+    """summarize() for documents too large to hold: feed it pages or blocks."""
+    return _DEFAULT.summarize_stream(chunks, max_sentences)
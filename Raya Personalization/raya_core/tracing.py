@@ -0,0 +1,265 @@
+# raya_core/tracing.py - nested per-stage latency spans, recorded to a JSONL trace file
+import os
+import sys
+import json
+import math
+import time
+import queue
+import atexit
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from raya_core.config import TRACE_ENABLED, TRACE_FILE, TRACE_MAX_BYTES
+
+FLUSH_INTERVAL = 0.5   # seconds the sink waits to batch records before writing
+
+_CURRENT: contextvars.ContextVar = contextvars.ContextVar("raya_span", default=None)
+_IDS = itertools.count(1)
+_PREFIX = os.urandom(3).hex()
+
+
+class Span:
+    """One timed stage. Children started while it is active get it as parent."""
+
+    __slots__ = ("name", "id", "trace", "parent", "ts", "attrs", "events", "status", "_t0")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: dict):
+        self.name = name
+        self.id = f"{_PREFIX}{next(_IDS):x}"
+        self.trace = parent.trace if parent else self.id
+        self.parent = parent.id if parent else None
+        self.ts = time.time()
+        self.attrs = attrs
+        self.events: List[dict] = []
+        self.status = "ok"
+        self._t0 = time.perf_counter()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def event(self, name: str, **attrs):
+        """Point-in-time note inside the span (ms offset from its start)."""
+        self.events.append({"name": name, "at_ms": round((time.perf_counter() - self._t0) * 1000, 3), **attrs})
+
+    def fail(self, err):
+        self.status = "error"
+        self.attrs["error"] = str(err)[:300]
+
+    def record(self) -> dict:
+        rec = {
+            "trace": self.trace, "span": self.id, "parent": self.parent, "name": self.name,
+            "ts": self.ts, "dur_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "status": self.status,
+        }
+        if self.attrs:
+            rec["attrs"] = self.attrs
+        if self.events:
+            rec["events"] = self.events
+        return rec
+
+
+class _NoSpan:
+    """Returned when tracing is off; every call is a no-op."""
+
+    def set(self, **attrs):
+        pass
+
+    def event(self, name: str, **attrs):
+        pass
+
+    def fail(self, err):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class JsonlSink:
+    """
+    Finished spans are queued by the caller and written by a background
+    thread in batches, so recording a span never waits on the disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def emit(self, rec: dict):
+        self._queue.put(rec)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="raya-trace", daemon=True)
+                    self._thread.start()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until everything emitted so far is on disk."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while not isinstance(batch[-1], threading.Event):
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._write([r for r in batch if isinstance(r, dict)])
+            for r in batch:
+                if isinstance(r, threading.Event):
+                    r.set()
+
+    def _write(self, records: List[dict]):
+        if not records:
+            return
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + ".1")
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records))
+        except Exception as e:
+            print(f"[TRACE] write error: {e}")
+
+
+_ENABLED = TRACE_ENABLED
+_SINK = JsonlSink(TRACE_FILE)
+
+
+def configure(path: Optional[str] = None, enabled: Optional[bool] = None) -> JsonlSink:
+    """Point tracing at another file and/or switch it on or off. Returns the active sink."""
+    global _SINK, _ENABLED
+    if path is not None and path != _SINK.path:
+        _SINK.flush()
+        _SINK = JsonlSink(path)
+    if enabled is not None:
+        _ENABLED = enabled
+    return _SINK
+
+
+def flush(timeout: Optional[float] = 5.0) -> bool:
+    return _SINK.flush(timeout)
+
+
+atexit.register(flush)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """
+    Time a stage:  with span("router") as sp: ...; sp.set(route=route)
+    Nested spans record their parent; an exception marks the span as failed.
+    """
+    if not _ENABLED:
+        yield _NO_SPAN
+        return
+    sp = Span(name, _CURRENT.get(), attrs)
+    token = _CURRENT.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.fail(e)
+        raise
+    finally:
+        try:
+            _CURRENT.reset(token)
+        except ValueError:  # generator finished in another context
+            pass
+        _SINK.emit(sp.record())
+
+
+def current() -> Optional[Span]:
+    return _CURRENT.get()
+
+
+# ---------------- summary ----------------
+def _records(path: str) -> Iterator[dict]:
+    for p in (path + ".1", path):
+        if not os.path.exists(p):
+            continue
+        with open(p, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    idx = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+def summarize(path: Optional[str] = None, window: Optional[float] = 3600.0,
+              now: Optional[float] = None) -> Dict[str, dict]:
+    """
+    p50/p95/p99 latency (ms) per span name over the last `window` seconds
+    (None = everything on file).
+    """
+    path = path or _SINK.path
+    if path == _SINK.path:
+        _SINK.flush()
+    since = (now or time.time()) - window if window else None
+    durations: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for rec in _records(path):
+        if since is not None and rec.get("ts", 0) < since:
+            continue
+        name = rec.get("name", "?")
+        durations.setdefault(name, []).append(rec.get("dur_ms", 0.0))
+        if rec.get("status") == "error":
+            errors[name] = errors.get(name, 0) + 1
+
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "errors": errors.get(name, 0),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "p99": _percentile(values, 99),
+            "max": values[-1],
+        }
+    return stats
+
+
+def format_summary(stats: Dict[str, dict]) -> str:
+    if not stats:
+        return "No traces recorded in this window."
+    lines = [f"{'stage':<24}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1]["p95"]):
+        lines.append(
+            f"{name:<24}{s['count']:>7}{s['errors']:>5}"
+            f"{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_window(text: str) -> Optional[float]:
+    """'90s', '15m', '2h', '1d' -> seconds; 'all' -> None."""
+    text = (text or "").strip().lower()
+    if text in ("", "all"):
+        return None
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+if __name__ == "__main__":
+    # python -m raya_core.tracing [window] [trace file]   e.g.  python -m raya_core.tracing 1h
+    args = sys.argv[1:]
+    print(format_summary(summarize(args[1] if len(args) > 1 else TRACE_FILE,
+                                   window=parse_window(args[0] if args else "1h"))))
@@ -0,0 +1,117 @@
+# raya_core/transport.py - one pooled HTTP session shared by every outbound source
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from raya_core.config import (
+    HTTP_POOL_HOSTS, HTTP_POOL_SIZE, DEFAULT_HOST_LIMIT, HOST_LIMITS,
+    DEFAULT_TIMEOUT, HOST_TIMEOUTS,
+)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (RAYA)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_SESSION = None
+_LOCK = threading.Lock()
+_SLOTS = {}
+
+
+def get_session() -> requests.Session:
+    """Keep-alive session with a connection pool per host (created lazily)."""
+    global _SESSION
+    if _SESSION is None:
+        with _LOCK:
+            if _SESSION is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update(DEFAULT_HEADERS)
+                _SESSION = s
+    return _SESSION
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _slot_for(host: str) -> threading.BoundedSemaphore:
+    sem = _SLOTS.get(host)
+    if sem is None:
+        with _LOCK:
+            sem = _SLOTS.setdefault(host, threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT)))
+    return sem
+
+
+def _timeout_for(host: str, timeout):
+    return timeout if timeout is not None else HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT)
+
+
+@contextmanager
+def _host_slot(host: str, timeout):
+    """Per-host concurrency limit; waiting for a slot counts against the timeout."""
+    sem = _slot_for(host)
+    wait_for = timeout[0] if isinstance(timeout, tuple) else timeout
+    if not sem.acquire(timeout=wait_for):
+        raise requests.exceptions.Timeout(f"no free connection slot for {host}")
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+def request(method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+    """Issue a request through the shared pool. The body is read before returning."""
+    host = _host(url)
+    timeout = _timeout_for(host, timeout)
+    with _host_slot(host, timeout):
+        resp = get_session().request(method, url, timeout=timeout, **kwargs)
+        resp.content  # read while we hold the slot; releases the connection back to the pool
+    return resp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+@contextmanager
+def stream(method: str, url: str, timeout=None, **kwargs):
+    """Streaming request; the host slot is held until the block exits."""
+    host = _host(url)
+    timeout = _timeout_for(host, timeout)
+    with _host_slot(host, timeout):
+        with get_session().request(method, url, timeout=timeout, stream=True, **kwargs) as resp:
+            yield resp
+
+
+def fetch_feed(url: str, timeout=None, etag=None, modified=None, **kwargs):
+    """
+    Download an RSS/Atom feed over the shared pool and parse it with feedparser.
+    Pass the etag/modified of a previous result for a conditional GET: an
+    unchanged feed comes back with status 304 and no entries, without parsing.
+    """
+    import feedparser
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    resp = get(url, timeout=timeout, headers=headers, **kwargs)
+    if resp.status_code == 304:
+        feed = feedparser.FeedParserDict(feed=feedparser.FeedParserDict(), entries=[], bozo=False)
+    else:
+        feed = feedparser.parse(resp.content, response_headers=dict(resp.headers))
+    feed["status"] = resp.status_code
+    feed["etag"] = resp.headers.get("ETag") or etag
+    feed["modified"] = resp.headers.get("Last-Modified") or modified
+    return feed
@@ -0,0 +1,141 @@
+# raya_core/wiki.py - shared Wikipedia access: pooled API calls, persistent cache, parallel candidates
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from raya_core import transport
+from raya_core.cache import TieredCache
+from raya_core.config import WIKI_CACHE_TTL, WIKI_MISS_TTL, WIKI_WORKERS
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+# Persistent tier: query -> titles, title -> summary / disambiguation / missing
+WIKI_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), "wiki_cache.sqlite")
+
+_CACHE: Optional[TieredCache] = None
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def _cache() -> TieredCache:
+    global _CACHE
+    if _CACHE is None:
+        with _LOCK:
+            if _CACHE is None:
+                _CACHE = TieredCache(WIKI_CACHE_DB, memory_items=1024, max_entries=50000, ttl=WIKI_CACHE_TTL)
+    return _CACHE
+
+
+def _executor() -> ThreadPoolExecutor:
+    # separate from the collector pool: callers often run on a collector worker themselves
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=WIKI_WORKERS, thread_name_prefix="raya-wiki")
+    return _EXECUTOR
+
+
+def _api(**params) -> dict:
+    params.update(action="query", format="json", formatversion=2)
+    resp = transport.get(API_URL, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def search(query: str, results: int = 3) -> List[str]:
+    """Page titles for `query` (like wikipedia.search). Errors give []."""
+    query = (query or "").strip()
+    if not query:
+        return []
+    key = f"search|{results}|{query.lower()}"
+    hit = _cache().get(key)
+    if hit is not None:
+        return hit["titles"]
+    try:
+        data = _api(list="search", srsearch=query, srlimit=results, srprop="")
+    except Exception:
+        return []
+    titles = [r["title"] for r in data.get("query", {}).get("search", [])]
+    _cache().put(key, {"titles": titles})
+    return titles
+
+
+def lookup(title: str, sentences: int = 3) -> Tuple[str, Optional[str]]:
+    """
+    (status, text) for one page, following redirects.
+    status is "ok", "disambiguation", "missing" or "error"; only "ok" has text.
+    Everything but "error" is cached, so ambiguous and missing titles are
+    not asked for again.
+    """
+    title = (title or "").strip()
+    if not title:
+        return "missing", None
+    key = f"summary|{sentences}|{title}"
+    hit = _cache().get(key)
+    if hit is not None:
+        return hit["status"], hit.get("text")
+
+    params = dict(prop="extracts|pageprops", ppprop="disambiguation", explaintext=1,
+                  redirects=1, titles=title)
+    if sentences:
+        params["exsentences"] = sentences
+    else:
+        params["exintro"] = 1
+    try:
+        pages = _api(**params).get("query", {}).get("pages", [])
+    except Exception:
+        return "error", None
+
+    page = pages[0] if pages else {"missing": True}
+    if page.get("missing") or page.get("invalid"):
+        status, text, ttl = "missing", None, WIKI_MISS_TTL
+    elif "disambiguation" in page.get("pageprops", {}):
+        status, text, ttl = "disambiguation", None, None
+    else:
+        text = (page.get("extract") or "").strip() or None
+        status, ttl = ("ok", None) if text else ("missing", WIKI_MISS_TTL)
+    _cache().put(key, {"status": status, "text": text}, ttl=ttl)
+    return status, text
+
+
+def summary(title: str, sentences: int = 3, auto_suggest: bool = False) -> Optional[str]:
+    """
+    Plain-text summary of a page, or None (missing, ambiguous or unreachable).
+    auto_suggest resolves `title` through search first, like wikipedia.summary.
+    """
+    if auto_suggest:
+        titles = search(title, results=1)
+        title = titles[0] if titles else title
+    return lookup(title, sentences)[1]
+
+
+def first_acceptable(titles: Iterable[str], sentences: int = 3,
+                     accept: Optional[Callable[[str], bool]] = None,
+                     timeout: Optional[float] = None) -> Optional[Tuple[str, str]]:
+    """
+    Fetch the summaries of all `titles` at once and return (title, text) of the
+    first one to arrive that `accept` (default: any text) approves. Fetches that
+    have not started yet are cancelled; ones already in flight finish in the
+    background and only fill the cache. `timeout` bounds the whole wait.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    pending = {}
+    for t in dict.fromkeys(t for t in titles if t):
+        pending[_executor().submit(lookup, t, sentences)] = t
+    try:
+        while pending:
+            left = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, _ = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            if not done:
+                return None
+            for fut in done:
+                title = pending.pop(fut)
+                _status, text = fut.result()
+                if text and (accept is None or accept(text)):
+                    return title, text
+        return None
+    finally:
+        for fut in pending:
+            fut.cancel()
@@ -0,0 +1,353 @@
+# raya_server.py - multi-user HTTP service around ask_raya
+#
+#   python raya_server.py                     # http://127.0.0.1:8080
+#   python raya_server.py --host 0.0.0.0 --port 8080 --workers 8 --queue 32
+#
+#   POST /v1/ask          {"query": "...", "user": "..."}  -> JSON answer
+#   POST /v1/ask/stream   same body                        -> NDJSON: {"chunk": ...} lines, then {"done": true, ...}
+#   GET  /v1/sessions/<user>                               -> that user's recent turns
+#        (needs "Authorization: Bearer $RAYA_SERVER_TOKEN"; off when the token is unset)
+#   GET  /healthz
+#
+# Request threads only wait: every ask_raya call runs on a bounded worker
+# pool, with a bounded number of calls allowed to queue for it. When both are
+# full the service answers 429 with Retry-After instead of piling up work.
+# A request that has no answer within SERVER_REQUEST_TIMEOUT gets 504.
+# SIGINT/SIGTERM stop new calls (503), let running ones finish within the
+# grace period, then flush traces and queued database writes.
+# Caches, pooled HTTP clients and the cloud rate limits are process-wide, so
+# every request shares them. Answers do not depend on the user: the answer
+# cache is keyed by the query alone. Each user's recent turns are kept in a
+# context window only as a history (bounded, least recently used dropped).
+import hmac
+import math
+import json
+import time
+import queue
+import signal
+import argparse
+import threading
+import contextvars
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Optional
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+from raya_core import retriever, tracing
+from raya_core.config import SERVER_WORKERS, SERVER_QUEUE, SERVER_SHUTDOWN_GRACE, SERVER_REQUEST_TIMEOUT, SERVER_TOKEN
+from raya_core.intent import detect_intents
+from raya_core.persistence import close_all, get_store
+
+DB_FILE = "raya_conversation.db"
+NOTES_DB = "custom_db.sqlite"
+ANONYMOUS = "anonymous"
+MAX_QUERY_CHARS = 4000
+
+
+class Busy(Exception):
+    """Worker pool and queue are full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Closed(Exception):
+    """The pool is shutting down."""
+
+
+class WorkerPool:
+    """
+    ThreadPoolExecutor with admission control: at most `workers` jobs run and
+    `queue` more may wait; submit() raises Busy past that. Retry-After is
+    estimated from the recent job duration and the backlog.
+    """
+
+    def __init__(self, workers: int = SERVER_WORKERS, queue: int = SERVER_QUEUE):
+        self.workers = workers
+        self.capacity = workers + queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="raya-serve")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._running = 0
+        self._avg = 1.0  # seconds per job (moving average)
+        self.closed = False
+        self.stats = {"accepted": 0, "rejected": 0, "failed": 0}
+
+    def retry_after(self) -> int:
+        with self._lock:
+            backlog = len(self._pending)
+            return max(1, math.ceil(self._avg * backlog / self.workers))
+
+    def _finished(self, seconds: float, ok: bool):
+        with self._lock:
+            self._running -= 1
+            self._avg = 0.8 * self._avg + 0.2 * seconds
+            if not ok:
+                self.stats["failed"] += 1
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if self.closed:
+            raise Closed()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise Busy(self.retry_after())
+        ctx = contextvars.copy_context()
+
+        def job():
+            with self._lock:
+                self._running += 1
+            t0, ok = time.perf_counter(), False
+            try:
+                result = ctx.run(fn, *args)
+                ok = True
+                return result
+            finally:
+                self._finished(time.perf_counter() - t0, ok)
+
+        with self._lock:
+            self.stats["accepted"] += 1
+        fut = self._executor.submit(job)
+        with self._lock:
+            self._pending.add(fut)
+
+        def release(f):
+            with self._lock:
+                self._pending.discard(f)
+            self._slots.release()
+
+        fut.add_done_callback(release)
+        return fut
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "running": self._running,
+                    "queued": len(self._pending) - self._running, "capacity": self.capacity,
+                    "closed": self.closed, **self.stats}
+
+    def shutdown(self, grace: float = SERVER_SHUTDOWN_GRACE) -> bool:
+        """Refuse new jobs and wait up to `grace` seconds for the rest; True if all finished."""
+        self.closed = True
+        with self._lock:
+            pending = list(self._pending)
+        done, not_done = wait(pending, timeout=grace)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return not not_done
+
+
+# ---------------- backends ----------------
+def _ask(query: str):
+    from raya_core.orchestrator import ask_raya  # Q&A stack loads once, on first use
+    return ask_raya(query, NOTES_DB, sorted(detect_intents(query)))
+
+
+def _ask_stream(query: str):
+    from raya_core.orchestrator import ask_raya_stream
+    return ask_raya_stream(query, NOTES_DB, sorted(detect_intents(query)))
+
+
+def _session(user: str) -> str:
+    # kept apart from the CLI's "default" session, which is seeded from the database
+    return f"user:{user}"
+
+
+def _record(user: str, query: str, answer: str, db_file: str):
+    """Keep the user's turn history current and log the turn (writes are queued)."""
+    retriever.record_turn(query, answer, session_id=_session(user))
+    store = get_store(db_file)
+    store.execute(
+        "INSERT INTO raya_data (timestamp, user_id, data_type, content, tags) VALUES (?, ?, ?, ?, ?)",
+        (datetime.now().isoformat(), user, "text", query, "server"),
+    )
+    store.execute("INSERT INTO conversations (user_input, ai_output, message_type) VALUES (?, ?, ?)",
+                  (query, answer, "text"))
+
+
+def _result_fields(result) -> dict:
+    return {
+        "source": next(iter(result.sources), None) if result else None,
+        "confidence": result.confidence if result else 0.0,
+        "cached": bool(result and result.meta.get("cache")),
+    }
+
+
+# ---------------- app ----------------
+def create_app(pool: Optional[WorkerPool] = None, ask: Callable = _ask, ask_stream: Callable = _ask_stream,
+               db_file: str = DB_FILE, token: str = SERVER_TOKEN, timeout: float = SERVER_REQUEST_TIMEOUT) -> Flask:
+    """
+    `ask(query)` -> EngineResult; `ask_stream(query)` -> generator of chunks returning an EngineResult.
+    `token` guards the session history endpoint (empty: the endpoint answers 404).
+    `timeout` is how long a request waits for its answer (for streams: the whole stream).
+    """
+    pool = pool or WorkerPool()
+    app = Flask(__name__)
+    app.config["RAYA_POOL"] = pool
+
+    def _read():
+        body = request.get_json(silent=True) or {}
+        query = str(body.get("query") or "").strip()
+        user = str(body.get("user") or request.headers.get("X-Raya-User") or ANONYMOUS).strip()[:64]
+        return query, user or ANONYMOUS
+
+    def _error(status: int, message: str, retry_after: Optional[int] = None):
+        resp = jsonify({"error": message})
+        resp.status_code = status
+        if retry_after is not None:
+            resp.headers["Retry-After"] = str(retry_after)
+        return resp
+
+    def _submit(fn, *args):
+        try:
+            return pool.submit(fn, *args), None
+        except Busy as e:
+            return None, _error(429, "too many requests in flight", e.retry_after)
+        except Closed:
+            return None, _error(503, "shutting down", 5)
+
+    @app.post("/v1/ask")
+    def ask_route():
+        query, user = _read()
+        if not query:
+            return _error(400, "query is required")
+        if len(query) > MAX_QUERY_CHARS:
+            return _error(413, f"query longer than {MAX_QUERY_CHARS} characters")
+
+        def run():
+            with tracing.span("server.ask", user=user):
+                result = ask(query)
+                _record(user, query, result.text, db_file)
+                return result
+
+        fut, err = _submit(run)
+        if err is not None:
+            return err
+        try:
+            result = fut.result(timeout=timeout)
+        except FutureTimeout:
+            return _error(504, f"no answer within {timeout:g}s")
+        except Exception as e:
+            return _error(500, f"ask failed: {e}")
+        return jsonify({"user": user, "answer": result.text, **_result_fields(result)})
+
+    @app.post("/v1/ask/stream")
+    def ask_stream_route():
+        query, user = _read()
+        if not query:
+            return _error(400, "query is required")
+        if len(query) > MAX_QUERY_CHARS:
+            return _error(413, f"query longer than {MAX_QUERY_CHARS} characters")
+        chunks: "queue.Queue" = queue.Queue()
+        end = object()
+
+        def run():
+            # the worker produces, the request thread writes to the client
+            parts, result = [], None
+            try:
+                with tracing.span("server.ask_stream", user=user):
+                    gen = ask_stream(query)
+                    try:
+                        while True:
+                            chunk = next(gen)
+                            parts.append(chunk)
+                            chunks.put({"chunk": chunk})
+                    except StopIteration as stop:
+                        result = stop.value
+                    text = result.text if result else "".join(parts)
+                    _record(user, query, text, db_file)
+                chunks.put({"done": True, "user": user, **_result_fields(result)})
+            except Exception as e:
+                chunks.put({"error": str(e)})
+                raise
+            finally:
+                chunks.put(end)
+
+        deadline = time.monotonic() + timeout
+        fut, err = _submit(run)
+        if err is not None:
+            return err
+        try:
+            first = chunks.get(timeout=timeout)
+        except queue.Empty:
+            return _error(504, f"no answer within {timeout:g}s")
+
+        def body():
+            item = first
+            while item is not end:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+                try:
+                    item = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    yield json.dumps({"error": f"no answer within {timeout:g}s"}) + "\n"
+                    return
+
+        return Response(body(), mimetype="application/x-ndjson")
+
+    @app.get("/v1/sessions/<user>")
+    def session_route(user):
+        # "user" is whatever the client claims, so history is only shown to the token holder
+        if not token:
+            return _error(404, "session history is disabled (set RAYA_SERVER_TOKEN)")
+        given = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(given.encode(), token.encode()):
+            return _error(401, "invalid or missing token")
+        window = retriever.get_window(_session(user))
+        return jsonify({"user": user, "turns": window.turns(), "tokens": window.tokens()})
+
+    @app.get("/healthz")
+    def health():
+        snap = pool.snapshot()
+        return jsonify({"status": "draining" if snap["closed"] else "ok", **snap}), (503 if snap["closed"] else 200)
+
+    return app
+
+
+# ---------------- main ----------------
+def serve(host: str, port: int, workers: int, queue_size: int, grace: float):
+    from raya import init_db
+    init_db()
+
+    pool = WorkerPool(workers, queue_size)
+    app = create_app(pool)
+    server = make_server(host, port, app, threaded=True)
+    stopping = threading.Event()
+
+    def stop(signum, _frame):
+        if stopping.is_set():
+            return
+        stopping.set()
+        print(f"[SERVER] signal {signum}: draining (up to {grace:.0f}s)")
+
+        def drain():
+            finished = pool.shutdown(grace)
+            if not finished:
+                print("[SERVER] grace period over; abandoning unfinished calls")
+            server.shutdown()
+
+        threading.Thread(target=drain, name="raya-drain", daemon=True).start()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    print(f"[SERVER] RAYA listening on http://{host}:{server.port} ({workers} workers, queue {queue_size})")
+    server.serve_forever()
+    tracing.flush()
+    close_all()
+    print("[SERVER] stopped")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="RAYA HTTP service")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    ap.add_argument("--queue", type=int, default=SERVER_QUEUE)
+    ap.add_argument("--grace", type=float, default=SERVER_SHUTDOWN_GRACE)
+    args = ap.parse_args()
+    serve(args.host, args.port, args.workers, args.queue, args.grace)
+
+
+if __name__ == "__main__":
+    main()
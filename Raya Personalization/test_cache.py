@@ -0,0 +1,65 @@
+# test_cache.py
+import json
+import time
+from raya_core import cache
+from raya_core.cache import TieredCache
+
+
+def test_put_get_roundtrip_and_persistence(tmp_path):
+    db = str(tmp_path / "c.sqlite")
+    store = TieredCache(db)
+    store.put("who is x", {"text": "X is a person"})
+    assert store.get("who is x") == {"text": "X is a person"}
+    # a fresh instance has an empty memory tier and reads the persistent tier
+    again = TieredCache(db)
+    assert again.get("who is x") == {"text": "X is a person"}
+    assert len(again) == 1
+
+
+def test_ttl_expiry(tmp_path):
+    store = TieredCache(str(tmp_path / "c.sqlite"))
+    store.put("short", {"text": "soon gone"}, ttl=0.05)
+    store.put("long", {"text": "stays"})
+    time.sleep(0.1)
+    assert store.get("short") is None
+    assert store.get("long") == {"text": "stays"}
+    assert TieredCache(store.path).get("short") is None
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    store = TieredCache(str(tmp_path / "c.sqlite"), memory_items=2, max_entries=10)
+    for i in range(10):
+        store.put(f"k{i}", {"i": i})
+        time.sleep(0.001)
+    store.get("k0")  # touch the oldest so it survives
+    store.put("k10", {"i": 10})
+    assert len(store) <= 10
+    assert store.get("k0") == {"i": 0}
+    assert store.get("k1") is None
+    assert store.get("k10") == {"i": 10}
+
+
+def test_replacing_a_key_does_not_grow_the_store(tmp_path):
+    store = TieredCache(str(tmp_path / "c.sqlite"))
+    for _ in range(5):
+        store.put("same", {"text": "v"})
+    assert len(store) == 1
+
+
+def test_legacy_json_imported_once(tmp_path):
+    legacy = tmp_path / "final_raya_cache.json"
+    legacy.write_text(json.dumps({"what is a black hole": {"text": "A region of spacetime"}}))
+    store = TieredCache(str(tmp_path / "c.sqlite"))
+    store.import_json_once(str(legacy))
+    assert store.get("what is a black hole")["text"] == "A region of spacetime"
+    store.delete("what is a black hole")
+    store.import_json_once(str(legacy))
+    assert store.get("what is a black hole") is None
+
+
+def test_cache_get_put_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_STORE", TieredCache(str(tmp_path / "c.sqlite")))
+    cache.cache_put("  What is DNA ", "A molecule", {"wikipedia": True})
+    assert cache.cache_get("what is dna") == "A molecule"
+    assert cache.cache_get("what is dna", intent="news") is None
+    assert "what is dna::fact" in cache.load_cache()
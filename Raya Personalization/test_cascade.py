@@ -0,0 +1,100 @@
+# test_cascade.py
+import os
+import sys
+import time
+
+from raya_core.cascade import Cascade, Stage, StageResult
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "raya_core"))  # as raya.py does
+
+
+def _stage(name, calls, result=None, confidence=0.0, accept=0.7, delay=0.0, budget=2.0):
+    def fn(query, earlier):
+        calls.append((name, [r.source for r in earlier]))
+        time.sleep(delay)
+        return StageResult(result, confidence, name) if result else None
+    return Stage(name, fn, budget=budget, accept=accept)
+
+
+def test_stops_at_first_accepted_stage_and_runs_each_once():
+    calls = []
+    cascade = Cascade({
+        "local": _stage("local", calls, "weak", 0.3),
+        "pipeline": _stage("pipeline", calls, "good", 0.8, accept=0.6),
+        "llm": _stage("llm", calls, "cloud", 0.9),
+    })
+    best, trail = cascade.run("q", ["local", "pipeline", "local", "llm"])
+    assert best.text == "good"
+    assert calls == [("local", []), ("pipeline", ["local"])]   # earlier results passed forward
+    assert [t["stage"] for t in trail] == ["local", "pipeline"]
+
+
+def test_over_budget_stage_is_skipped_and_best_result_wins():
+    calls = []
+    cascade = Cascade({
+        "local": _stage("local", calls, "weak", 0.3),
+        "pipeline": _stage("pipeline", calls, "late", 0.99, delay=1.0, budget=0.2),
+        "llm": _stage("llm", calls, None),
+    })
+    t0 = time.monotonic()
+    best, trail = cascade.run("q", ["local", "pipeline", "llm"])
+    assert time.monotonic() - t0 < 0.8
+    assert best.text == "weak"
+    assert [t["status"] for t in trail] == ["ok", "timeout", "empty"]
+
+
+def test_orchestrator_generates_locally_once(monkeypatch):
+    from raya_core import orchestrator
+
+    calls = {"local": 0, "pipeline": 0, "cloud": 0}
+
+    def local(q):
+        calls["local"] += 1
+        return {"text": "Paris is the capital of France.", "model": "local", "confidence": 0.75}
+
+    def pipeline(*a, **kw):
+        calls["pipeline"] += 1
+        return "", {}
+
+    def cloud(q):
+        calls["cloud"] += 1
+        return "[cloud disabled] OPENAI_API_KEY not set"
+
+    monkeypatch.setattr(orchestrator, "ask_via_router", local)
+    monkeypatch.setattr(orchestrator, "run_pipeline", pipeline)
+    monkeypatch.setattr(orchestrator, "ask_cloud", cloud)
+    monkeypatch.setattr(orchestrator, "put_entry", lambda *a, **kw: None)
+
+    result = orchestrator.ask_raya("capital of france?")
+    assert result.text == "Paris is the capital of France."
+    assert result.sources == {"Local LLM": True}
+    assert calls == {"local": 1, "pipeline": 0, "cloud": 0}
+
+
+def test_weak_streamed_answer_falls_through_to_the_pipeline(monkeypatch):
+    from raya_core import orchestrator
+
+    stored, seen = {}, []
+
+    def pipeline(query, db_file, intents, earlier=()):
+        seen.extend(earlier)
+        return "Onion prices rose 4% this week.", {"best_source": "news", "candidates": [("news", 0.8)]}
+
+    monkeypatch.setattr(orchestrator, "choose_model", lambda q: "local")
+    monkeypatch.setattr(orchestrator, "stream_local", lambda q: iter(["I don't ", "know."]))
+    monkeypatch.setattr(orchestrator, "ask_via_router", lambda q: (_ for _ in ()).throw(AssertionError))
+    monkeypatch.setattr(orchestrator, "run_pipeline", pipeline)
+    monkeypatch.setattr(orchestrator, "put_entry", lambda key, entry, **kw: stored.update({key: entry}))
+
+    gen = orchestrator.ask_raya_stream("onion prices?")
+    chunks = []
+    try:
+        while True:
+            chunks.append(next(gen))
+    except StopIteration as stop:
+        result = stop.value
+    assert chunks == ["I don't ", "know.", "\nOnion prices rose 4% this week."]
+    assert result.sources == {"Pipeline": True}
+    assert seen == []   # the weak answer was already shown; it is not repeated in the pipeline's
+    assert [t["stage"] for t in result.meta["cascade"]] == ["local", "pipeline"]
+    assert stored["onion prices"]["confidence"] == 0.8
@@ -0,0 +1,171 @@
+# test_cloud_client.py
+import json
+import time
+import asyncio
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+from openai import BadRequestError
+
+from raya_core.cloud_client import BudgetExceeded, CloudClient, DailyBudget, TokenBucket
+
+
+class _Chat(BaseHTTPRequestHandler):
+    script = []      # status codes to answer with, in order; then 200
+    delay = 0.0
+    calls = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            cls.calls += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            status = cls.script.pop(0) if cls.script else 200
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        if status == 200:
+            prompt = body["messages"][-1]["content"]
+            payload = {
+                "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f" echo: {prompt} "}}],
+            }
+        else:
+            payload = {"error": {"message": f"status {status}", "type": "test"}}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(http_stub):
+    _Chat.script, _Chat.delay, _Chat.calls, _Chat.in_flight, _Chat.max_in_flight = [], 0.0, 0, 0, 0
+    return http_stub(_Chat) + "/v1"
+
+
+def _client(base_url, tmp_path, **kw):
+    kw.setdefault("daily_limit", 100)
+    return CloudClient("test-key", "test-model", base_url=base_url,
+                       budget_path=str(tmp_path / "budget.json"), **kw)
+
+
+def test_retries_429_and_5xx_and_counts_every_attempt(server, tmp_path):
+    _Chat.script = [429, 503]
+
+    async def go():
+        client = _client(server, tmp_path)
+        try:
+            return await client.complete("hello"), client.budget.used()
+        finally:
+            await client.close()
+
+    text, used = asyncio.run(go())
+    assert text == "echo: hello"
+    assert _Chat.calls == 3 and used == 3
+
+
+def test_client_errors_are_not_retried(server, tmp_path):
+    _Chat.script = [400]
+
+    async def go():
+        client = _client(server, tmp_path)
+        try:
+            await client.complete("bad")
+        finally:
+            await client.close()
+
+    with pytest.raises(BadRequestError):
+        asyncio.run(go())
+    assert _Chat.calls == 1
+
+
+def test_daily_budget_persists_and_resets(tmp_path):
+    path = str(tmp_path / "budget.json")
+    day = [date(2026, 1, 1)]
+    first = DailyBudget(2, path, today=lambda: day[0])
+    first.spend()
+    first.spend()
+
+    again = DailyBudget(2, path, today=lambda: day[0])  # e.g. after a restart
+    assert again.used() == 2
+    with pytest.raises(BudgetExceeded):
+        again.spend()
+
+    day[0] = date(2026, 1, 2)
+    again.spend()
+    assert again.used() == 1
+
+
+def test_budget_stops_calls_before_they_go_out(server, tmp_path):
+    async def go():
+        client = _client(server, tmp_path, daily_limit=1)
+        try:
+            await client.complete("one")
+            await client.complete("two")
+        finally:
+            await client.close()
+
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(go())
+    assert _Chat.calls == 1
+
+
+def test_concurrency_is_bounded(server, tmp_path):
+    _Chat.delay = 0.1
+
+    async def go():
+        client = _client(server, tmp_path, max_concurrency=3)
+        try:
+            return await asyncio.gather(*(client.complete(f"q{i}") for i in range(9)))
+        finally:
+            await client.close()
+
+    answers = asyncio.run(go())
+    assert answers == [f"echo: q{i}" for i in range(9)]
+    assert _Chat.max_in_flight == 3
+
+
+def test_token_bucket_spaces_out_requests():
+    async def go():
+        bucket = TokenBucket(rate=1200, capacity=2)  # 20 per second, burst of 2
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(go())
+    assert 0.18 <= elapsed < 0.6  # burst of 2, then 4 more at 50 ms each
+
+
+def test_ask_cloud_gives_up_after_the_total_timeout(server, tmp_path, monkeypatch):
+    from raya_core import backend_cloud
+    from raya_core.cloud_client import LoopThread
+
+    _Chat.delay = 1.0
+    loop = LoopThread()
+    client = _client(server, tmp_path)
+    monkeypatch.setattr(backend_cloud, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(backend_cloud, "_LOOP", loop)
+    monkeypatch.setattr(backend_cloud, "_CLIENT", client)
+    monkeypatch.setattr(backend_cloud, "CLOUD_TOTAL_TIMEOUT", 0.2)
+    t0 = time.monotonic()
+    assert backend_cloud.ask_cloud("hello").startswith("[cloud error] no answer within")
+    assert time.monotonic() - t0 < 0.8
+    loop.run(client.close(), 5)
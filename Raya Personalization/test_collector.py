@@ -0,0 +1,59 @@
+# test_collector.py
+import time
+from raya_core.collector import collect
+
+
+def _slow(value, delay):
+    def fn():
+        time.sleep(delay)
+        return value
+    return fn
+
+
+def test_sources_run_concurrently():
+    t0 = time.monotonic()
+    results, timed_out = collect(
+        [("a", _slow("A", 0.3)), ("b", _slow("B", 0.3)), ("c", _slow("C", 0.3))],
+        budget=2.0,
+    )
+    assert results == {"a": "A", "b": "B", "c": "C"}
+    assert timed_out == []
+    # sequential would be ~0.9s
+    assert time.monotonic() - t0 < 0.7
+
+
+def test_per_source_deadline_drops_slow_source():
+    results, timed_out = collect(
+        [("fast", _slow("F", 0.05)), ("slow", _slow("S", 1.0))],
+        budget=2.0,
+        deadlines={"slow": 0.2},
+    )
+    assert results == {"fast": "F"}
+    assert timed_out == ["slow"]
+
+
+def test_overall_budget_bounds_latency():
+    t0 = time.monotonic()
+    results, timed_out = collect([("slow", _slow("S", 1.0))], budget=0.2)
+    assert results == {}
+    assert timed_out == ["slow"]
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_early_stop_on_confident_result():
+    t0 = time.monotonic()
+    results, _ = collect(
+        [("cache", _slow(0.95, 0.05)), ("web", _slow(0.5, 1.0))],
+        budget=2.0,
+        stop_when=lambda _name, conf: conf >= 0.95,
+    )
+    assert results == {"cache": 0.95}
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_failing_and_empty_sources_are_skipped():
+    def boom():
+        raise RuntimeError("down")
+    results, timed_out = collect([("x", boom), ("y", lambda: None), ("z", lambda: 1)], budget=1.0)
+    assert results == {"z": 1}
+    assert timed_out == []
@@ -0,0 +1,48 @@
+# test_custom_db.py
+import sqlite3
+from raya_core import custom_db
+from raya_core.custom_db import query_local_db
+
+
+def _make_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE raya_data (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user_id TEXT,
+                                data_type TEXT, content TEXT, tags TEXT);
+        CREATE TABLE conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, user_input TEXT, ai_output TEXT,
+                                    message_type TEXT DEFAULT 'text', timestamp DATETIME DEFAULT CURRENT_TIMESTAMP);
+    """)
+    conn.execute("INSERT INTO raya_data (content) VALUES ('The tractor service is due on Friday')")
+    conn.execute("INSERT INTO conversations (user_input, ai_output) VALUES ('q', 'Wheat prices rose in Punjab')")
+    conn.commit()
+    return conn
+
+
+def test_existing_rows_are_migrated_and_found_out_of_order(tmp_path):
+    db = str(tmp_path / "raya.db")
+    _make_db(db).close()
+    assert query_local_db(db, "when is the tractor due?") == "The tractor service is due on Friday"
+    assert query_local_db(db, "punjab wheat") == "Wheat prices rose in Punjab"
+    assert query_local_db(db, "mango harvest") is None
+
+
+def test_triggers_keep_index_in_sync(tmp_path):
+    db = str(tmp_path / "raya.db")
+    conn = _make_db(db)
+    assert custom_db.migrate(db)
+    conn.execute("INSERT INTO raya_data (content) VALUES ('Sowing cotton after the first rain')")
+    conn.execute("UPDATE raya_data SET content = 'Tractor sold' WHERE id = 1")
+    conn.commit()
+    assert query_local_db(db, "cotton rain") == "Sowing cotton after the first rain"
+    assert query_local_db(db, "tractor friday") is None
+    conn.execute("DELETE FROM raya_data WHERE content LIKE 'Sowing%'")
+    conn.commit()
+    assert query_local_db(db, "cotton rain") is None
+    conn.close()
+
+
+def test_fts_syntax_in_user_text_is_literal(tmp_path):
+    db = str(tmp_path / "raya.db")
+    _make_db(db).close()
+    assert query_local_db(db, 'tractor" OR "x* NEAR(') is None
+    assert query_local_db(db, "tractor AND friday") == "The tractor service is due on Friday"
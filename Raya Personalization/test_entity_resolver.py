@@ -0,0 +1,60 @@
+# test_entity_resolver.py
+import sqlite3
+
+import pytest
+
+from raya_core.entity_resolver import EntityResolver, Match
+from raya_core.persistence import get_store
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "raya.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entity_aliases (id INTEGER PRIMARY KEY AUTOINCREMENT, entity_name TEXT, alias TEXT)")
+    conn.execute("CREATE UNIQUE INDEX entity_aliases_alias ON entity_aliases(alias)")
+    conn.executemany("INSERT INTO entity_aliases (entity_name, alias) VALUES (?, ?)", [
+        ("Narendra Modi", "narendra modi"), ("Narendra Modi", "modi"), ("Narendra Modi", "nm"),
+        ("New Delhi", "new delhi"), ("Delhi", "delhi"),
+    ])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_find_takes_the_longest_alias_at_each_position(db):
+    r = EntityResolver(db)
+    text = "Did Narendra  Modi visit New Delhi, or just delhi? (Modi)"
+    assert r.find(text) == [
+        Match(4, 18, "Narendra  Modi", "Narendra Modi"),
+        Match(25, 34, "New Delhi", "New Delhi"),
+        Match(44, 49, "delhi", "Delhi"),
+        Match(52, 56, "Modi", "Narendra Modi"),
+    ]
+    assert r.normalize("nm in new delhi today") == "Narendra Modi in New Delhi today"
+    assert r.resolve("MODI") == "Narendra Modi"
+    assert r.resolve("rahul") == "rahul"
+    assert r.find("newdelhi and narendra alone") == []
+
+
+def test_add_is_write_through_and_first_entity_keeps_an_alias(db):
+    r = EntityResolver(db)
+    assert r.add("Indian Space Research Organisation", ["isro", "indian space research organisation"]) == 2
+    assert r.resolve("ISRO") == "Indian Space Research Organisation"  # before the write is committed
+    assert r.add("Some Other Modi", ["modi", "som"]) == 1
+    assert r.resolve("modi") == "Narendra Modi"
+
+    get_store(db).flush()
+    fresh = EntityResolver(db)
+    assert fresh.normalize("isro launch") == "Indian Space Research Organisation launch"
+    assert fresh.resolve("som") == "Some Other Modi"
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM entity_aliases WHERE alias = 'modi'").fetchone() == (1,)
+    conn.close()
+
+
+def test_missing_table_resolves_nothing(tmp_path, capsys):
+    r = EntityResolver(str(tmp_path / "empty.db"))
+    assert r.resolve("modi") == "modi"
+    assert r.find("modi") == []
+    assert "entity aliases unavailable" in capsys.readouterr().out
@@ -0,0 +1,104 @@
+# test_exporter.py
+import csv
+import json
+import os
+import sqlite3
+
+import pytest
+
+from raya_core import exporter
+from raya_core.persistence import get_store
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "raya.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, user_input TEXT, ai_output TEXT)")
+    conn.execute("CREATE TABLE search_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, search_query TEXT)")
+    conn.executemany("INSERT INTO conversations (user_input, ai_output) VALUES (?, ?)",
+                     [(f"q{i}", f"a, \"{i}\"\nline") for i in range(25)])
+    conn.commit()
+    conn.close()
+    yield path
+    get_store(path).close()
+
+
+def _ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_repeat_exports_append_only_new_rows(db, tmp_path):
+    out = str(tmp_path / "exports")
+    assert exporter.export_all(db, out, batch=10) == {"conversations": 25, "search_logs": 0}
+    assert exporter.export_all(db, out, batch=10) == {"conversations": 0, "search_logs": 0}
+
+    get_store(db).executemany("INSERT INTO conversations (user_input, ai_output) VALUES (?, ?)",
+                              [("late", "x"), ("later", "y")])
+    assert exporter.export_all(db, out, batch=10)["conversations"] == 2  # queued writes are flushed first
+
+    rows = _ndjson(os.path.join(out, "conversations.ndjson"))
+    assert [r["id"] for r in rows] == list(range(1, 28))
+    assert rows[3] == {"id": 4, "user_input": "q3", "ai_output": 'a, "3"\nline'}
+    table = _csv(os.path.join(out, "conversations.csv"))
+    assert table[0] == ["id", "user_input", "ai_output"] and len(table) == 28  # one header
+    assert table[-1] == ["27", "later", "y"]
+    assert exporter.load_state(out)["conversations"] == {"ndjson": 27, "csv": 27}
+
+
+def test_deleted_output_is_rebuilt_from_the_start(db, tmp_path):
+    out = str(tmp_path / "exports")
+    exporter.export_all(db, out)
+    os.remove(os.path.join(out, "conversations.csv"))
+    assert exporter.export_all(db, out)["conversations"] == 25
+    assert len(_csv(os.path.join(out, "conversations.csv"))) == 26
+    assert len(_ndjson(os.path.join(out, "conversations.ndjson"))) == 25  # not duplicated
+
+
+def test_parquet_is_skipped_without_pyarrow(db, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(exporter, "parquet_available", lambda: False)
+    out = str(tmp_path / "exports")
+    assert exporter.export_all(db, out, formats=("csv", "parquet"))["conversations"] == 25
+    assert "pyarrow not installed" in capsys.readouterr().out
+    assert not os.path.exists(os.path.join(out, "conversations"))
+
+
+def test_output_left_by_the_old_export_is_rebuilt_not_appended(db, tmp_path):
+    out = tmp_path / "exports"
+    out.mkdir()
+    (out / "conversations.csv").write_text("id,user_input,ai_output\n1,q0,old\n2,q1,old\n")  # no state file
+    assert exporter.export_all(db, str(out))["conversations"] == 25
+    table = _csv(out / "conversations.csv")
+    assert table[0] == ["id", "user_input", "ai_output"]
+    assert [r[0] for r in table[1:]] == [str(i) for i in range(1, 26)]
+
+
+def test_failed_export_does_not_publish_a_partial_file(db, tmp_path, monkeypatch):
+    closed = []
+
+    class _Whole(exporter._NDJSON):  # stands in for Parquet: one file per run, published on close
+        on_close = True
+
+        def close(self, ok=True):
+            super().close(ok)
+            closed.append(ok)
+
+    class _Failing(exporter._CSV):
+        def write(self, rows):
+            if rows[0][0] > 10:
+                raise OSError("disk full")
+            super().write(rows)
+
+    monkeypatch.setitem(exporter._WRITERS, "whole", _Whole)
+    monkeypatch.setitem(exporter._WRITERS, "csv", _Failing)
+    out = str(tmp_path / "exports")
+    with pytest.raises(OSError):
+        exporter.export_all(db, out, formats=("whole", "csv"), batch=10)
+    assert closed == [False]
+    assert exporter.load_state(out)["conversations"] == {"whole": 0, "csv": 10}
@@ -0,0 +1,29 @@
+# test_fuzzy_index.py
+import difflib
+from raya_core.fuzzy_index import FuzzyIndex
+
+KEYS = ["who was vivekananda", "why is dna so important", "latest research on space",
+        "explain gravity in 3 lines", "what is a black hole"]
+
+
+def test_exact_and_typo_match():
+    index = FuzzyIndex(KEYS)
+    assert index.best_match("what is a black hole") == "what is a black hole"
+    assert index.best_match("why is dna so importnt") == "why is dna so important"
+    assert index.best_match("completely unrelated words") is None
+
+
+def test_agrees_with_difflib_on_small_sets():
+    index = FuzzyIndex(KEYS)
+    for q in ["who was vivekanand", "latest reserch on space", "explain gravity", "black hole"]:
+        expected = difflib.get_close_matches(q, KEYS, n=1, cutoff=0.7)
+        assert index.best_match(q, cutoff=0.7) == (expected[0] if expected else None)
+
+
+def test_incremental_add():
+    index = FuzzyIndex(KEYS)
+    assert index.best_match("india prime ministr") is None
+    index.add("india prime minister")
+    index.add("india prime minister")
+    assert len(index) == len(KEYS) + 1
+    assert index.best_match("india prime ministr") == "india prime minister"
@@ -0,0 +1,56 @@
+# test_image_analysis.py
+import numpy as np
+import pytest
+from PIL import Image
+
+from raya_core import image_analysis
+
+
+def _photo(seed, size=(640, 480)):
+    coarse = np.random.default_rng(seed).integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    return Image.fromarray(coarse).resize(size, Image.Resampling.BICUBIC)
+
+
+def test_analyze_reads_exif_and_dominant_colour(tmp_path):
+    img = Image.new("RGB", (1200, 900), (40, 160, 50))
+    img.paste((200, 200, 240), (0, 0, 1200, 200))  # a strip of sky
+    exif = Image.Exif()
+    exif[0x0110] = "Redmi Note 12"
+    img.save(tmp_path / "field.jpg", quality=90, exif=exif)
+
+    info = image_analysis.analyze(str(tmp_path / "field.jpg"))
+    assert (info["width"], info["height"], info["mode"], info["camera"]) == (1200, 900, "RGB", "Redmi Note 12")
+    r, g, b = info["rgb"]
+    assert abs(r - 40) < 8 and abs(g - 160) < 8 and abs(b - 50) < 8
+    assert info["tag"] == "likely vegetation/outdoor"
+    assert image_analysis.describe(info).startswith("Image field.jpg — 1200x900px, mode RGB. Camera: Redmi Note 12.")
+
+    Image.new("P", (50, 50)).save(tmp_path / "palette.png")
+    assert image_analysis.analyze(str(tmp_path / "palette.png"))["camera"] == "Unknown"
+    Image.new("RGB", (10, 10)).save(tmp_path / "anim.gif")
+    with pytest.raises(ValueError):
+        image_analysis.analyze(str(tmp_path / "anim.gif"))
+    (tmp_path / "notes.jpg").write_text("just text")
+    with pytest.raises(ValueError, match="not a recognized JPEG/PNG image"):
+        image_analysis.analyze(str(tmp_path / "notes.jpg"))
+
+
+def test_dedupe_catches_resaved_and_resized_copies(tmp_path):
+    _photo(1).save(tmp_path / "a.jpg", quality=92)
+    _photo(1).resize((320, 240)).save(tmp_path / "b.jpg", quality=60)
+    _photo(2).save(tmp_path / "c.png")
+    (tmp_path / "broken.jpg").write_bytes(b"not really a jpeg")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    result = image_analysis.analyze_dir(str(tmp_path), workers=1)
+    assert [i["name"] for i in result["kept"]] == ["a.jpg", "c.png"]
+    assert result["duplicates"] == [("b.jpg", "a.jpg")]
+    assert [f["name"] for f in result["failed"]] == ["broken.jpg"]
+
+
+def test_process_pool_gives_the_same_results(tmp_path, monkeypatch):
+    for i in range(4):
+        _photo(i, (200, 150)).save(tmp_path / f"{i}.jpg")
+    monkeypatch.setattr(image_analysis, "IMAGE_PARALLEL_MIN", 2)
+    paths = image_analysis.list_images(str(tmp_path))
+    assert image_analysis.analyze_many(paths, workers=2) == image_analysis.analyze_many(paths, workers=1)
@@ -0,0 +1,59 @@
+# test_intent.py
+import sqlite3
+
+import pytest
+
+from raya_core.intent import classify_conversations, detect_intents, detect_intents_batch, is_factual_question
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", {"fact"}),
+    ("news", {"news_section"}),
+    ("  NEWS ", {"news_section"}),
+    ("tell me a joke", {"fact"}),
+    ("latest arxiv paper on transformers", {"news", "research"}),
+    ("who won the election in 2024?", {"fact", "news"}),
+    ("the well known pianist", {"news"}),             # substring match: "now" in "known"
+    ("which-way to the temple", {"fact"}),            # fallback, not a question opener
+    ("which way to the temple", {"fact"}),
+    ("define photosynthesis", {"fact"}),
+    ("predefined values", {"fact"}),                  # fallback only: "define" needs word boundaries
+    ("history of the march on rome", {"fact", "news"}),
+    ("does the doi resolve", {"fact", "research"}),
+    ("prices in 20255", {"news"}),                  # "2025" is a plain substring hint
+])
+def test_detect_intents(text, expected):
+    assert detect_intents(text) == expected
+
+
+def test_is_factual_question():
+    assert is_factual_question("whose book is this")
+    assert is_factual_question("is it raining")
+    assert is_factual_question("sunny today?")
+    assert not is_factual_question("whosever turn")
+    assert not is_factual_question("time")
+    assert not is_factual_question("   ")
+
+
+def test_batch_matches_single_and_results_are_independent():
+    queries = ["latest news", "who is it", "latest news", "paper"]
+    out = detect_intents_batch(queries)
+    assert out == [detect_intents(q) for q in queries]
+    out[0].add("x")
+    assert out[2] == {"news"}
+
+
+def test_classify_conversations(tmp_path):
+    db = str(tmp_path / "log.db")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_input TEXT, ai_output TEXT)")
+    conn.executemany("INSERT INTO conversations (user_input, ai_output) VALUES (?, '')",
+                     [("latest news",), ("who is it?",), ("arxiv paper",), ("hello",)] * 3)
+    conn.commit()
+    conn.close()
+
+    counts = classify_conversations(db, chunk=5)
+    assert counts["_queries"] == 12
+    assert counts["news"] == 3 and counts["research"] == 3 and counts["fact"] == 6
+    with pytest.raises(FileNotFoundError):
+        classify_conversations(str(tmp_path / "missing.db"))
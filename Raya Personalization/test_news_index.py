@@ -0,0 +1,79 @@
+# test_news_index.py
+import time
+from http.server import BaseHTTPRequestHandler
+
+from raya_core.news_index import NewsIndex, NewsPrefetcher
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>India election results announced</title><link>http://t/1</link>
+<pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate></item>
+<item><title>Monsoon reaches Kerala early</title><link>http://t/2</link>
+<pubDate>Mon, 01 Jan 2024 11:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+class _Feed(BaseHTTPRequestHandler):
+    hits = []
+    down = False
+
+    def do_GET(self):
+        self.hits.append(self.headers.get("If-None-Match"))
+        if self.down:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(RSS)))
+        self.end_headers()
+        self.wfile.write(RSS)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_index_matches_all_content_words_newest_first():
+    index = NewsIndex()
+    index.add("bbc", "India election results announced", ts=100)
+    index.add("cnn", "Election day in India: live updates", ts=200)
+    index.add("cnn", "Monsoon reaches Kerala", ts=300)
+    assert index.search("latest news on india election") == [
+        "Election day in India: live updates",
+        "India election results announced",
+    ]
+    assert index.search("monsoon") == ["Monsoon reaches Kerala"]
+    assert index.search("news today") == []
+    assert not index.add("bbc", "India election results announced")  # same headline again
+
+
+def test_expire_drops_headlines_outside_retention():
+    index = NewsIndex(retention=3600)
+    now = time.time()
+    index.add("bbc", "Old budget story", ts=now - 7200)
+    index.add("bbc", "New budget story", ts=now - 60)
+    assert index.expire(now) == 1
+    assert index.search("budget") == ["New budget story"]
+    assert len(index) == 1
+
+
+def test_prefetcher_uses_conditional_get(http_stub):
+    _Feed.hits, _Feed.down = [], False
+    url = http_stub(_Feed) + "/rss"
+    prefetcher = NewsPrefetcher({"test": url}, index=NewsIndex(retention=10 ** 10))
+    assert prefetcher.refresh() == 2
+    assert prefetcher.refresh() == 0      # unchanged: 304, nothing re-parsed
+    assert _Feed.hits == [None, '"v1"']
+    assert prefetcher.stats == {"fetched": 1, "not_modified": 1, "errors": 0}
+    assert prefetcher.index.search("kerala monsoon") == ["Monsoon reaches Kerala early"]
+
+    _Feed.down = True
+    assert prefetcher.refresh() == 0
+    assert prefetcher.stats == {"fetched": 1, "not_modified": 1, "errors": 1}
+    assert prefetcher._validators["test"] == ('"v1"', None)  # the 503 did not replace them
@@ -0,0 +1,64 @@
+# test_pdf_extract.py
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+from bench_pdf import legacy_extract, write_text_pdf
+from raya_core import pdf_extract
+from raya_core.cache import TieredCache
+
+PAGES = [f"Page {i} talks about the river.\nThe river feeds farms number {i}." for i in range(12)]
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "_CACHE", TieredCache(str(tmp_path / "pdf_cache.sqlite")))
+    path = str(tmp_path / "doc.pdf")
+    write_text_pdf(path, PAGES)
+    return path
+
+
+def test_parallel_ranges_match_the_serial_loop(pdf, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "PDF_WORKERS", 2)
+    monkeypatch.setattr(pdf_extract, "PDF_PAGES_PER_TASK", 5)
+    monkeypatch.setattr(pdf_extract, "PDF_PARALLEL_MIN_PAGES", 4)
+    try:
+        assert [len(r) for r in pdf_extract.iter_pages(pdf)] == [5, 5, 2]
+        assert pdf_extract.extract_text(pdf) == legacy_extract(pdf)
+        assert "farms number 7" in pdf_extract.extract_text(pdf, max_pages=8)
+        assert "number 8" not in pdf_extract.extract_text(pdf, max_pages=8)
+    finally:
+        pdf_extract._reset_pool()
+
+
+def test_same_bytes_hit_the_cache_under_any_name(pdf, tmp_path):
+    first = pdf_extract.summarize_pdf(pdf, max_sentences=2)
+    assert not first["cached"] and first["pages"] == first["total_pages"] == 12
+
+    copy = str(tmp_path / "renamed.pdf")
+    shutil.copy(pdf, copy)
+    again = pdf_extract.summarize_pdf(copy, max_sentences=2)
+    assert again["cached"] and again["summary"] == first["summary"] and again["text"] == first["text"]
+    assert pdf_extract.summarize_pdf(copy, max_sentences=1)["summary"] in first["summary"]
+
+    write_text_pdf(copy, PAGES + ["One more page."])
+    assert not pdf_extract.summarize_pdf(copy, max_sentences=2)["cached"]
+    assert not pdf_extract.summarize_pdf(pdf, max_sentences=2, max_pages=3)["cached"]
+
+
+def test_long_documents_report_a_running_summary(pdf, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "PDF_PAGES_PER_TASK", 4)
+    monkeypatch.setattr(pdf_extract, "PDF_PROGRESSIVE_PAGES", 10)
+    seen = []
+    result = pdf_extract.summarize_pdf(pdf, max_sentences=2, progress=lambda *a: seen.append(a))
+    assert [(done, total) for done, total, _ in seen] == [(4, 12), (8, 12), (12, 12)]
+    assert all(summary for _, _, summary in seen)
+    assert result["summary"]
+
+    seen.clear()
+    pdf_extract.summarize_pdf(pdf, max_sentences=2, max_pages=6, progress=lambda *a: seen.append(a))
+    assert seen == []  # 6 pages is below the progressive threshold
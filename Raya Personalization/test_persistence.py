@@ -0,0 +1,74 @@
+# test_persistence.py
+import sqlite3
+import time
+from raya_core.persistence import Store
+
+
+def _store(tmp_path):
+    db = str(tmp_path / "raya.db")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, user_input TEXT, ai_output TEXT)")
+    conn.commit()
+    conn.close()
+    return Store(db)
+
+
+def test_writes_are_queued_and_visible_after_flush(tmp_path):
+    store = _store(tmp_path)
+    t0 = time.perf_counter()
+    for i in range(200):
+        store.execute("INSERT INTO conversations (user_input, ai_output) VALUES (?, ?)", (f"q{i}", f"a{i}"))
+    enqueue = time.perf_counter() - t0
+    assert store.flush(timeout=5)
+    assert store.query("SELECT COUNT(*) FROM conversations") == [(200,)]
+    assert enqueue < 0.1  # no per-write fsync on the caller's thread
+    store.close()
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    store = _store(tmp_path)
+    store.executemany("INSERT INTO conversations (user_input, ai_output) VALUES (?, ?)", [("a", "b"), ("c", "d")])
+    store.close()
+    conn = sqlite3.connect(store.db_file)
+    assert conn.execute("SELECT COUNT(*) FROM conversations").fetchone() == (2,)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    conn.close()
+
+
+def test_bad_statement_does_not_drop_the_batch(tmp_path, capsys):
+    store = _store(tmp_path)
+    store.execute("INSERT INTO conversations (user_input) VALUES (?)", ("kept",))
+    store.execute("INSERT INTO missing_table VALUES (1)")
+    store.execute("INSERT INTO conversations (user_input) VALUES (?)", ("also kept",))
+    store.flush(timeout=5)
+    assert store.query("SELECT COUNT(*) FROM conversations") == [(2,)]
+    assert "[DB] write error" in capsys.readouterr().out
+    store.close()
+
+
+def test_locked_database_is_retried_not_dropped(tmp_path):
+    store = _store(tmp_path)
+    store._conn.execute("PRAGMA busy_timeout = 0")  # fail at once instead of waiting 5s inside SQLite
+    other = sqlite3.connect(store.db_file, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another process holding the write lock
+    store.execute("INSERT INTO conversations (user_input) VALUES (?)", ("waited",))
+    time.sleep(0.3)
+    other.execute("COMMIT")
+    other.close()
+    assert store.flush(timeout=5)
+    assert store.query("SELECT user_input FROM conversations") == [("waited",)]
+    store.close()
+
+
+def test_writer_survives_a_failed_batch(tmp_path, capsys):
+    store = _store(tmp_path)
+    real = store._commit
+    store._commit = lambda writes: (_ for _ in ()).throw(RuntimeError("disk on fire"))
+    store.execute("INSERT INTO conversations (user_input) VALUES (?)", ("lost",))
+    assert store.flush(timeout=5)          # waiters are released even though the batch blew up
+    store._commit = real
+    store.execute("INSERT INTO conversations (user_input) VALUES (?)", ("written",))
+    assert store.flush(timeout=5)
+    assert store.query("SELECT user_input FROM conversations") == [("written",)]
+    assert "[DB] writer error: disk on fire" in capsys.readouterr().out
+    store.close()
@@ -0,0 +1,37 @@
+# test_replay.py
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+import replay
+
+
+def test_replay_uses_only_stand_ins_and_reports(tmp_path):
+    queries = ["what is gravity", "what is gravity", "latest news on monsoon rainfall", "define photosynthesis"]
+    report = replay.replay(queries, latency={s: 0 for s in replay.SERVICES}, fail={"wikipedia": 1.0},
+                           weak_rate=1.0, concurrency=2, workdir=str(tmp_path))
+
+    assert report["config"]["queries"] == 4
+    assert report["blocked_hosts"] == {}
+    assert report["upstream"]["ollama"]["requests"] >= 3
+    # every Wikipedia call was failed on purpose, and the weak local answers sent the cascade on
+    wiki = report["upstream"]["wikipedia"]
+    assert wiki["requests"] > 0 and wiki["failures"] == wiki["requests"]
+    assert report["upstream"]["openai"]["requests"] > 0
+    assert {"ask_raya", "local", "pipeline"} <= set(report["stages"])
+    assert sum(report["answers"].values()) == 4
+
+
+def test_compare_flags_regressions_only_beyond_tolerance():
+    stage = lambda p95, count=10: {"count": count, "p50": p95 / 2, "p95": p95, "p99": p95, "max": p95}
+    baseline = {"throughput_qps": 10.0, "end_to_end_ms": stage(100.0),
+                "stages": {"local": stage(50.0), "qa.llm": stage(1.0), "rare": stage(10.0, count=2)}}
+    same = {"throughput_qps": 9.0, "end_to_end_ms": stage(110.0),
+            "stages": {"local": stage(55.0), "qa.llm": stage(4.0), "rare": stage(90.0, count=2)}}
+    assert replay.compare(same, baseline, tolerance=0.2) == []
+
+    worse = {"throughput_qps": 7.0, "end_to_end_ms": stage(100.0), "stages": {"local": stage(80.0)}}
+    problems = replay.compare(worse, baseline, tolerance=0.2)
+    assert len(problems) == 2
+    assert problems[0].startswith("throughput") and problems[1].startswith("local")
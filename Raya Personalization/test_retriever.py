@@ -0,0 +1,70 @@
+# test_retriever.py
+import sqlite3
+from collections import OrderedDict
+
+from raya_core import retriever
+from raya_core.retriever import DEFAULT_SESSION, ContextWindow, estimate_tokens
+
+
+def _db(path, turns, news=()):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_input TEXT, ai_output TEXT)")
+    conn.execute("CREATE TABLE raya_data (id INTEGER PRIMARY KEY, data_type TEXT, content TEXT)")
+    conn.executemany("INSERT INTO conversations (user_input, ai_output) VALUES (?, ?)", turns)
+    conn.executemany("INSERT INTO raya_data (data_type, content) VALUES ('news', ?)", [(n,) for n in news])
+    conn.commit()
+    conn.close()
+
+
+def test_window_keeps_last_turns_within_budget():
+    window = ContextWindow(max_tokens=60, max_turns=3)
+    window.warm = True
+    for i in range(5):
+        window.add_turn(f"question {i}", f"answer {i}")
+    prompt = window.render("next?")
+    assert "question 1" not in prompt and "question 2" in prompt and "question 4" in prompt
+    assert prompt.endswith("User query:\nnext?")
+
+    window.add_turn("long " * 50, "x")   # over budget on its own: everything older goes
+    assert window.tokens() <= 60
+    assert "question" not in window.render("q")
+
+
+def test_cold_start_reads_db_once_then_appends(tmp_path, monkeypatch):
+    db = str(tmp_path / "conv.db")
+    _db(db, [("hi", "hello"), ("who are you", "RAYA")], news=["Old headline", "New headline"])
+    monkeypatch.setattr(retriever, "_SESSIONS", OrderedDict())
+    monkeypatch.setattr(retriever, "DB_FILE", db)
+
+    prompt = retriever.build_context("what's new?")
+    assert "User: hi\nRAYA: hello\nUser: who are you\nRAYA: RAYA" in prompt
+    assert "Recent news:\nNew headline\nOld headline" in prompt
+
+    # later turns come from memory, not the database
+    monkeypatch.setattr(retriever, "_recent_turns", lambda *a, **kw: (_ for _ in ()).throw(AssertionError))
+    retriever.record_turn("what's new?", "Not much.")
+    assert "RAYA: Not much." in retriever.build_context("ok")
+
+    # other sessions never see the shared table
+    assert "hello" not in retriever.build_context("hi", session_id="web-42")
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a b c d e") == 5
+    assert 20 <= estimate_tokens("x" * 100) <= 30
+
+
+def test_least_recently_used_sessions_are_dropped(tmp_path, monkeypatch):
+    _db(str(tmp_path / "conv.db"), [])
+    monkeypatch.setattr(retriever, "_SESSIONS", OrderedDict())
+    monkeypatch.setattr(retriever, "CONTEXT_MAX_SESSIONS", 3)
+    monkeypatch.setattr(retriever, "DB_FILE", str(tmp_path / "conv.db"))
+    retriever.record_turn("hi", "hello")                       # default session
+    for user in ("a", "b", "c"):
+        retriever.record_turn("hi", f"hello {user}", session_id=user)
+        retriever.get_window(DEFAULT_SESSION)
+    retriever.get_window("b")                                  # b is used again, so c is now the oldest
+    retriever.get_window("d")
+    assert list(retriever._SESSIONS) == [DEFAULT_SESSION, "b", "d"]
+    assert retriever.get_window("a").turns() == []             # dropped: starts over empty
@@ -0,0 +1,50 @@
+# test_semantic_cache.py
+from raya_core.semantic_cache import SemanticIndex, tokens
+
+
+def test_tokens_expand_short_forms_and_drop_stopwords():
+    assert tokens("Who is the PM of India?") == ["prime", "minister", "india"]
+
+
+def test_paraphrase_hits_and_unrelated_misses():
+    index = SemanticIndex(threshold=0.85)
+    index.add("who is the pm of india", "k-india")
+    index.add("who is the pm of nepal", "k-nepal")
+    index.add("what is a black hole", "k-hole")
+    assert index.lookup("india prime minister") == ("k-india", index.search("india prime minister")[0][1])
+    assert index.lookup("black holes")[0] == "k-hole"
+    assert index.lookup("best mango varieties") is None
+    stats = index.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 3)
+
+
+def test_re_adding_a_key_replaces_its_row():
+    index = SemanticIndex()
+    index.add("gravity", "k")
+    index.add("black hole", "k")
+    assert len(index) == 1
+    assert index.search("gravity")[0][1] < 0.5
+
+
+def test_ring_buffer_overwrites_oldest():
+    index = SemanticIndex(max_entries=2)
+    index.add("solar energy", "a")
+    index.add("wind energy", "b")
+    index.add("river water", "c")
+    assert len(index) == 2
+    keys = {k for k, _ in index.search("solar energy", k=2)}
+    assert "a" not in keys
+
+
+def test_fallback_and_weak_answers_are_not_cached(monkeypatch):
+    from raya_core import orchestrator
+
+    stored = {}
+    monkeypatch.setattr(orchestrator, "_SEMANTIC", SemanticIndex())
+    monkeypatch.setattr(orchestrator, "put_entry", lambda key, entry, **kw: stored.update({key: entry}))
+    orchestrator._store_result("who is the pm of india", "Fallback", "Sorry, I couldn't process that request.", {})
+    orchestrator._store_result("what is a black hole", "Local LLM", "No idea.", {}, confidence=0.2)
+    orchestrator._store_result("what is gravity", "Wikipedia", "Gravity is a force.", {}, confidence=0.8)
+    assert list(stored) == ["what is gravity"]
+    assert orchestrator._semantic_index().lookup("india prime minister") is None
+    assert orchestrator._semantic_index().lookup("gravity")[0] == "what is gravity"
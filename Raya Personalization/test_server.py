@@ -0,0 +1,139 @@
+# test_server.py
+import json
+import sqlite3
+import threading
+
+import pytest
+
+import raya_server
+from raya_core.base import EngineResult
+
+
+def _result(text, source="Local LLM"):
+    return EngineResult(sources={source: True}, text=text, confidence=0.75, meta={})
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "conv.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE raya_data (id INTEGER PRIMARY KEY, timestamp TEXT, user_id TEXT, "
+                 "data_type TEXT, content TEXT, tags TEXT)")
+    conn.execute("CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_input TEXT, ai_output TEXT, "
+                 "message_type TEXT)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_ask_records_turns_per_user(db):
+    app = raya_server.create_app(raya_server.WorkerPool(2, 2), ask=lambda q: _result(f"answer to {q}"),
+                                 db_file=db, token="s3cret")
+    client = app.test_client()
+    auth = {"Authorization": "Bearer s3cret"}
+
+    resp = client.post("/v1/ask", json={"query": "what is gravity", "user": "asha"})
+    assert resp.status_code == 200
+    assert resp.get_json() == {"user": "asha", "answer": "answer to what is gravity",
+                               "source": "Local LLM", "confidence": 0.75, "cached": False}
+    client.post("/v1/ask", json={"query": "hello"}, headers={"X-Raya-User": "ravi"})
+
+    asha = client.get("/v1/sessions/asha", headers=auth).get_json()
+    assert asha["turns"] == ["User: what is gravity\nRAYA: answer to what is gravity"]
+    ravi = client.get("/v1/sessions/ravi", headers=auth).get_json()
+    assert ravi["turns"] == ["User: hello\nRAYA: answer to hello"]
+    assert client.get("/v1/sessions/asha", headers={"X-Raya-User": "asha"}).status_code == 401
+    assert client.get("/v1/sessions/asha", headers={"Authorization": "Bearer guess"}).status_code == 401
+    assert client.post("/v1/ask", json={"user": "asha"}).status_code == 400
+
+
+def test_session_history_is_off_without_a_token(db):
+    app = raya_server.create_app(raya_server.WorkerPool(1, 0), ask=lambda q: _result("x"), db_file=db, token="")
+    client = app.test_client()
+    client.post("/v1/ask", json={"query": "hi", "user": "asha"})
+    assert client.get("/v1/sessions/asha", headers={"Authorization": "Bearer "}).status_code == 404
+
+
+def test_stream_sends_chunks_then_summary(db):
+    def ask_stream(query):
+        yield "Hello "
+        yield "world"
+        return _result("Hello world")
+
+    app = raya_server.create_app(raya_server.WorkerPool(1, 0), ask_stream=ask_stream, db_file=db)
+    resp = app.test_client().post("/v1/ask/stream", json={"query": "hi", "user": "u1"})
+    lines = [json.loads(l) for l in resp.get_data(as_text=True).splitlines()]
+    assert lines[:2] == [{"chunk": "Hello "}, {"chunk": "world"}]
+    assert lines[2]["done"] is True and lines[2]["source"] == "Local LLM"
+
+
+def test_full_pool_answers_429_with_retry_after(db):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow(query):
+        started.set()
+        release.wait(5)
+        return _result("late")
+
+    pool = raya_server.WorkerPool(1, 0)
+    app = raya_server.create_app(pool, ask=slow, db_file=db)
+    first = {}
+    t = threading.Thread(target=lambda: first.update(resp=app.test_client().post("/v1/ask", json={"query": "a"})))
+    t.start()
+    assert started.wait(5)
+
+    busy = app.test_client().post("/v1/ask", json={"query": "b"})
+    assert busy.status_code == 429
+    assert int(busy.headers["Retry-After"]) >= 1
+
+    release.set()
+    t.join(5)
+    assert first["resp"].status_code == 200
+    assert pool.snapshot()["rejected"] == 1
+
+
+def test_shutdown_drains_running_calls_then_refuses(db):
+    release = threading.Event()
+    started = threading.Event()
+    pool = raya_server.WorkerPool(1, 1)
+
+    def job():
+        started.set()
+        release.wait(5)
+        return "finished"
+
+    fut = pool.submit(job)
+    assert started.wait(5)
+    threading.Timer(0.1, release.set).start()
+    assert pool.shutdown(grace=5) is True
+    assert fut.result() == "finished"
+
+    app = raya_server.create_app(pool, db_file=db)
+    resp = app.test_client().post("/v1/ask", json={"query": "late"})
+    assert resp.status_code == 503 and "Retry-After" in resp.headers
+    assert app.test_client().get("/healthz").status_code == 503
+
+
+def test_slow_answers_get_504_instead_of_holding_the_request(db):
+    release = threading.Event()
+
+    def slow(query):
+        release.wait(5)
+        return _result("late")
+
+    def slow_stream(query):
+        yield "partial "
+        release.wait(5)
+        return _result("late")
+
+    app = raya_server.create_app(raya_server.WorkerPool(2, 0), ask=slow, ask_stream=slow_stream,
+                                 db_file=db, timeout=0.2)
+    client = app.test_client()
+    try:
+        assert client.post("/v1/ask", json={"query": "a"}).status_code == 504
+        resp = client.post("/v1/ask/stream", json={"query": "b"})
+        lines = [json.loads(l) for l in resp.get_data(as_text=True).splitlines()]
+        assert lines == [{"chunk": "partial "}, {"error": "no answer within 0.2s"}]
+    finally:
+        release.set()
@@ -0,0 +1,56 @@
+# test_singleflight.py
+import time
+import threading
+from raya_core.singleflight import SingleFlight
+
+
+def _burst(flight, key, fn, n):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_identical_concurrent_calls_run_once():
+    flight = SingleFlight()
+    runs = []
+
+    def answer():
+        runs.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results, errors = _burst(flight, "who is the pm of india", answer, 8)
+    assert len(runs) == 1
+    assert not errors
+    assert len({id(r) for r in results}) == 1  # everyone shares the same result
+    assert flight.stats() == {"executions": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_next_call_retries():
+    flight = SingleFlight()
+
+    def boom():
+        time.sleep(0.1)
+        raise RuntimeError("ollama down")
+
+    results, errors = _burst(flight, "q", boom, 4)
+    assert results == [] and len(errors) == 4
+    assert flight.do("q", lambda: "ok") == "ok"
+
+
+def test_different_keys_are_independent():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
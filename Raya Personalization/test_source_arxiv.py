@@ -0,0 +1,111 @@
+# test_source_arxiv.py
+import time
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from raya_core import source_arxiv
+from raya_core.cache import TieredCache
+
+PAPERS = [
+    ("Quantum computing with trapped ions", "Error rates in quantum computing hardware."),
+    ("Black hole thermodynamics revisited", "Entropy of a black hole horizon."),
+    ("Neural network pruning", "Smaller neural networks."),
+]
+
+
+def _atom(papers):
+    entries = "".join(
+        f"<entry><title>{t}</title><summary>{s}</summary><updated>2024-01-0{i + 1}T00:00:00Z</updated>"
+        f"<link href='http://arxiv.org/abs/{i}'/></entry>"
+        for i, (t, s) in enumerate(papers)
+    )
+    return f"<?xml version='1.0'?><feed xmlns='http://www.w3.org/2005/Atom'>{entries}</feed>".encode()
+
+
+class _Arxiv(BaseHTTPRequestHandler):
+    queries = []
+    status = 200
+
+    def do_GET(self):
+        expr = parse_qs(urlsplit(self.path).query)["search_query"][0].lower()
+        self.queries.append((time.monotonic(), expr))
+        if self.status != 200:  # arXiv throttling
+            self.send_response(self.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        # crude evaluation: a paper matches if every term of any OR'ed group is in it
+        groups = [[t.split(":")[1].strip("() ") for t in g.split(" and ")] for g in expr.split(" or ")]
+        hits = [p for p in PAPERS if any(all(t in (p[0] + p[1]).lower() for t in g) for g in groups)]
+        body = _atom(hits)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def arxiv(tmp_path, monkeypatch, http_stub):
+    _Arxiv.queries, _Arxiv.status = [], 200
+    db = str(tmp_path / "arxiv.sqlite")
+    monkeypatch.setattr(source_arxiv, "API_URL", http_stub(_Arxiv) + "/api/query")
+    monkeypatch.setattr(source_arxiv, "ARXIV_CACHE_DB", db)
+    monkeypatch.setattr(source_arxiv, "_CACHE", None)
+    monkeypatch.setattr(source_arxiv, "_BATCHER", source_arxiv._Batcher(source_arxiv._RateLimiter(0.3)))
+    return db
+
+
+def test_results_are_cached_across_phrasings_and_restarts(arxiv, monkeypatch):
+    first = source_arxiv.search_arxiv("latest papers on quantum computing")
+    assert first.startswith("Quantum computing with trapped ions")
+    assert source_arxiv.search_arxiv("quantum computing research") == first
+    assert len(_Arxiv.queries) == 1
+
+    # a fresh process sees the same persistent cache
+    monkeypatch.setattr(source_arxiv, "_CACHE", TieredCache(arxiv))
+    assert source_arxiv.search_arxiv("computing quantum") == first
+    assert len(_Arxiv.queries) == 1
+
+
+def test_batch_packs_queries_into_one_request(arxiv):
+    out = source_arxiv.search_arxiv_batch(["quantum computing", "black hole", "neural networks", "dark matter"])
+    assert len(_Arxiv.queries) == 1
+    assert " or " in _Arxiv.queries[0][1]
+    assert out["quantum computing"].startswith("Quantum computing")
+    assert out["black hole"].startswith("Black hole")
+    assert out["neural networks"].startswith("Neural network pruning")
+    assert out["dark matter"] is None
+
+
+def test_requests_are_spaced_by_the_rate_limit(arxiv):
+    source_arxiv.search_arxiv("quantum")
+    source_arxiv.search_arxiv("black hole")
+    (t1, _), (t2, _) = _Arxiv.queries
+    assert t2 - t1 >= 0.25
+
+
+def test_concurrent_burst_shares_requests(arxiv):
+    source_arxiv.search_arxiv("dark matter")  # occupy the rate limiter
+    _Arxiv.queries = []
+    topics = ["quantum computing", "black hole", "neural networks", "trapped ions"]
+    threads = [threading.Thread(target=source_arxiv.search_arxiv, args=(t,)) for t in topics]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1 <= len(_Arxiv.queries) < len(topics)
+
+
+def test_throttled_responses_are_not_cached(arxiv):
+    _Arxiv.status = 503
+    assert source_arxiv.search_arxiv_batch(["quantum computing"]) == {"quantum computing": None}
+    _Arxiv.status = 200
+    assert source_arxiv.search_arxiv("quantum computing").startswith("Quantum computing")
+    assert len(_Arxiv.queries) == 2
@@ -0,0 +1,42 @@
+# test_summarizer.py
+import pytest
+
+from raya_core.summarizer import Summarizer, summarize, summarize_stream
+
+DOC = (
+    "Rivers feed the farms of the valley. Farmers watch the rivers every monsoon.\n"
+    "A short note! The monsoon fills rivers and farms alike. Cats sleep.\n"
+    "Rivers, farms and the monsoon shape the valley year after year."
+)
+
+
+def test_summarize_ranks_by_word_frequency():
+    assert summarize(DOC, 2) == ("Rivers, farms and the monsoon shape the valley year after year. "
+                                 "The monsoon fills rivers and farms alike.")
+    assert summarize(DOC, 1) == "Rivers, farms and the monsoon shape the valley year after year."
+
+
+def test_ties_keep_document_order_and_duplicates_count_once():
+    text = "Alpha beta gamma. Delta omega sigma. Alpha beta gamma. Kappa theta zeta."
+    assert summarize(text, 3) == "Alpha beta gamma. Delta omega sigma. Kappa theta zeta."
+
+
+@pytest.mark.parametrize("text", ["", "   ", "a b c"])
+def test_empty_or_wordless_input(text):
+    assert summarize(text, 3) == ("a b c" if text == "a b c" else "")
+    assert summarize_stream([text], 3) == summarize(text, 3)
+
+
+def test_webhook_rules_count_any_word_of_four_characters():
+    bot = Summarizer(word_pattern=r"\w+", split_pattern=r"(?<=[.!?])\s+", min_word_len=4)
+    text = "Item 2024 shipped. Item 2024 again\nNo split here."
+    # digits count as words; a bare newline is not a sentence break
+    assert bot.summarize(text, 1) == "Item 2024 again\nNo split here."
+    assert summarize(text, 1) == "Item 2024 shipped."
+
+
+def test_stream_matches_exact_across_awkward_chunk_edges():
+    text = DOC * 30
+    pieces = [text[i:i + 37] for i in range(0, len(text), 37)]  # cuts inside words and breaks
+    assert summarize_stream(pieces, 3) == summarize(text, 3)
+    assert summarize_stream(iter(pieces), 0) == ""
@@ -0,0 +1,81 @@
+# test_tracing.py
+import os
+import json
+import time
+
+import pytest
+
+from raya_core import tracing
+from raya_core.collector import collect
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    previous = tracing.configure().path
+    path = str(tmp_path / "traces.jsonl")
+    tracing.configure(path=path, enabled=True)
+    yield path
+    tracing.configure(path=previous)
+
+
+def _read(path):
+    tracing.flush()
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_spans_nest_and_record_failures(trace_file):
+    with tracing.span("ask_raya") as root:
+        with tracing.span("router") as sp:
+            sp.set(route="local")
+        with pytest.raises(RuntimeError):
+            with tracing.span("cloud_llm"):
+                raise RuntimeError("no key")
+        root.set(source="Local LLM")
+
+    recs = {r["name"]: r for r in _read(trace_file)}
+    assert recs["router"]["parent"] == recs["ask_raya"]["span"]
+    assert recs["router"]["trace"] == recs["ask_raya"]["span"]
+    assert recs["router"]["attrs"] == {"route": "local"}
+    assert recs["cloud_llm"]["status"] == "error"
+    assert recs["ask_raya"]["parent"] is None
+    assert tracing.current() is None
+
+
+def test_pipeline_sources_nest_across_worker_threads(trace_file):
+    with tracing.span("pipeline.collect"):
+        collect([("qa", lambda: "answer"), ("news", lambda: None)], budget=2.0)
+
+    recs = _read(trace_file)
+    parent = next(r for r in recs if r["name"] == "pipeline.collect")
+    sources = {r["name"]: r for r in recs if r["name"].startswith("source.")}
+    assert set(sources) == {"source.qa", "source.news"}
+    assert all(r["parent"] == parent["span"] for r in sources.values())
+    assert sources["source.qa"]["attrs"]["hit"] is True
+
+
+def test_summary_percentiles_within_window(tmp_path):
+    path = str(tmp_path / "t.jsonl")
+    now = time.time()
+    with open(path, "w", encoding="utf-8") as f:
+        for ms in range(1, 101):
+            f.write(json.dumps({"name": "router", "ts": now - 10, "dur_ms": float(ms), "status": "ok"}) + "\n")
+        # outside the window
+        f.write(json.dumps({"name": "router", "ts": now - 7200, "dur_ms": 9999.0, "status": "ok"}) + "\n")
+
+    stats = tracing.summarize(path, window=3600, now=now)["router"]
+    assert stats["count"] == 100
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (50.0, 95.0, 99.0)
+    assert "router" in tracing.format_summary({"router": stats})
+    assert tracing.parse_window("15m") == 900 and tracing.parse_window("all") is None
+
+
+def test_disabled_tracing_writes_nothing(trace_file):
+    tracing.configure(enabled=False)
+    try:
+        with tracing.span("router") as sp:
+            sp.set(route="cloud")
+    finally:
+        tracing.configure(enabled=True)
+    tracing.flush()
+    assert not os.path.exists(trace_file)
@@ -0,0 +1,80 @@
+# test_wiki.py
+import json
+import time
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from raya_core import wiki
+from raya_core.cache import TieredCache
+
+PAGES = {
+    "Mercury (planet)": ("Mercury is the smallest planet in the Solar System.", False, 0.0),
+    "Mercury (element)": ("Mercury is a chemical element.", False, 0.8),
+    "Mercury": ("", True, 0.0),  # disambiguation page
+}
+
+
+class _Api(BaseHTTPRequestHandler):
+    calls = []
+
+    def do_GET(self):
+        q = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        self.calls.append(q.get("titles") or q.get("srsearch"))
+        if q.get("list") == "search":
+            titles = [t for t in PAGES if q["srsearch"].lower() in t.lower()]
+            body = {"query": {"search": [{"title": t} for t in titles]}}
+        else:
+            title = q["titles"]
+            if title not in PAGES:
+                body = {"query": {"pages": [{"title": title, "missing": True}]}}
+            else:
+                text, ambiguous, delay = PAGES[title]
+                time.sleep(delay)
+                page = {"title": title, "extract": text}
+                if ambiguous:
+                    page["pageprops"] = {"disambiguation": ""}
+                body = {"query": {"pages": [page]}}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch, http_stub):
+    _Api.calls = []
+    monkeypatch.setattr(wiki, "API_URL", http_stub(_Api) + "/w/api.php")
+    monkeypatch.setattr(wiki, "_CACHE", TieredCache(str(tmp_path / "wiki.sqlite")))
+
+
+def test_search_and_summary_are_cached(api):
+    assert wiki.search("mercury") == list(PAGES)
+    assert wiki.search("Mercury ") == list(PAGES)
+    assert wiki.summary("Mercury (planet)").startswith("Mercury is the smallest")
+    assert wiki.summary("Mercury (planet)").startswith("Mercury is the smallest")
+    assert _Api.calls == ["mercury", "Mercury (planet)"]
+
+
+def test_disambiguation_and_missing_are_cached_negatively(api):
+    assert wiki.lookup("Mercury") == ("disambiguation", None)
+    assert wiki.lookup("Mercury") == ("disambiguation", None)
+    assert wiki.summary("No such page") is None
+    assert wiki.summary("No such page") is None
+    assert _Api.calls == ["Mercury", "No such page"]
+
+
+def test_first_acceptable_returns_fastest_without_waiting_for_the_rest(api):
+    t0 = time.monotonic()
+    hit = wiki.first_acceptable(["Mercury", "Mercury (element)", "Mercury (planet)"])
+    assert hit == ("Mercury (planet)", PAGES["Mercury (planet)"][0])
+    assert time.monotonic() - t0 < 0.5   # did not wait for the slow element page
+
+    only_chemistry = wiki.first_acceptable(list(PAGES), accept=lambda text: "chemical" in text)
+    assert only_chemistry[0] == "Mercury (element)"